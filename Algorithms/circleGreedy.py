@@ -0,0 +1,95 @@
+"""
+圆贪婪（circle greedy）路径规划
+以每个充电桩为圆心、UAV.maxRadius为半径画圆：传感器归入最近的充电桩，
+无人机按最近邻顺序依次飞往各充电桩，在每个圆内以充电桩为起终点巡回访问其中的传感器，
+电量不足时就近回到充电桩补充电能（见WRSNNetwork._split_trips）
+"""
+
+from typing import List
+import numpy as np
+from uav import UAV
+from sensor import Sensor
+from pad import PadIndex
+from utils import logger
+from Algorithms.test import _Metric, get_waypoints, improve_tour, nearest_neighbour_tour
+
+
+class CircleGreedyPlanner:
+    """基于充电桩覆盖圆的路径规划器，接口与PathPlanner相同"""
+
+    def __init__(self, pads: PadIndex = None, improve=True, neighbour_k=8, max_rounds=1000):
+        """
+        Args:
+            pads: 充电桩索引，在WRSNNetwork中使用时由bind_pads替换为网络的充电桩
+            improve: 是否对每个圆内的巡回路径进行2-opt/Or-opt局部优化
+            neighbour_k: 局部搜索的近邻候选数
+            max_rounds: 局部搜索最大轮数
+        """
+        self.pads = pads
+        self.improve = improve
+        self.neighbour_k = neighbour_k
+        self.max_rounds = max_rounds
+
+    def bind_pads(self, pads: PadIndex):
+        """使用网络的充电桩（WRSNNetwork初始化时调用）"""
+        self.pads = pads
+
+    def _circle_tour(self, points: np.ndarray, center) -> np.ndarray:
+        """从圆心出发访问points并返回的巡回顺序"""
+        n = len(points)
+        if n == 1:
+            return np.zeros(1, dtype=np.int64)
+        metric = _Metric(np.vstack([points, np.asarray(center, dtype=np.float64).reshape(1, 3)]))
+        tour = np.concatenate([[n], nearest_neighbour_tour(metric, start=n), [n]])
+        if self.improve:
+            tour = improve_tour(metric, tour, self.neighbour_k, self.max_rounds)
+        return tour[1:-1]
+
+    def plan_uav_path(self, uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict) -> List[Sensor]:
+        """
+        为无人机规划路径：按圆逐个访问，只访问分配给该无人机的活跃传感器
+
+        Args:
+            uav: 无人机对象
+            sensors: 所有传感器列表
+            uav_sensor_assignments: 无人机传感器分配字典
+
+        Returns:
+            List[Sensor]: 按访问顺序排列的传感器列表
+        """
+        if not sensors:
+            return []
+        assigned_sensor_ids = set(uav_sensor_assignments.get(uav.id, []))
+        assigned_sensors = [s for s in sensors if s.id in assigned_sensor_ids and s.is_active]
+        if not assigned_sensors:
+            return []
+        if self.pads is None or len(self.pads) == 0:
+            raise ValueError("CircleGreedyPlanner需要充电桩索引")
+
+        # 传感器归入最近的充电桩，超出圆贪婪半径的传感器无法从任何充电桩往返
+        points = get_waypoints(assigned_sensors)
+        pad_of, pad_dist = self.pads.nearest(points)
+        radius = uav.maxRadius(max(s.battery_cap for s in assigned_sensors))
+        outside = int(np.count_nonzero(pad_dist > radius))
+        if outside:
+            logger.warning("无人机%d有%d个传感器超出充电桩覆盖半径%.2fm", uav.id, outside, radius)
+
+        # 按最近邻顺序访问有传感器的充电桩
+        used = np.unique(pad_of)
+        centers = self.pads.positions[used]
+        metric = _Metric(np.vstack([centers, np.asarray(uav.pos, dtype=np.float64).reshape(1, 3)]))
+        pad_order = used[nearest_neighbour_tour(metric, start=len(used))]
+
+        by_pad = np.argsort(pad_of, kind='stable')
+        bounds = np.searchsorted(pad_of[by_pad], pad_order)
+        counts = np.bincount(pad_of, minlength=len(self.pads))[pad_order]
+        path = []
+        for pad, start, count in zip(pad_order, bounds, counts):
+            members = by_pad[start:start + count]
+            tour = self._circle_tour(points[members], self.pads.positions[pad])
+            path.extend(assigned_sensors[idx] for idx in members[tour])
+        return path
+
+
+# 创建全局圆贪婪规划器实例（充电桩由网络绑定）
+circle_greedy_planner = CircleGreedyPlanner()
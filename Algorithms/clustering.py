@@ -0,0 +1,139 @@
+"""
+传感器到无人机的空间分配
+把传感器划分为uav_num个容量均衡（数量相差不超过1）的紧凑区域，替代随机打乱后等分，
+缩短每架无人机的巡回路径。所有步骤都是针对(n, k)数组的向量运算，k为无人机数量。
+
+sweep_partition: 以基站为中心按极角排序后等分（扇形区域）
+balanced_kmeans: 以扇形划分为初值的容量约束k-means（紧凑区域）
+"""
+
+import numpy as np
+
+KMEANS_ITERATIONS = 20
+KMEANS_SAMPLE = 50000  # 超过该数量时在样本上求质心
+
+
+def balanced_sizes(n: int, k: int) -> np.ndarray:
+    """n个传感器分给k架无人机时各自的数量，前n % k架多分一个（与随机等分一致）"""
+    sizes = np.full(k, n // k, dtype=np.int64)
+    sizes[:n % k] += 1
+    return sizes
+
+
+def _split_by_order(order: np.ndarray, k: int) -> np.ndarray:
+    """按order的顺序把传感器依次切成k段，返回每个传感器的段号"""
+    labels = np.empty(len(order), dtype=np.int64)
+    labels[order] = np.repeat(np.arange(k), balanced_sizes(len(order), k))
+    return labels
+
+
+def sweep_partition(points: np.ndarray, center, k: int) -> np.ndarray:
+    """
+    扫描法分区：按相对center的极角排序，从最大的角度空隙处开始等分成k个扇形
+
+    Args:
+        points: 传感器坐标(n, 2)或(n, 3)，只使用x、y
+        center: 扫描中心（基站坐标）
+        k: 分区数
+
+    Returns:
+        np.ndarray: 每个传感器的分区号(n,)
+    """
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    angles = np.arctan2(points[:, 1] - center[1], points[:, 0] - center[0])
+    order = np.argsort(angles, kind='stable')
+    # 从最大空隙之后开始扫描，避免把一簇传感器切到首尾两个扇形中
+    gaps = np.diff(angles[order], append=angles[order[0]] + 2 * np.pi)
+    order = np.roll(order, -(int(np.argmax(gaps)) + 1))
+    return _split_by_order(order, k)
+
+
+def _squared_distances(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    return (np.einsum('ij,ij->i', points, points)[:, None]
+            + np.einsum('ij,ij->i', centers, centers)[None, :]
+            - 2.0 * points @ centers.T)
+
+
+def _group_rank(keys: np.ndarray, k: int) -> np.ndarray:
+    """keys按当前顺序排列时，每个元素在同键元素中的名次（从0开始）"""
+    group = np.argsort(keys, kind='stable')
+    starts = np.searchsorted(keys[group], np.arange(k))
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[group] = np.arange(len(keys)) - starts[keys[group]]
+    return rank
+
+
+def capacitated_assign(cost: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """
+    带容量约束的分配：先把每个点分给代价最小的簇，再把超员簇中
+    转移代价最小的点移到仍有空位的簇，直到每个簇的数量恰为sizes
+
+    Args:
+        cost: 点到各簇的代价(n, k)
+        sizes: 各簇的容量(k,)，总和为n
+
+    Returns:
+        np.ndarray: 每个点的簇号(n,)
+    """
+    n, k = cost.shape
+    labels = np.argmin(cost, axis=1)
+    while True:
+        counts = np.bincount(labels, minlength=k)
+        over = counts - sizes
+        if not (over > 0).any():
+            return labels
+        spare = np.maximum(-over, 0)
+        # 超员簇的成员移到有空位的簇时的最小额外代价
+        members = np.flatnonzero(over[labels] > 0)
+        source = labels[members]
+        alt_cost = np.where(spare[None, :] > 0, cost[members], np.inf)
+        alt = np.argmin(alt_cost, axis=1)
+        delta = alt_cost[np.arange(len(members)), alt] - cost[members, source]
+        # 按额外代价从小到大转移：每个超员簇最多移出超员数，每个目标簇最多接收空位数
+        order = np.argsort(delta, kind='stable')
+        order = order[_group_rank(source[order], k) < over[source[order]]]
+        order = order[_group_rank(alt[order], k) < spare[alt[order]]]
+        labels[members[order]] = alt[order]
+
+
+def balanced_kmeans(points: np.ndarray, k: int, center=None, iterations: int = KMEANS_ITERATIONS,
+                    sample_size: int = KMEANS_SAMPLE) -> np.ndarray:
+    """
+    容量均衡的k-means：以扫描分区的质心为初值，交替进行带容量约束的分配和质心更新
+    传感器数超过sample_size时在等间隔抽取的样本上迭代求质心，最后对全部传感器做一次容量约束分配
+
+    Args:
+        points: 传感器坐标(n, 2)或(n, 3)，只使用x、y
+        k: 分区数
+        center: 初始扫描中心，默认所有点的质心
+        iterations: 最大迭代次数
+        sample_size: 求质心时使用的最大样本数
+
+    Returns:
+        np.ndarray: 每个传感器的分区号(n,)
+    """
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    xy = np.ascontiguousarray(points[:, :2], dtype=np.float64)
+    sample = xy[::max(1, -(-n // sample_size))] if n > sample_size else xy
+    sizes = balanced_sizes(len(sample), k)
+    labels = sweep_partition(sample, sample.mean(axis=0) if center is None else center, k)
+    centers = _centroids(sample, labels, k)
+    for _ in range(iterations):
+        new_labels = capacitated_assign(_squared_distances(sample, centers), sizes)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        centers = _centroids(sample, labels, k)
+    if sample is xy:
+        return labels
+    return capacitated_assign(_squared_distances(xy, centers), balanced_sizes(n, k))
+
+
+def _centroids(points: np.ndarray, labels: np.ndarray, k: int) -> np.ndarray:
+    counts = np.maximum(np.bincount(labels, minlength=k), 1)
+    centers = np.stack([np.bincount(labels, weights=points[:, d], minlength=k) for d in range(2)], axis=1)
+    return centers / counts[:, None]
@@ -0,0 +1,373 @@
+"""
+多无人机路径规划的模因算法（Memetic Algorithm）
+染色体为覆盖全部传感器的巨型路径（giant tour），由split解码器切分为uav_num段，
+每段即一架无人机的飞行路径；通过交叉、变异和2-opt/Or-opt局部搜索（教育）迭代改进。
+目标为最小化各无人机单周期能耗的最大值（决定网络寿命），其次为总能耗。
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+import numpy as np
+from uav import UAV
+from sensor import Sensor
+from Algorithms.test import _Metric, get_waypoints, improve_tour, nearest_neighbour_tour
+
+SPLIT_ITERATIONS = 48  # split解码器二分搜索的迭代次数
+
+
+def _route_costs(points, depot, node_cost, move_cost, pop):
+    """
+    批量计算split所需的前缀量
+    路径pop[r, i..j]的能耗 = A[r, i] + G[r, j]，G沿j单调不减（三角不等式）
+
+    Returns:
+        A, G: 形状均为(P, n)
+    """
+    pts = points[pop]
+    edge = np.sqrt(((pts[:, 1:] - pts[:, :-1]) ** 2).sum(-1))
+    prefix = np.zeros(pop.shape, dtype=np.float64)
+    np.cumsum(edge, axis=1, out=prefix[:, 1:])
+    d0 = np.sqrt(((pts - depot) ** 2).sum(-1))
+    w = np.cumsum(node_cost[pop], axis=1)
+    w_prev = np.zeros_like(w)
+    w_prev[:, 1:] = w[:, :-1]
+    A = move_cost * (d0 - prefix) - w_prev
+    G = move_cost * (prefix + d0) + w
+    # 消除浮点误差造成的非单调，保证split中按计数定位有效
+    np.maximum.accumulate(G, axis=1, out=G)
+    return A, G
+
+
+def _greedy_split(A, G, bound, uav_num):
+    """在能耗上限bound下贪心地切出尽量长的路径，返回各段结束位置(P, uav_num)和已覆盖的节点数"""
+    P, n = G.shape
+    rows = np.arange(P)
+    start = np.zeros(P, dtype=np.int64)
+    ends = np.empty((P, uav_num), dtype=np.int64)
+    for k in range(uav_num):
+        thr = bound - A[rows, np.minimum(start, n - 1)]
+        end = (G <= thr[:, None]).sum(axis=1)  # G单调，计数即最远可达位置+1
+        end = np.maximum(end, start)
+        ends[:, k] = end
+        start = end
+    return ends, start
+
+
+def split_population(A, G, uav_num):
+    """
+    批量split解码：对每条巨型路径二分搜索最小的单机能耗上限，
+    返回各段的结束位置(P, uav_num)、最大单机能耗和总能耗
+    """
+    P, n = G.shape
+    rows = np.arange(P)
+    idx = np.arange(n)
+    lo = (A[:, idx] + G[:, idx]).max(axis=1)  # 单个节点的往返能耗
+    hi = A[:, 0] + G[:, -1]                   # 一架无人机访问全部节点
+    lo = np.minimum(lo, hi)
+    for _ in range(SPLIT_ITERATIONS):
+        mid = (lo + hi) / 2
+        _, covered = _greedy_split(A, G, mid, uav_num)
+        ok = covered >= n
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+    ends, _ = _greedy_split(A, G, hi, uav_num)
+    ends[:, -1] = n
+
+    starts = np.zeros_like(ends)
+    starts[:, 1:] = ends[:, :-1]
+    nonempty = ends > starts
+    cost = np.where(nonempty,
+                    A[rows[:, None], np.minimum(starts, n - 1)] + G[rows[:, None], np.maximum(ends - 1, 0)],
+                    0.0)
+    return ends, cost.max(axis=1), cost.sum(axis=1)
+
+
+def _order_crossover(p1, p2, rng):
+    """OX交叉：保留p1的一段，其余位置按p2中的顺序填充"""
+    n = len(p1)
+    a, b = sorted(rng.choice(n + 1, size=2, replace=False))
+    child = np.empty(n, dtype=p1.dtype)
+    child[a:b] = p1[a:b]
+    mask = np.ones(n, dtype=bool)
+    mask[p1[a:b]] = False
+    rest = p2[mask[p2]]
+    child[:a] = rest[:a]
+    child[b:] = rest[a:]
+    return child
+
+
+def _double_bridge(tour, rng):
+    """double-bridge扰动：把路径切成四段A B C D后重组为A C B D"""
+    a, b, c = np.sort(rng.choice(np.arange(1, len(tour)), size=3, replace=False))
+    return np.concatenate([tour[:a], tour[b:c], tour[a:b], tour[c:]])
+
+
+# 进程池中各worker共享的问题数据
+_WORKER_STATE = {}
+
+
+def _init_worker(points, depot, node_cost, move_cost, uav_num, neighbour_k, max_rounds):
+    _WORKER_STATE.update(points=points, depot=depot, node_cost=node_cost, move_cost=move_cost,
+                         uav_num=uav_num, neighbour_k=neighbour_k, max_rounds=max_rounds)
+
+
+def _evaluate(pop, state=None):
+    """适应度评估：对一批巨型路径做split解码，返回各自的最大单机能耗和总能耗"""
+    state = state or _WORKER_STATE
+    A, G = _route_costs(state['points'], state['depot'], state['node_cost'], state['move_cost'], pop)
+    _, makespan, total = split_population(A, G, state['uav_num'])
+    return makespan, total
+
+
+def _educate(chromosome, state=None):
+    """教育（局部搜索）：按split切分后对每段做2-opt/Or-opt，再拼接回巨型路径"""
+    state = state or _WORKER_STATE
+    points, depot = state['points'], state['depot']
+    A, G = _route_costs(points, depot, state['node_cost'], state['move_cost'], chromosome[None, :])
+    ends, _, _ = split_population(A, G, state['uav_num'])
+    parts = []
+    start = 0
+    for end in ends[0]:
+        route = chromosome[start:end]
+        start = end
+        if len(route) > 2:
+            sub = np.vstack([points[route], depot[None, :]])
+            m = len(route)
+            tour = np.concatenate([[m], np.arange(m), [m]])
+            tour = improve_tour(_Metric(sub), tour, state['neighbour_k'], state['max_rounds'])
+            route = route[tour[1:-1]]
+        parts.append(route)
+    return np.concatenate(parts)
+
+
+class MemeticSolver:
+    """模因算法求解器，只处理坐标数组，与传感器/无人机对象无关"""
+
+    def __init__(self, pop_size=30, offspring=15, generations=200, time_budget=5.0,
+                 patience=30, mutation_rate=0.3, neighbour_k=8, max_rounds=50, workers=0, seed=None):
+        """
+        Args:
+            pop_size: 种群规模
+            offspring: 每代产生的子代数量
+            generations: 最大迭代代数
+            time_budget: 墙钟时间预算(秒)，None表示只受代数限制
+            patience: 最优解连续多少代没有改进时提前结束
+            mutation_rate: 子代做随机反转变异的概率
+            neighbour_k: 局部搜索的近邻候选数
+            max_rounds: 每次教育的局部搜索轮数上限
+            workers: 教育和评估子代的进程数，0或1表示在当前进程中执行
+            seed: 随机种子
+        """
+        self.pop_size = pop_size
+        self.offspring = offspring
+        self.generations = generations
+        self.time_budget = time_budget
+        self.patience = patience
+        self.mutation_rate = mutation_rate
+        self.neighbour_k = neighbour_k
+        self.max_rounds = max_rounds
+        self.workers = workers
+        self.seed = seed
+
+    def solve(self, points: np.ndarray, depot, uav_num: int, move_cost: float = 1.0,
+              node_cost: np.ndarray = None) -> List[np.ndarray]:
+        """
+        Args:
+            points: 航点坐标(n, 3)
+            depot: 无人机出发/返回点
+            uav_num: 无人机数量
+            move_cost: 单位飞行距离的能耗(J/m)
+            node_cost: 访问每个航点的额外能耗(J)，默认为0
+
+        Returns:
+            List[np.ndarray]: 每架无人机按访问顺序排列的航点下标
+        """
+        n = len(points)
+        if n == 0:
+            return [np.empty(0, dtype=np.int64) for _ in range(uav_num)]
+        points = np.asarray(points, dtype=np.float64)
+        depot = np.asarray(depot, dtype=np.float64).reshape(3)
+        node_cost = np.zeros(n) if node_cost is None else np.asarray(node_cost, dtype=np.float64)
+        rng = np.random.default_rng(self.seed)
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        state = dict(points=points, depot=depot, node_cost=node_cost, move_cost=move_cost,
+                     uav_num=uav_num, neighbour_k=self.neighbour_k, max_rounds=self.max_rounds)
+
+        executor = None
+        if self.workers and self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                           initargs=(points, depot, node_cost, move_cost, uav_num,
+                                                     self.neighbour_k, self.max_rounds))
+
+        def evaluate(pop):
+            """种群按行分块在进程池中评估"""
+            if executor is None or len(pop) < 2:
+                return _evaluate(pop, state)
+            chunks = np.array_split(pop, min(self.workers, len(pop)))
+            results = list(executor.map(_evaluate, chunks))
+            return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+        def out_of_time():
+            return deadline is not None and time.perf_counter() >= deadline
+
+        def educate_all(chromosomes):
+            """分批教育，超出时间预算时丢弃尚未处理的个体（至少保留一个）"""
+            batch = max(1, self.workers)
+            educated = []
+            for k in range(0, len(chromosomes), batch):
+                if educated and out_of_time():
+                    break
+                chunk = chromosomes[k:k + batch]
+                if executor is not None:
+                    educated += list(executor.map(_educate, chunk))
+                else:
+                    educated += [_educate(c, state) for c in chunk]
+            return np.array(educated)
+
+        try:
+            # 初始种群：最近邻巨型路径及其double-bridge扰动
+            all_points = np.vstack([points, depot[None, :]])
+            nn_tour = nearest_neighbour_tour(_Metric(all_points), start=n)
+            seeds = [nn_tour]
+            while len(seeds) < self.pop_size:
+                seeds.append(_double_bridge(nn_tour, rng) if n >= 8 else rng.permutation(n))
+            pop = educate_all(seeds)
+            makespan, total = evaluate(pop)
+            best = (makespan.min(), total[np.argmin(makespan)])
+            stale = 0
+
+            for _ in range(self.generations):
+                if out_of_time() or stale >= self.patience:
+                    break
+                children = []
+                for _ in range(self.offspring):
+                    # 二元锦标赛选择父代
+                    a, b = rng.integers(len(pop), size=2), rng.integers(len(pop), size=2)
+                    p1 = a[0] if (makespan[a[0]], total[a[0]]) < (makespan[a[1]], total[a[1]]) else a[1]
+                    p2 = b[0] if (makespan[b[0]], total[b[0]]) < (makespan[b[1]], total[b[1]]) else b[1]
+                    child = _order_crossover(pop[p1], pop[p2], rng)
+                    if rng.random() < self.mutation_rate and n > 2:
+                        i, j = sorted(rng.choice(n, size=2, replace=False))
+                        child[i:j + 1] = child[i:j + 1][::-1]
+                    children.append(child)
+                children = educate_all(children)
+                c_makespan, c_total = evaluate(children)
+
+                # 精英保留：合并后按(最大能耗, 总能耗)排序，去掉适应度重复的个体
+                pop = np.vstack([pop, children])
+                makespan = np.concatenate([makespan, c_makespan])
+                total = np.concatenate([total, c_total])
+                order = np.lexsort((total, makespan))
+                key = np.round(makespan[order], 6) + 1j * np.round(total[order], 6)
+                _, first = np.unique(key, return_index=True)
+                keep = order[np.sort(first)][:self.pop_size]
+                pop, makespan, total = pop[keep], makespan[keep], total[keep]
+
+                if (makespan[0], total[0]) < best:
+                    best = (makespan[0], total[0])
+                    stale = 0
+                else:
+                    stale += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        best = int(np.lexsort((total, makespan))[0])
+        A, G = _route_costs(points, depot, node_cost, move_cost, pop[best:best + 1])
+        ends, _, _ = split_population(A, G, uav_num)
+        routes = []
+        start = 0
+        for end in ends[0]:
+            routes.append(pop[best, start:end].copy())
+            start = end
+        return routes
+
+
+class MemeticPlanner:
+    """
+    基于模因算法的路径规划器，同时完成传感器分配与路径规划
+    与PathPlanner提供相同的plan_uav_path入口：首次调用时为整个机队求解，
+    结果按活跃传感器集合缓存，并把新的分配写回uav_sensor_assignments。
+    只在新一轮（某架无人机再次请求路径，即下一个周期）开始时按变化后的活跃集合重新求解；
+    同一轮中途有传感器失效时只从缓存路径中去掉它，不重新分配，已执行任务的无人机负责的传感器不会转给其他无人机
+    """
+
+    plans_fleet = True  # 需要传入全部传感器，并会改写分配结果
+
+    def __init__(self, solver: MemeticSolver = None):
+        self.solver = solver if solver is not None else MemeticSolver()
+        self._cache_key = None
+        self._routes = {}
+        self._taken = set()  # 本轮已取走路径的无人机
+
+    def plan_fleet(self, uav: UAV, sensors: List[Sensor], uav_ids: List[int],
+                   node_cost: Callable = None) -> Dict[int, List[Sensor]]:
+        """
+        为uav_ids中的全部无人机求解分配与路径，uav提供起点和功率参数
+
+        Args:
+            node_cost: node_cost(uav, sensors)返回每个传感器的充电与悬停能耗(J)，
+                       为None时split只按飞行能耗切分
+        """
+        if uav.P_mov == 0:
+            uav.computePower()
+        points = get_waypoints(sensors)
+        costs = None if node_cost is None else node_cost(uav, sensors)
+        routes = self.solver.solve(points, uav.pos, len(uav_ids), move_cost=uav.P_mov / uav.vel,
+                                   node_cost=costs)
+        return {uav_id: [sensors[idx] for idx in route] for uav_id, route in zip(uav_ids, routes)}
+
+    def plan_uav_path(self, uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict,
+                      node_cost: Callable = None) -> List[Sensor]:
+        """
+        为无人机规划路径（整个机队联合求解后取出该无人机的部分）
+
+        Args:
+            uav: 无人机对象
+            sensors: 所有传感器列表
+            uav_sensor_assignments: 无人机传感器分配字典，会被改写为求解得到的分配
+            node_cost: 每个传感器充电与悬停能耗的回调，见plan_fleet
+
+        Returns:
+            List[Sensor]: 按访问顺序排列的传感器列表
+        """
+        if not sensors or not uav_sensor_assignments:
+            return []
+        uav_ids = sorted(uav_sensor_assignments)
+        assigned_ids = set()
+        for ids in uav_sensor_assignments.values():
+            assigned_ids.update(ids)
+        fleet_sensors = [s for s in sensors if s.id in assigned_ids and s.is_active]
+
+        key = (tuple(uav_ids), frozenset(s.id for s in fleet_sensors))
+        if self._cache_key is None or (key != self._cache_key and uav.id in self._taken):
+            self._routes = self.plan_fleet(uav, fleet_sensors, uav_ids, node_cost)
+            self._cache_key = key
+            self._taken = set()
+            # 未被求解覆盖的（非活跃）传感器保留在原无人机名下
+            inactive = {uav_id: [sid for sid in uav_sensor_assignments[uav_id] if sid not in key[1]]
+                        for uav_id in uav_ids}
+            for uav_id in uav_ids:
+                uav_sensor_assignments[uav_id] = [s.id for s in self._routes[uav_id]] + inactive[uav_id]
+        self._taken.add(uav.id)
+        return [s for s in self._routes.get(uav.id, []) if s.is_active]
+
+
+# 创建全局模因规划器实例
+memetic_planner = MemeticPlanner()
+
+
+def plan_uav_path(uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict) -> List[Sensor]:
+    """
+    使用模因算法为无人机规划路径的全局函数
+
+    Args:
+        uav: 无人机对象
+        sensors: 所有传感器列表
+        uav_sensor_assignments: 无人机传感器分配字典
+
+    Returns:
+        List[Sensor]: 按访问顺序排列的传感器列表
+    """
+    return memetic_planner.plan_uav_path(uav, sensors, uav_sensor_assignments)
@@ -0,0 +1,135 @@
+"""
+按无人机缓存规划好的路径，并在收集周期之间增量修复
+路径以传感器在列存储中的下标保存：活跃传感器集合不变时直接复用；
+有传感器停用或被改派时，删除离开的节点、按最便宜插入加入新节点，
+改动累计超过路径长度的rebuild_fraction时才重新完整规划
+"""
+
+import threading
+from typing import Callable, Dict
+import numpy as np
+from Algorithms.test import HOVER_HEIGHT
+
+REBUILD_FRACTION = 0.2  # 自上次完整规划以来的累计改动超过路径长度的该比例时重新规划
+
+
+class CachedRoute():
+    """一架无人机的缓存路径"""
+
+    def __init__(self, start: tuple, order: np.ndarray):
+        self.start = start                 # 规划时的起点（任务结束后返回该点）
+        self.order = order                 # 按访问顺序排列的传感器下标
+        self.changes = 0                   # 自上次完整规划以来增删的节点数
+        self.planned_size = len(order)     # 上次完整规划时的节点数
+
+
+def cheapest_insertion(positions: np.ndarray, start: np.ndarray, order: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """
+    依次把nodes插入到使路径增长最小的边上，路径首尾为start，传感器处的航点为其上方HOVER_HEIGHT处
+
+    Args:
+        positions: 传感器坐标(N, 3)，按下标索引
+        start: 起点坐标(3,)
+        order: 当前路径的传感器下标
+        nodes: 待插入的传感器下标
+
+    Returns:
+        np.ndarray: 插入后的路径
+    """
+    order = order.copy()
+    hover = np.array([0.0, 0.0, HOVER_HEIGHT])
+    for node in nodes:
+        tour = np.vstack([start, positions[order] + hover, start])
+        x = positions[node] + hover
+        edge = np.linalg.norm(tour[1:] - tour[:-1], axis=1)
+        to_x = np.linalg.norm(tour - x, axis=1)
+        k = int(np.argmin(to_x[:-1] + to_x[1:] - edge))
+        order = np.insert(order, k, node)
+    return order
+
+
+class RouteCache:
+    """无人机ID → 缓存路径，不同无人机的路径可以在多个线程中同时查询"""
+
+    def __init__(self, rebuild_fraction: float = REBUILD_FRACTION):
+        self.rebuild_fraction = rebuild_fraction
+        self.routes: Dict[int, CachedRoute] = {}
+        self.full_plans = 0
+        self.repairs = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, uav_id: int = None):
+        """丢弃指定无人机（默认全部）的缓存路径"""
+        if uav_id is None:
+            self.routes.clear()
+        else:
+            self.routes.pop(uav_id, None)
+
+    def get_route(self, uav_id: int, start, indices: np.ndarray, positions: np.ndarray,
+                  plan: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        返回无人机访问indices中全部传感器的路径
+
+        Args:
+            uav_id: 无人机ID
+            start: 起点坐标
+            indices: 当前应访问的（活跃）传感器下标
+            positions: 传感器坐标(N, 3)
+            plan: 完整规划函数，返回按访问顺序排列的传感器下标
+
+        Returns:
+            np.ndarray: 按访问顺序排列的传感器下标
+        """
+        start = tuple(float(c) for c in start)
+        cached = self.routes.get(uav_id)
+        if cached is None or cached.start != start:
+            return self._rebuild(uav_id, start, plan)
+
+        keep = np.isin(cached.order, indices)
+        added = np.setdiff1d(indices, cached.order)
+        n_changes = int(len(keep) - np.count_nonzero(keep)) + len(added)
+        if n_changes == 0:
+            return cached.order
+        if cached.changes + n_changes > self.rebuild_fraction * max(cached.planned_size, len(indices)):
+            return self._rebuild(uav_id, start, plan)
+
+        order = cached.order[keep]
+        if len(added):
+            order = cheapest_insertion(positions, np.asarray(start), order, added)
+        cached.order = order
+        cached.changes += n_changes
+        with self._lock:
+            self.repairs += 1
+        return order
+
+    def to_arrays(self) -> dict:
+        """把缓存路径编码为数组：各无人机的路径首尾相接存放，lengths给出各段长度"""
+        uav_ids = sorted(self.routes)
+        routes = [self.routes[uav_id] for uav_id in uav_ids]
+        return {
+            'uav_ids': np.array(uav_ids, dtype=np.int64),
+            'starts': np.array([r.start for r in routes], dtype=np.float64).reshape(-1, 3),
+            'changes': np.array([r.changes for r in routes], dtype=np.int64),
+            'planned_size': np.array([r.planned_size for r in routes], dtype=np.int64),
+            'lengths': np.array([len(r.order) for r in routes], dtype=np.int64),
+            'orders': np.concatenate([r.order for r in routes]) if routes else np.empty(0, dtype=np.int64),
+        }
+
+    def load_arrays(self, arrays):
+        """用to_arrays的结果替换当前缓存"""
+        self.routes = {}
+        orders = np.split(arrays['orders'], np.cumsum(arrays['lengths'])[:-1]) if len(arrays['lengths']) else []
+        for uav_id, start, changes, planned, order in zip(arrays['uav_ids'].tolist(), arrays['starts'].tolist(),
+                                                         arrays['changes'].tolist(),
+                                                         arrays['planned_size'].tolist(), orders):
+            route = CachedRoute(tuple(start), order.copy())
+            route.changes = changes
+            route.planned_size = planned
+            self.routes[uav_id] = route
+
+    def _rebuild(self, uav_id, start, plan) -> np.ndarray:
+        order = np.asarray(plan(), dtype=np.int64)
+        with self._lock:
+            self.routes[uav_id] = CachedRoute(start, order)
+            self.full_plans += 1
+        return order
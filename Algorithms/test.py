@@ -1,18 +1,413 @@
+import bisect
+import math
 from typing import List
+import numpy as np
 from utils import Point, dist
 from uav import UAV
-from sensor import Sensor
+from sensor import Sensor, sensor_positions
+
+HOVER_HEIGHT = 1.0  # 无人机悬停在传感器上方的高度(m)
+FULL_MATRIX_LIMIT = 2048  # 航点数不超过该值时预先计算完整距离矩阵
+BLOCK_ROWS = 512  # 分块计算距离时每块的行数
+NN_POINTS_PER_CELL = 2  # 最近邻构造中网格平均每格的点数
+GRID_CELLS_PER_POINT = 8  # 网格总格数的上限（相对点数）
+IMPROVE_EPS = 1e-9
+IMPROVE_MIN_EVALUATIONS = 20000  # 局部搜索评估节点数上限的下限
+IMPROVE_EVALUATIONS_PER_POINT = 4  # 局部搜索平均每个点评估的次数上限
+
+
+def get_waypoint(sensor: Sensor) -> Point:
+    """无人机访问传感器时的悬停点（传感器上方HOVER_HEIGHT处）"""
+    return Point(sensor.position.x, sensor.position.y, sensor.position.z + HOVER_HEIGHT)
+
+
+def get_waypoints(sensors: List[Sensor]) -> np.ndarray:
+    """批量获取悬停点坐标，返回(n, 3)数组"""
+    points = sensor_positions(sensors).reshape(-1, 3)
+    points[:, 2] += HOVER_HEIGHT
+    return points
+
+
+class _Metric:
+    """点间距离：点数较少时查预计算矩阵，否则按坐标现算"""
+
+    def __init__(self, points: np.ndarray):
+        self.points = points
+        n = len(points)
+        self.matrix = None
+        if n <= FULL_MATRIX_LIMIT:
+            diff = points[:, None, :] - points[None, :, :]
+            self.matrix = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+    def __call__(self, a, b):
+        if self.matrix is not None:
+            return self.matrix[a, b]
+        diff = self.points[a] - self.points[b]
+        return np.sqrt(np.einsum('...k,...k->...', diff, diff))
+
+    def row(self, a):
+        if self.matrix is not None:
+            return self.matrix[a].copy()
+        diff = self.points - self.points[a]
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+    def neighbours(self, k):
+        """每个点最近的k个其他点：有距离矩阵时分块取，否则在网格中逐圈扩展搜索"""
+        n = len(self.points)
+        k = min(k, n - 1)
+        if self.matrix is None:
+            return _grid_neighbours(self.points, k)
+        result = np.empty((n, k), dtype=np.int64)
+        for start in range(0, n, BLOCK_ROWS):
+            rows = np.arange(start, min(start + BLOCK_ROWS, n))
+            block = self.matrix[rows].copy()
+            block[np.arange(len(rows)), rows] = np.inf
+            result[rows] = _k_smallest(block, k)
+        return result
+
+
+def _k_smallest(block: np.ndarray, k: int) -> np.ndarray:
+    """距离块每行最小的k个元素的列号，按距离升序"""
+    part = np.argpartition(block, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(block, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+class _Grid:
+    """按x、y把点分到平均每格约per_cell个点的均匀网格中，同一列x中相邻各格的点在order中连续"""
+
+    def __init__(self, points: np.ndarray, per_cell: float):
+        xy = points[:, :2]
+        n = len(points)
+        self.origin = xy.min(axis=0)
+        extent = np.ptp(xy, axis=0)
+        area = max(extent[0], 1.0) * max(extent[1], 1.0)
+        self.size = math.sqrt(area * per_cell / n)
+        self._bin(xy, extent)
+        # 点分布不均匀（如成簇）时按非空格的平均点数缩小格宽，总格数不超过点数的GRID_CELLS_PER_POINT倍
+        crowding = n / (len(np.unique(self.flat)) * per_cell)
+        size = max(self.size / math.sqrt(crowding), math.sqrt(area / (GRID_CELLS_PER_POINT * n)))
+        if crowding >= 2 and size < self.size:
+            self.size = size
+            self._bin(xy, extent)
+        self.order = np.argsort(self.flat, kind='stable')
+        self.starts = np.searchsorted(self.flat[self.order], np.arange(self.shape.prod() + 1))
+
+    def _bin(self, xy, extent):
+        self.shape = (extent // self.size).astype(np.int64) + 1
+        self.flat = self._flat(self.cell_of(xy))
+
+    def cell_of(self, xy):
+        return np.minimum(np.maximum(((xy - self.origin) // self.size).astype(np.int64), 0), self.shape - 1)
+
+    def _flat(self, cell):
+        return cell[..., 0] * self.shape[1] + cell[..., 1]
+
+    def window(self, cx, cy, r):
+        """以(cx, cy)格为中心、半径r格的窗口中的点，以及窗口的格范围(x0, x1, y0, y1)"""
+        x0, x1 = max(cx - r, 0), min(cx + r, int(self.shape[0]) - 1)
+        y0, y1 = max(cy - r, 0), min(cy + r, int(self.shape[1]) - 1)
+        ny = int(self.shape[1])
+        points = np.concatenate([self.order[self.starts[x * ny + y0]:self.starts[x * ny + y1 + 1]]
+                                 for x in range(x0, x1 + 1)])
+        return points, (x0, x1, y0, y1)
+
+    def reach(self, point, bounds):
+        """窗口外的点与point的距离下界（网格边界之外没有点），窗口覆盖整个网格时为inf"""
+        x0, x1, y0, y1 = bounds
+        sides = []
+        if x0 > 0:
+            sides.append(point[0] - (self.origin[0] + x0 * self.size))
+        if y0 > 0:
+            sides.append(point[1] - (self.origin[1] + y0 * self.size))
+        if x1 < self.shape[0] - 1:
+            sides.append(self.origin[0] + (x1 + 1) * self.size - point[0])
+        if y1 < self.shape[1] - 1:
+            sides.append(self.origin[1] + (y1 + 1) * self.size - point[1])
+        return min(sides) if sides else math.inf
+
+
+def _grid_neighbours(points: np.ndarray, k: int) -> np.ndarray:
+    """
+    同一格中的点一起在周围(2r+1)^2格内找k近邻：格中的点到窗口外的距离不小于r个格宽，
+    第k近的距离不超过它时结果精确，否则扩大r。每个点只与附近的点计算距离
+    """
+    n = len(points)
+    result = np.empty((n, k), dtype=np.int64)
+    if k == 0:
+        return result
+    grid = _Grid(points, k)
+    ny = int(grid.shape[1])
+    for cell in np.unique(grid.flat):
+        members = grid.order[grid.starts[cell]:grid.starts[cell + 1]]
+        cx, cy = divmod(int(cell), ny)
+        r = 1
+        while True:
+            cand, bounds = grid.window(cx, cy, r)
+            whole = grid.reach(points[members[0]], bounds) == math.inf
+            if len(cand) > k or whole:
+                diff = points[members][:, None, :] - points[cand][None, :, :]
+                block = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+                block[members[:, None] == cand[None, :]] = np.inf
+                nearest = _k_smallest(block, k)
+                if whole or block[np.arange(len(members))[:, None], nearest].max() <= r * grid.size:
+                    result[members] = cand[nearest]
+                    break
+            r += 1
+    return result
+
+
+def _ring_cells(cx, cy, r, nx, ny):
+    """以(cx, cy)格为中心的第r圈（切比雪夫距离为r）中位于网格内的格"""
+    if r == 0:
+        return [(cx, cy)]
+    y0, y1 = max(cy - r, 0), min(cy + r, ny - 1)
+    cells = [(gx, gy) for gx in (cx - r, cx + r) if 0 <= gx < nx for gy in range(y0, y1 + 1)]
+    cells += [(gx, gy) for gy in (cy - r, cy + r) if 0 <= gy < ny
+              for gx in range(max(cx - r + 1, 0), min(cx + r - 1, nx - 1) + 1)]
+    return cells
+
+
+def nearest_neighbour_tour(metric: _Metric, start: int) -> np.ndarray:
+    """从start出发的最近邻贪心序列（不含start），距离相同时取下标较小者"""
+    n = len(metric.points)
+    order = np.empty(n - 1, dtype=np.int64)
+    if metric.matrix is not None:
+        visited = np.zeros(n, dtype=bool)
+        visited[start] = True
+        current = start
+        for step in range(n - 1):
+            row = metric.row(current)
+            row[visited] = np.inf
+            current = int(np.argmin(row))
+            visited[current] = True
+            order[step] = current
+        return order
+
+    # 点数较多时在剩余点的网格中由近及远查找（逐点的Python运算，窗口中只有十几个点），
+    # 已访问的点过半时按剩余的点重建网格
+    points = metric.points
+    remaining = np.delete(np.arange(n), start)
+    x, y, z = points[start].tolist()
+    step = 0
+    while step < n - 1:
+        grid = _Grid(points[remaining], NN_POINTS_PER_CELL)
+        xs, ys, zs = points[remaining].T.tolist()
+        buckets = [grid.order[lo:hi].tolist() for lo, hi in zip(grid.starts[:-1], grid.starts[1:])]
+        (ox, oy), size = grid.origin.tolist(), grid.size
+        nx, ny = grid.shape.tolist()
+        alive = np.ones(len(remaining), dtype=bool)
+        n_dead = 0
+        while step < n - 1 and n_dead * 2 <= len(remaining):
+            cx = min(max(int((x - ox) // size), 0), nx - 1)
+            cy = min(max(int((y - oy) // size), 0), ny - 1)
+            best, k = math.inf, -1
+            r = 0
+            while True:  # 由内向外逐圈检查
+                x0, x1, y0, y1 = max(cx - r, 0), min(cx + r, nx - 1), max(cy - r, 0), min(cy + r, ny - 1)
+                for gx, gy in _ring_cells(cx, cy, r, nx, ny):
+                    for j in buckets[gx * ny + gy]:
+                        sq = (xs[j] - x) ** 2 + (ys[j] - y) ** 2 + (zs[j] - z) ** 2
+                        if sq < best or (sq == best and j < k):
+                            best, k = sq, j
+                # 窗口外的点与当前点的距离下界（网格边界之外没有点），不小于已找到的最近距离时即为最近点
+                reach = min(x - (ox + x0 * size) if x0 > 0 else math.inf,
+                            y - (oy + y0 * size) if y0 > 0 else math.inf,
+                            ox + (x1 + 1) * size - x if x1 < nx - 1 else math.inf,
+                            oy + (y1 + 1) * size - y if y1 < ny - 1 else math.inf)
+                if k >= 0 and (reach == math.inf or (reach > 0 and best <= reach * reach)):
+                    break
+                r += 1
+            buckets[grid.flat[k]].remove(k)
+            order[step] = remaining[k]
+            x, y, z = xs[k], ys[k], zs[k]
+            alive[k] = False
+            n_dead += 1
+            step += 1
+        remaining = remaining[alive]
+    return order
+
+
+def tour_length(metric: _Metric, tour: np.ndarray) -> float:
+    return float(metric(tour[:-1], tour[1:]).sum())
+
+
+def _two_opt_moves(metric, tour, pos, nbrs, nbr_dist, edge_len, depot, active):
+    """基于近邻表的2-opt候选：反转tour[lo+1..hi]，每条活跃边取最优的一个"""
+    edge_idx = np.flatnonzero(active[tour[:-1]] | active[tour[1:]])
+    if len(edge_idx) == 0:
+        return []
+    i = edge_idx[:, None]
+    cand = nbrs[tour[edge_idx]]
+    valid = cand != depot
+    j = np.where(valid, pos[cand], i)
+    lo = np.minimum(i, j)
+    hi = np.maximum(i, j)
+    # 新边(tour[lo], tour[hi])即(a, c)，距离直接取自近邻表
+    delta = (nbr_dist[tour[edge_idx]] + metric(tour[lo + 1], tour[hi + 1])
+             - edge_len[lo] - edge_len[hi])
+    delta = np.where(valid & (hi > lo + 1), delta, np.inf)
+    best = np.argmin(delta, axis=1)
+    rows = np.arange(len(edge_idx))
+    best_delta = delta[rows, best]
+    improving = best_delta < -IMPROVE_EPS
+    key = tour[edge_idx][improving]
+    return [(float(d), int(l), int(h) + 1, 0, (int(l), int(h)), int(a))
+            for d, l, h, a in zip(best_delta[improving], lo[rows, best][improving], hi[rows, best][improving], key)]
+
+
+def _or_opt_moves(metric, tour, pos, nbrs, nbr_dist, edge_len, depot, active, seg_len):
+    """
+    Or-opt候选：把长度为seg_len的片段(s0..s1)搬到某个近邻c旁边（可翻转）
+    对s0的近邻c：插入c→s0..s1→succ(c) 或 pred(c)→s1..s0→c
+    对s1的近邻c：插入c→s1..s0→succ(c) 或 pred(c)→s0..s1→c（片段长度为1时与前者相同）
+    """
+    n_last = len(tour) - 2  # 最后一个传感器所在位置
+    starts = np.arange(1, n_last - seg_len + 2)
+    starts = starts[active[tour[starts]] | active[tour[starts + seg_len - 1]]]
+    if len(starts) == 0:
+        return []
+    s0 = tour[starts]
+    s1 = tour[starts + seg_len - 1]
+    gain = edge_len[starts - 1] + edge_len[starts + seg_len - 1] - metric(tour[starts - 1], tour[starts + seg_len])
+    st = starts[:, None]
+
+    ends = [(s0, s1)] if seg_len == 1 else [(s0, s1), (s1, s0)]
+    deltas, edges, revs = [], [], []
+    for near, far in ends:
+        cand = nbrs[near]
+        pc = pos[cand]
+        # (c, succ(c))：c与near相连，far与succ(c)相连
+        # (pred(c), c)：pred(c)与far相连，near与c相连
+        for edge, other in ((pc, 1), (pc - 1, 0)):
+            valid = ((cand != depot) & (edge >= 0) & (edge <= n_last)
+                     & ((edge <= st - 2) | (edge >= st + seg_len)))
+            edge = np.where(valid, edge, 0)
+            delta = nbr_dist[near] + metric(far[:, None], tour[edge + other]) - edge_len[edge] - gain[:, None]
+            deltas.append(np.where(valid, delta, np.inf))
+            edges.append(edge)
+            # 片段按s0在前插入为正向，否则翻转
+            revs.append(np.full(edge.shape, (near is s1) == (other == 1)))
+    delta = np.concatenate(deltas, axis=1)
+    edge = np.concatenate(edges, axis=1)
+    rev = np.concatenate(revs, axis=1)
+
+    best = np.argmin(delta, axis=1)
+    rows = np.arange(len(starts))
+    best_delta = delta[rows, best]
+    improving = best_delta < -IMPROVE_EPS
+    moves = []
+    for d, i, e, r in zip(best_delta[improving], starts[improving], edge[rows, best][improving], rev[rows, best][improving]):
+        i, e = int(i), int(e)
+        moves.append((float(d), min(e, i - 1), max(e + 1, i + seg_len), 1, (i, e, bool(r), seg_len), int(tour[i])))
+    return moves
+
+
+def _apply_move(tour, kind, args):
+    """
+    原地执行移动：kind为0时是2-opt反转，为1时是Or-opt片段搬移
+    返回边发生变化的端点，用于重新激活搜索
+    """
+    if kind == 0:
+        lo, hi = args
+        touched = tour[[lo, lo + 1, hi, hi + 1]]
+        tour[lo + 1:hi + 1] = tour[lo + 1:hi + 1][::-1].copy()
+        return touched
+    i, e, rev, seg_len = args
+    touched = tour[[i - 1, i, i + seg_len - 1, i + seg_len, e, e + 1]]
+    seg = tour[i:i + seg_len].copy()
+    if rev:
+        seg = seg[::-1]
+    if e < i:
+        tour[e + 1 + seg_len:i + seg_len] = tour[e + 1:i].copy()
+        tour[e + 1:e + 1 + seg_len] = seg
+    else:
+        tour[i:e + 1 - seg_len] = tour[i + seg_len:e + 1].copy()
+        tour[e + 1 - seg_len:e + 1] = seg
+    return touched
+
+
+def improve_tour(metric: _Metric, tour: np.ndarray, neighbour_k: int = 8,
+                 max_rounds: int = 1000, max_seg_len: int = 3, max_evaluations: int = None) -> np.ndarray:
+    """
+    2-opt / Or-opt 局部搜索，tour首尾为固定的起点
+    每轮向量化评估活跃节点（don't-look bits）的候选，贪心地同时执行互不重叠的改进移动，
+    并重新激活边发生变化的端点及其近邻；活跃节点耗尽后做一次全量检查，
+    直到没有改进、达到轮数上限或评估的节点数（各轮活跃节点数之和）达到max_evaluations。
+    max_evaluations为None时取max(IMPROVE_MIN_EVALUATIONS, IMPROVE_EVALUATIONS_PER_POINT × 点数)，
+    点数较少时不受限制，上万个点时耗时与点数成正比
+    """
+    tour = tour.copy()
+    n_points = len(metric.points)
+    if len(tour) < 4:
+        return tour
+    depot = int(tour[0])
+    nbrs = metric.neighbours(neighbour_k)
+    nbr_dist = metric(np.arange(n_points)[:, None], nbrs)
+    active = np.ones(n_points, dtype=bool)
+    full_check = True
+    if max_evaluations is None:
+        max_evaluations = max(IMPROVE_MIN_EVALUATIONS, IMPROVE_EVALUATIONS_PER_POINT * n_points)
+    evaluations = 0
+
+    for _ in range(max_rounds):
+        n_active = int(np.count_nonzero(active))
+        if evaluations and evaluations + n_active > max_evaluations:
+            break
+        evaluations += n_active
+        pos = np.empty(n_points, dtype=np.int64)
+        pos[tour[1:-1]] = np.arange(1, len(tour) - 1)
+        pos[depot] = 0
+        edge_len = metric(tour[:-1], tour[1:])
+
+        moves = _two_opt_moves(metric, tour, pos, nbrs, nbr_dist, edge_len, depot, active)
+        for seg_len in range(1, max_seg_len + 1):
+            moves += _or_opt_moves(metric, tour, pos, nbrs, nbr_dist, edge_len, depot, active, seg_len)
+        if not moves:
+            if full_check:
+                break
+            active[:] = True
+            full_check = True
+            continue
+        active[:] = False
+        full_check = False
+
+        # 按改进量从大到小选择影响区间互不重叠的移动，它们可以独立执行；
+        # 因冲突被跳过的候选保持活跃，下一轮重新评估
+        moves.sort(key=lambda m: m[0])
+        starts, ends = [], []
+        for delta, lo, hi, kind, args, key in moves:
+            k = bisect.bisect_left(starts, lo)
+            if (k > 0 and ends[k - 1] >= lo) or (k < len(starts) and starts[k] <= hi):
+                active[key] = True
+                continue
+            starts.insert(k, lo)
+            ends.insert(k, hi)
+            touched = _apply_move(tour, kind, args)
+            active[touched] = True
+            active[nbrs[touched]] = True
+    return tour
 
 
 class PathPlanner:
     """路径规划算法类"""
     
-    def __init__(self):
-        pass
+    def __init__(self, improve=True, neighbour_k=8, max_rounds=1000, max_evaluations=None):
+        """
+        Args:
+            improve: 是否在最近邻构造后进行2-opt/Or-opt局部优化
+            neighbour_k: 局部搜索的近邻候选数
+            max_rounds: 局部搜索最大轮数
+            max_evaluations: 局部搜索评估的节点数上限，None按点数确定（见improve_tour）
+        """
+        self.improve = improve
+        self.neighbour_k = neighbour_k
+        self.max_rounds = max_rounds
+        self.max_evaluations = max_evaluations
     
-    def plan_uav_path(self, uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict) -> List[Point]:
+    def plan_uav_path(self, uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict) -> List[Sensor]:
         """
-        为无人机规划路径（简单的贪心算法），只访问分配给该无人机的传感器
+        为无人机规划路径（最近邻构造+2-opt/Or-opt优化），只访问分配给该无人机的传感器
         
         Args:
             uav: 无人机对象
@@ -20,7 +415,7 @@ class PathPlanner:
             uav_sensor_assignments: 无人机传感器分配字典
             
         Returns:
-            List[Point]: 规划好的路径点列表
+            List[Sensor]: 按访问顺序排列的传感器列表，悬停点由get_waypoint给出
         """
         if not sensors:
             return []
@@ -31,41 +426,33 @@ class PathPlanner:
             return []
         
         # 获取分配给当前无人机的活跃传感器
+        assigned_sensor_ids = set(assigned_sensor_ids)
         assigned_sensors = [s for s in sensors if s.id in assigned_sensor_ids and s.is_active]
         if not assigned_sensors:
             return []
         
-        # 简单的贪心算法：选择距离当前位置最近的传感器
-        current_pos = uav.pos
-        path = []
-        remaining_sensors = assigned_sensors.copy()
+        # 航点坐标，最后一行为无人机起点（任务结束后返回）
+        n = len(assigned_sensors)
+        points = np.vstack([get_waypoints(assigned_sensors),
+                            np.asarray(uav.pos, dtype=np.float64).reshape(1, 3)])
+        metric = _Metric(points)
         
-        while remaining_sensors:
-            # 找到距离当前位置最近的传感器
-            min_dist = float('inf')
-            next_sensor = None
-            
-            for sensor in remaining_sensors:
-                dist_to_sensor = dist(current_pos, sensor.position)
-                if dist_to_sensor < min_dist:
-                    min_dist = dist_to_sensor
-                    next_sensor = sensor
-            
-            if next_sensor:
-                # 无人机飞到传感器上方1米处
-                target_pos = Point(next_sensor.position.x, next_sensor.position.y, next_sensor.position.z + 1)
-                path.append(target_pos)
-                current_pos = target_pos
-                remaining_sensors.remove(next_sensor)
+        # 最近邻贪心构造初始路径
+        order = nearest_neighbour_tour(metric, start=n)
+        tour = np.concatenate([[n], order, [n]])
+        
+        if self.improve:
+            tour = improve_tour(metric, tour, self.neighbour_k, self.max_rounds,
+                                max_evaluations=self.max_evaluations)
         
-        return path
+        return [assigned_sensors[idx] for idx in tour[1:-1]]
 
 
 # 创建全局路径规划器实例
 path_planner = PathPlanner()
 
 
-def plan_uav_path(uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict) -> List[Point]:
+def plan_uav_path(uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict) -> List[Sensor]:
     """
     为无人机规划路径的全局函数
     
@@ -75,6 +462,6 @@ def plan_uav_path(uav: UAV, sensors: List[Sensor], uav_sensor_assignments: dict)
         uav_sensor_assignments: 无人机传感器分配字典
         
     Returns:
-        List[Point]: 规划好的路径点列表
+        List[Sensor]: 按访问顺序排列的传感器列表
     """
-    return path_planner.plan_uav_path(uav, sensors, uav_sensor_assignments)
\ No newline at end of file
+    return path_planner.plan_uav_path(uav, sensors, uav_sensor_assignments)
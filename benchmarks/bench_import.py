@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动开销基准
+在全新的解释器中多次导入network，取最短耗时与预算比较，超出预算时以非零状态退出。
+用法: python benchmarks/bench_import.py [--budget 秒] [--repeat 次数]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET = 0.5  # 导入network的时间预算(秒)
+
+_SNIPPET = (
+    "import time, sys\n"
+    "t0 = time.perf_counter()\n"
+    "import network\n"
+    "t1 = time.perf_counter()\n"
+    "print(t1 - t0, 'torch' in sys.modules)\n"
+)
+
+
+def measure_import_time(repeat=5):
+    """返回(最短导入耗时, 是否加载了torch)"""
+    best = float('inf')
+    torch_loaded = False
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _SNIPPET], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = out.split()[-2:]
+        best = min(best, float(elapsed))
+        torch_loaded = torch_loaded or loaded == 'True'
+    return best, torch_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='network导入时间基准')
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET, help='导入时间预算(秒)')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数')
+    args = parser.parse_args()
+
+    elapsed, torch_loaded = measure_import_time(args.repeat)
+    print(f"import network: {elapsed * 1000:.1f} ms (预算 {args.budget * 1000:.0f} ms)")
+    assert not torch_loaded, "导入network时不应加载torch"
+    assert elapsed <= args.budget, f"导入耗时{elapsed:.3f}s超出预算{args.budget:.3f}s"
+
+
+if __name__ == '__main__':
+    main()
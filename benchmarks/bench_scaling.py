@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+规模基准
+在合成场景（50 ~ 1M个传感器）上分阶段测量 加载（文本/二进制）、初始化、分配、路径规划、任务仿真 和 完整run_system，
+记录每阶段的墙钟时间、峰值RSS和内存分配，结果以JSON输出，并与保存的基线比较，出现退化时以非零状态退出。
+
+每个场景在独立的子进程中运行（RSS互不影响）；内存分配用tracemalloc在第二遍中单独测量，避免影响计时。
+
+用法:
+    python benchmarks/bench_scaling.py                       # 默认规模，与基线比较
+    python benchmarks/bench_scaling.py --sizes 50 1000       # 指定规模
+    python benchmarks/bench_scaling.py --save-baseline       # 把本次结果保存为基线
+    python benchmarks/bench_scaling.py --no-compare          # 只测量，不与基线比较
+
+与基线比较时，基线文件不存在或基线中缺少所测规模都以非零状态退出，避免退化检查被静默跳过。
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = [50, 1000, 10000, 100000, 1000000]
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+SENSORS_PER_UAV = 10000   # 场景中每架无人机负责的传感器数上限
+PLAN_MAX_SENSORS = 100000  # 超过该规模不再测路径规划和任务仿真
+RUN_MAX_SENSORS = 10000    # 超过该规模不再测完整run_system
+
+TIME_TOLERANCE = 1.5    # 允许的相对耗时增长倍数
+TIME_SLACK = 0.05       # 允许的绝对耗时增长(秒)，避免小阶段的计时噪声
+MEMORY_TOLERANCE = 1.3  # 允许的内存增长倍数
+
+
+def _current_rss():
+    """当前常驻内存(字节)，仅Linux可用"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss():
+    import resource
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class _RssSampler:
+    """在后台线程中采样RSS，得到单个阶段内的峰值"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak = _current_rss() or 0
+        if _current_rss() is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss())
+        else:
+            self.peak = _max_rss()
+
+
+def make_dataset(n, path, seed=0):
+    """生成与sensor_data.txt格式相同的合成数据，并写一份同名的二进制文件"""
+    import numpy as np
+    from utils import InputParameter
+    from sensor import save_sensor_binary
+    rng = np.random.default_rng(seed)
+    params = InputParameter()
+    data = np.empty((n, 5))
+    data[:, 0] = np.arange(1, n + 1)
+    data[:, 1] = rng.uniform(0, params.AREA_LONG, n)
+    data[:, 2] = rng.uniform(0, params.AREA_WIDE, n)
+    data[:, 3] = rng.uniform(0, 50, n)
+    data[:, 4] = np.clip(rng.normal(550, 150, n), 100, 1000)
+    np.savetxt(path, data, fmt=['%d', '%.2f', '%.2f', '%.2f', '%.2f'])
+    save_sensor_binary(_binary_path(path), data[:, 0], data[:, 1:4], data[:, 4])
+
+
+def _binary_path(path):
+    from sensor import SENSOR_BIN_SUFFIX
+    return os.path.splitext(path)[0] + SENSOR_BIN_SUFFIX
+
+
+def run_scenario(n, path, trace_alloc):
+    """在当前进程中依次执行各阶段，返回 阶段名 -> 指标"""
+    from utils import InputParameter, quiet
+    from network import WRSNNetwork, load_sensor_data
+
+    params = InputParameter()
+    params.sensor_num = n
+    params.uav_num = max(params.uav_num, math.ceil(n / SENSORS_PER_UAV))
+    results = {}
+    state = {}
+
+    def stage(name, fn):
+        if trace_alloc:
+            tracemalloc.start()
+        with _RssSampler() as rss:
+            start = time.perf_counter()
+            state[name] = fn()
+            elapsed = time.perf_counter() - start
+        metrics = {'time': elapsed, 'peak_rss': rss.peak}
+        if trace_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics.update(alloc_current=current, alloc_peak=peak)
+        results[name] = metrics
+
+    with quiet():
+        stage('load_sensors', lambda: load_sensor_data(params.SENSOR_POWER, path))
+        stage('load_sensors_bin', lambda: load_sensor_data(params.SENSOR_POWER, _binary_path(path)))
+        sensors = state['load_sensors']
+        stage('init_network', lambda: WRSNNetwork(params, sensors=sensors))
+        network = state['init_network']
+        stage('assign_sensors', network._assign_sensors_to_uavs)
+        if n <= PLAN_MAX_SENSORS:
+            stage('plan_uav_path', lambda: network._plan_uav_path(network.uavs[0]))
+            stage('simulate_uav_mission', lambda: network._simulate_uav_mission(network.uavs[0]))
+        if n <= RUN_MAX_SENSORS:
+            def full_run():
+                run_network = WRSNNetwork(params, sensors=sensors, seed=0)
+                run_network._assign_sensors_to_uavs()
+                return run_network.run_system()
+            stage('run_system', full_run)
+    return {'sensors': n, 'uavs': params.uav_num, 'stages': results}
+
+
+def _run_worker(n, path, trace_alloc):
+    """在子进程中运行一个场景，返回解析后的JSON"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker', str(n), path]
+    if trace_alloc:
+        cmd.append('--trace-alloc')
+    out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"规模{n}的基准运行失败:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(sizes, trace_alloc=True):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f'sensors_{n}.txt')
+            make_dataset(n, path)
+            result = _run_worker(n, path, trace_alloc=False)
+            if trace_alloc:
+                alloc = _run_worker(n, path, trace_alloc=True)
+                for name, metrics in alloc['stages'].items():
+                    result['stages'][name]['alloc_peak'] = metrics['alloc_peak']
+                    result['stages'][name]['alloc_current'] = metrics['alloc_current']
+            results.append(result)
+            print(_format_scenario(result), file=sys.stderr)
+    return results
+
+
+def _code_version():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _format_scenario(result):
+    lines = [f"== {result['sensors']} 个传感器 / {result['uavs']} 架无人机 =="]
+    for name, m in result['stages'].items():
+        alloc = f"{m['alloc_peak'] / 2**20:9.1f} MiB" if 'alloc_peak' in m else '        -'
+        lines.append(f"  {name:<22}{m['time']:10.4f} s  RSS {m['peak_rss'] / 2**20:9.1f} MiB  分配峰值 {alloc}")
+    return '\n'.join(lines)
+
+
+def compare(results, baseline):
+    """与基线比较，返回退化描述列表（基线中没有的规模也计入，无法判断是否退化）"""
+    base = {r['sensors']: r['stages'] for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        stages = base.get(result['sensors'])
+        if stages is None:
+            regressions.append(f"{result['sensors']}: 基线中没有该规模，使用 --save-baseline 更新基线")
+            continue
+        for name, m in result['stages'].items():
+            ref = stages.get(name)
+            if ref is None:
+                continue
+            if m['time'] > ref['time'] * TIME_TOLERANCE + TIME_SLACK:
+                regressions.append(f"{result['sensors']}/{name}: 耗时 {ref['time']:.4f}s -> {m['time']:.4f}s")
+            if 'alloc_peak' in m and 'alloc_peak' in ref and m['alloc_peak'] > ref['alloc_peak'] * MEMORY_TOLERANCE:
+                regressions.append(f"{result['sensors']}/{name}: 分配峰值 {ref['alloc_peak']} -> {m['alloc_peak']} 字节")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WRSN规模基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='传感器规模列表')
+    parser.add_argument('--output', help='结果JSON输出路径，默认打印到标准输出')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='基线文件路径')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果保存为基线')
+    parser.add_argument('--no-compare', action='store_true', help='只测量，不与基线比较')
+    parser.add_argument('--no-alloc', action='store_true', help='不测量内存分配（省去第二遍运行）')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('path', nargs='?', help=argparse.SUPPRESS)
+    parser.add_argument('--trace-alloc', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_scenario(args.worker, args.path, args.trace_alloc)))
+        return
+
+    check = not (args.save_baseline or args.no_compare)
+    if check and not os.path.exists(args.baseline):
+        print(f"未找到基线 {args.baseline}，先用 --save-baseline 创建，或用 --no-compare 只测量", file=sys.stderr)
+        sys.exit(2)
+
+    import numpy as np
+    report = {
+        'version': _code_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': run_benchmarks(args.sizes, trace_alloc=not args.no_alloc),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"基线已保存到 {args.baseline}", file=sys.stderr)
+        return
+    if not check:
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        regressions = compare(report['results'], json.load(f))
+    if regressions:
+        print("\n!!! 性能退化 !!!", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        sys.exit(1)
+    print("与基线相比没有退化", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+参数扫描设计
+从YAML读取扫描设计，展开为InputParameter的各组取值。格式见configs/config.yml：
+    base:       所有扫描点共用的参数
+    design:     grid（各参数取值的全组合）或random（每个参数独立随机采样）
+    samples:    random设计的采样点数
+    seed:       random设计的随机种子
+    parameters: 参数名 -> 取值，可以是
+                  列表            [2, 3, 4]
+                  等距取值        {low: 10, high: 30, num: 5}（grid）
+                  区间            {low: 1.0e5, high: 1.0e6}（random，均匀分布，log: true时对数均匀）
+                int: true时取整
+"""
+
+import itertools
+from typing import Dict, List
+import numpy as np
+
+from utils import InputParameter
+
+DEFAULT_CONFIG_PATH = './configs/config.yml'
+
+
+def load_config(path: str = DEFAULT_CONFIG_PATH) -> dict:
+    """读取YAML扫描设计"""
+    import yaml  # 只有参数扫描需要PyYAML
+
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}的顶层应为映射")
+    return config
+
+
+def _scalar(value):
+    """NumPy标量转为Python数值，保证参数可以写入JSON"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _grid_values(name, spec) -> list:
+    if isinstance(spec, list):
+        return spec
+    if isinstance(spec, dict) and {'low', 'high', 'num'} <= spec.keys():
+        values = np.linspace(spec['low'], spec['high'], int(spec['num']))
+        if spec.get('int'):
+            values = np.unique(np.round(values).astype(np.int64))
+        return [_scalar(v) for v in values]
+    if isinstance(spec, dict):
+        raise ValueError(f"参数{name}在grid设计中应为列表或{{low, high, num}}")
+    return [spec]
+
+
+def _sample(name, spec, rng):
+    if isinstance(spec, list):
+        return _scalar(spec[rng.integers(len(spec))])
+    if isinstance(spec, dict) and {'low', 'high'} <= spec.keys():
+        low, high = float(spec['low']), float(spec['high'])
+        if spec.get('log'):
+            value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            value = float(rng.uniform(low, high))
+        return int(round(value)) if spec.get('int') else value
+    if isinstance(spec, dict):
+        raise ValueError(f"参数{name}在random设计中应为列表或{{low, high}}")
+    return spec
+
+
+def expand_design(config: dict) -> List[Dict]:
+    """
+    展开扫描设计
+
+    Returns:
+        List[Dict]: 各扫描点的参数覆盖值（base与扫描参数合并）
+    """
+    base = dict(config.get('base') or {})
+    parameters = config.get('parameters') or {}
+    design = config.get('design', 'grid')
+    names = list(parameters)
+    if design == 'grid':
+        grids = [_grid_values(name, parameters[name]) for name in names]
+        points = [dict(zip(names, values)) for values in itertools.product(*grids)]
+    elif design == 'random':
+        rng = np.random.default_rng(config.get('seed', 0))
+        points = [{name: _sample(name, parameters[name], rng) for name in names}
+                  for _ in range(int(config.get('samples', 10)))]
+    else:
+        raise ValueError(f"未知的扫描设计：{design}")
+    points = [dict(base, **point) for point in points]
+    for point in points:
+        InputParameter.from_dict(point)  # 尽早发现拼写错误的参数名
+    return points
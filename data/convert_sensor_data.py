@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+传感器数据格式转换
+把文本格式的sensor_data.txt一次性转换为二进制列格式（.bin），
+转换后网络用np.memmap加载，不再逐行解析
+
+用法（在项目根目录下）:
+    python -m data.convert_sensor_data data/sensor_data.txt data/sensor_data.bin
+"""
+
+import argparse
+import os
+
+from sensor import SENSOR_BIN_SUFFIX, save_sensor_binary
+from network import load_sensor_data
+
+
+def convert(src, dst=None):
+    """
+    转换单个文件
+
+    Args:
+        src: 文本数据文件
+        dst: 输出文件，默认与src同名、后缀为.bin
+
+    Returns:
+        str: 输出文件路径
+    """
+    if dst is None:
+        dst = os.path.splitext(src)[0] + SENSOR_BIN_SUFFIX
+    sensors = load_sensor_data(0.0, src)
+    save_sensor_binary(dst, sensors.ids, sensors.positions, sensors.energy_consumption_rate)
+    print(f"已转换 {len(sensors)} 个传感器: {src} -> {dst}")
+    return dst
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把文本传感器数据转换为二进制格式')
+    parser.add_argument('src', help='文本数据文件')
+    parser.add_argument('dst', nargs='?', help='输出文件，默认与输入同名、后缀为.bin')
+    args = parser.parse_args()
+    convert(args.src, args.dst)
+
+
+if __name__ == '__main__':
+    main()
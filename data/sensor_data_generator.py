@@ -4,189 +4,285 @@
 传感器数据生成器
 根据sensor数据结构生成txt数据文件
 包含传感器ID、坐标(x,y,z)、能量消耗数据
+
+数据按块批量生成（NumPy Generator），写文件时逐块写出，内存占用与传感器总数无关；
+给定seed时生成结果可复现，且与分块大小无关
 """
 
+import argparse
 import numpy as np
-import random
-import os
-from utils.utils import Point
 from utils.parameters import InputParameter
+from sensor import create_sensor_binary, SENSOR_BIN_SUFFIX
+
+# 生成的传感器数据：每个元素为(sensor_id, x, y, z, energy)
+SENSOR_DTYPE = np.dtype([('id', np.int64), ('x', np.float64), ('y', np.float64), ('z', np.float64),
+                         ('energy', np.float64)])
+
+LAYOUTS = ('uniform', 'clustered', 'grid')
+GENERATION_BLOCK = 1 << 16  # 随机数按固定大小的块派生，保证结果与写出时的分块大小无关
+HEIGHT_MAX = 50  # z坐标上限
+
 
 class SensorDataGenerator:
     """传感器数据生成器类"""
-    
-    def __init__(self, sensor_num=50, area_long=200, area_wide=100):
+
+    def __init__(self, sensor_num=50, area_long=200, area_wide=100, seed=None, layout='uniform',
+                 cluster_num=8, cluster_std=None):
         """
         初始化传感器数据生成器
-        
+
         Args:
             sensor_num: 传感器数量
             area_long: 区域长度
             area_wide: 区域宽度
+            seed: 随机种子，相同的种子生成相同的数据
+            layout: 传感器布局，uniform（均匀随机）、clustered（高斯簇）或grid（规则网格）
+            cluster_num: clustered布局的簇数量
+            cluster_std: clustered布局的簇标准差，默认为区域短边的1/20
         """
+        if layout not in LAYOUTS:
+            raise ValueError(f"未知的传感器布局：{layout}，可选 {LAYOUTS}")
         self.sensor_num = sensor_num
         self.area_long = area_long
         self.area_wide = area_wide
-        
+        self.layout = layout
+        self.cluster_num = cluster_num
+        self.cluster_std = cluster_std if cluster_std is not None else min(area_long, area_wide) / 20
+        self.seed_seq = np.random.SeedSequence(seed)
+
         # 正态分布参数设置（能量消耗范围100-1000）
         self.energy_mean = 550  # 均值
         self.energy_std = 150   # 标准差，确保大部分数据在100-1000范围内
-        
+        self.energy_min = 100
+        self.energy_max = 1000
+
+        # 簇中心在所有块之间共享
+        self.cluster_centers = None
+        if layout == 'clustered':
+            rng = self._block_rng(-1)
+            self.cluster_centers = rng.uniform((0, 0), (area_long, area_wide), size=(cluster_num, 2))
+
+    def _block_rng(self, block):
+        """第block个生成块的独立随机数发生器"""
+        return np.random.default_rng(np.random.SeedSequence(self.seed_seq.entropy, spawn_key=(block + 1,)))
+
+    def _generate_block(self, block, start, count):
+        """生成下标为[start, start+count)的传感器（属于同一生成块）"""
+        rng = self._block_rng(block)
+        data = np.empty(count, dtype=SENSOR_DTYPE)
+        data['id'] = np.arange(start + 1, start + count + 1)  # 传感器ID从1开始
+        data['x'], data['y'] = self._generate_xy(rng, start, count)
+        # z坐标：在[0, 50]范围内随机生成
+        data['z'] = rng.uniform(0, HEIGHT_MAX, count)
+        # 正态分布的能量消耗，截断到(100, 1000)
+        data['energy'] = np.clip(rng.normal(self.energy_mean, self.energy_std, count),
+                                 self.energy_min, self.energy_max)
+        # 保留2位小数
+        for field in ('x', 'y', 'z', 'energy'):
+            data[field] = np.round(data[field], 2)
+        return data
+
+    def _generate_xy(self, rng, start, count):
+        if self.layout == 'grid':
+            # 按行排布在网格单元中心，网格长宽比与区域一致
+            cols = max(1, int(np.ceil(np.sqrt(self.sensor_num * self.area_long / self.area_wide))))
+            rows = max(1, int(np.ceil(self.sensor_num / cols)))
+            index = np.arange(start, start + count)
+            return ((index % cols + 0.5) * self.area_long / cols,
+                    (index // cols + 0.5) * self.area_wide / rows)
+        if self.layout == 'clustered':
+            centers = self.cluster_centers[rng.integers(0, self.cluster_num, count)]
+            xy = centers + rng.normal(0, self.cluster_std, (count, 2))
+            return (np.clip(xy[:, 0], 0, self.area_long), np.clip(xy[:, 1], 0, self.area_wide))
+        # x、y在区域内均匀随机分布
+        return rng.uniform(0, self.area_long, count), rng.uniform(0, self.area_wide, count)
+
+    def generate_chunks(self, chunk_size=GENERATION_BLOCK):
+        """
+        逐块生成传感器数据
+
+        Yields:
+            np.ndarray: SENSOR_DTYPE结构化数组，最多chunk_size个传感器
+        """
+        pending, pending_count = [], 0
+        for start in range(0, self.sensor_num, GENERATION_BLOCK):
+            count = min(GENERATION_BLOCK, self.sensor_num - start)
+            block = self._generate_block(start // GENERATION_BLOCK, start, count)
+            offset = 0
+            while offset < count:
+                take = min(chunk_size - pending_count, count - offset)
+                pending.append(block[offset:offset + take])
+                pending_count += take
+                offset += take
+                if pending_count == chunk_size:
+                    yield np.concatenate(pending)
+                    pending, pending_count = [], 0
+        if pending:
+            yield np.concatenate(pending)
+
     def generate_sensor_coordinates(self):
         """
         生成传感器坐标
-        x, y在区域内随机分布，z在[0,50]范围内随机分布
-        
+
         Returns:
-            list: 包含所有传感器坐标的列表
-        """
-        coordinates = []
-        
-        for i in range(self.sensor_num):
-            # x坐标：在[0, area_long]范围内随机生成
-            x = round(random.uniform(0, self.area_long), 2)
-            
-            # y坐标：在[0, area_wide]范围内随机生成
-            y = round(random.uniform(0, self.area_wide), 2)
-            
-            # z坐标：在[0, 50]范围内随机生成
-            z = round(random.uniform(0, 50), 2)
-            
-            coordinates.append(Point(x, y, z))
-            
-        return coordinates
-    
+            np.ndarray: 所有传感器坐标(n, 3)
+        """
+        data = self.generate_sensor_data()
+        return np.column_stack([data['x'], data['y'], data['z']])
+
     def generate_energy_consumption(self):
         """
         生成能量消耗数据（正态分布）
         范围在(100, 1000)内
-        
+
         Returns:
-            list: 包含所有传感器能量消耗的列表
-        """
-        energy_consumptions = []
-        
-        for i in range(self.sensor_num):
-            # 生成正态分布的能量消耗数据
-            energy = np.random.normal(self.energy_mean, self.energy_std)
-            
-            # 确保数据在(100, 1000)范围内
-            energy = max(100, min(1000, energy))
-            
-            # 保留2位小数
-            energy = round(energy, 2)
-            
-            energy_consumptions.append(energy)
-            
-        return energy_consumptions
-    
+            np.ndarray: 所有传感器的能量消耗
+        """
+        return self.generate_sensor_data()['energy']
+
     def generate_sensor_data(self):
         """
         生成完整的传感器数据
-        
+
         Returns:
-            list: 包含所有传感器数据的列表，每个元素为(sensor_id, x, y, z, energy)
-        """
-        coordinates = self.generate_sensor_coordinates()
-        energy_consumptions = self.generate_energy_consumption()
-        
-        sensor_data = []
-        
-        for i in range(self.sensor_num):
-            sensor_id = i + 1  # 传感器ID从1开始
-            coord = coordinates[i]
-            energy = energy_consumptions[i]
-            
-            sensor_data.append((
-                sensor_id,
-                coord.x,
-                coord.y,
-                coord.z,
-                energy
-            ))
-            
-        return sensor_data
-    
-    def save_to_txt(self, sensor_data, filename="sensor_data.txt"):
+            np.ndarray: SENSOR_DTYPE结构化数组，每个元素为(sensor_id, x, y, z, energy)
+        """
+        chunks = list(self.generate_chunks())
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=SENSOR_DTYPE)
+
+    def _chunks(self, sensor_data, chunk_size):
+        if sensor_data is None:
+            return self.generate_chunks(chunk_size)
+        return (sensor_data[k:k + chunk_size] for k in range(0, len(sensor_data), chunk_size))
+
+    def save_to_txt(self, sensor_data=None, filename="sensor_data.txt", chunk_size=GENERATION_BLOCK):
         """
         将传感器数据保存到txt文件
-        
+
         Args:
-            sensor_data: 传感器数据列表
+            sensor_data: 传感器数据，None时边生成边写出
             filename: 输出文件名
+            chunk_size: 每次写出的传感器数
         """
+        total = 0
         with open(filename, 'w', encoding='utf-8') as f:
             # 直接写入数据（使用固定宽度格式对齐）
-            for data in sensor_data:
-                sensor_id, x, y, z, energy = data
-                f.write(f"{sensor_id:<2} {x:>9.2f} {y:>9.2f} {z:>9.2f} {energy:>9.2f}\n")
-        
+            for chunk in self._chunks(sensor_data, chunk_size):
+                np.savetxt(f, chunk, fmt='%-2d %9.2f %9.2f %9.2f %9.2f')
+                total += len(chunk)
+
         print(f"传感器数据已保存到 {filename}")
-        print(f"共生成 {len(sensor_data)} 个传感器的数据")
-    
-    def print_statistics(self, sensor_data):
+        print(f"共生成 {total} 个传感器的数据")
+
+    def save_to_bin(self, sensor_data=None, filename="sensor_data.bin", chunk_size=GENERATION_BLOCK):
+        """
+        将传感器数据保存为二进制列格式，网络可直接内存映射加载
+
+        Args:
+            sensor_data: 传感器数据，None时边生成边写出
+            filename: 输出文件名
+            chunk_size: 每次写出的传感器数
+        """
+        total = self.sensor_num if sensor_data is None else len(sensor_data)
+        columns = create_sensor_binary(filename, total)
+        start = 0
+        for chunk in self._chunks(sensor_data, chunk_size):
+            end = start + len(chunk)
+            columns['ids'][start:end] = chunk['id']
+            columns['positions'][start:end] = np.column_stack([chunk['x'], chunk['y'], chunk['z']])
+            columns['energy_consumption_rate'][start:end] = chunk['energy']
+            start = end
+        for column in columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+        print(f"传感器数据已保存到 {filename}")
+        print(f"共生成 {total} 个传感器的数据")
+
+    def print_statistics(self, sensor_data=None):
         """
         打印数据统计信息
-        
+
         Args:
-            sensor_data: 传感器数据列表
+            sensor_data: 传感器数据，None时按块生成并流式统计
         """
-        energies = [data[4] for data in sensor_data]
-        x_coords = [data[1] for data in sensor_data]
-        y_coords = [data[2] for data in sensor_data]
-        z_coords = [data[3] for data in sensor_data]
-        
+        count = 0
+        low = {field: np.inf for field in ('x', 'y', 'z', 'energy')}
+        high = {field: -np.inf for field in low}
+        energy_sum = energy_sq = 0.0
+        for chunk in self._chunks(sensor_data, GENERATION_BLOCK):
+            count += len(chunk)
+            for field in low:
+                low[field] = min(low[field], chunk[field].min())
+                high[field] = max(high[field], chunk[field].max())
+            energy_sum += chunk['energy'].sum()
+            energy_sq += np.square(chunk['energy']).sum()
+        if count == 0:
+            print("\n没有传感器数据")
+            return
+        mean = energy_sum / count
+
         print("\n=== 数据统计信息 ===")
-        print(f"传感器总数: {len(sensor_data)}")
-        print(f"X坐标范围: [{min(x_coords):.2f}, {max(x_coords):.2f}]")
-        print(f"Y坐标范围: [{min(y_coords):.2f}, {max(y_coords):.2f}]")
-        print(f"Z坐标范围: [{min(z_coords):.2f}, {max(z_coords):.2f}]")
-        print(f"能量消耗范围: [{min(energies):.2f}, {max(energies):.2f}]")
-        print(f"能量消耗均值: {np.mean(energies):.2f}")
-        print(f"能量消耗标准差: {np.std(energies):.2f}")
+        print(f"传感器总数: {count}")
+        print(f"X坐标范围: [{low['x']:.2f}, {high['x']:.2f}]")
+        print(f"Y坐标范围: [{low['y']:.2f}, {high['y']:.2f}]")
+        print(f"Z坐标范围: [{low['z']:.2f}, {high['z']:.2f}]")
+        print(f"能量消耗范围: [{low['energy']:.2f}, {high['energy']:.2f}]")
+        print(f"能量消耗均值: {mean:.2f}")
+        print(f"能量消耗标准差: {np.sqrt(max(energy_sq / count - mean ** 2, 0.0)):.2f}")
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='传感器数据生成器')
+    parser.add_argument('--num', type=int, default=None, help='传感器数量，默认取parameters.py中的sensor_num')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    parser.add_argument('--layout', choices=LAYOUTS, default='uniform', help='传感器布局')
+    parser.add_argument('--clusters', type=int, default=8, help='clustered布局的簇数量')
+    parser.add_argument('--output', default='sensor_data.txt', help='输出文件，后缀为.bin时写二进制格式')
+    args = parser.parse_args()
+
     try:
         print("开始执行传感器数据生成器...")
-        
+
         # 从parameters.py获取参数
         print("正在加载参数...")
         params = InputParameter()
-        print(f"传感器数量: {params.sensor_num}")
+        sensor_num = args.num if args.num is not None else params.sensor_num
+        print(f"传感器数量: {sensor_num}")
         print(f"区域大小: {params.AREA_LONG} x {params.AREA_WIDE}")
-        
+
         # 创建传感器数据生成器
         print("正在创建数据生成器...")
         generator = SensorDataGenerator(
-            sensor_num=params.sensor_num,
+            sensor_num=sensor_num,
             area_long=params.AREA_LONG,
-            area_wide=params.AREA_WIDE
+            area_wide=params.AREA_WIDE,
+            seed=args.seed,
+            layout=args.layout,
+            cluster_num=args.clusters
         )
-        
-        # 生成传感器数据
-        print("正在生成传感器数据...")
-        sensor_data = generator.generate_sensor_data()
-        
-        # 保存到txt文件
-        print("正在保存数据到文件...")
-        generator.save_to_txt(sensor_data, "sensor_data.txt")
-        
+
+        # 边生成边保存到文件
+        print("正在生成传感器数据并保存到文件...")
+        if args.output.endswith(SENSOR_BIN_SUFFIX):
+            generator.save_to_bin(filename=args.output)
+        else:
+            generator.save_to_txt(filename=args.output)
+
         # 打印统计信息
-        generator.print_statistics(sensor_data)
-        
+        generator.print_statistics()
+
         # 显示前5条数据作为示例
         print("\n=== 前5条数据示例 ===")
-        for i in range(min(5, len(sensor_data))):
-            data = sensor_data[i]
+        head = next(generator.generate_chunks(5), [])
+        for data in head:
             print(f"{data[0]:<8} {data[1]:>9.2f} {data[2]:>9.2f} {data[3]:>9.2f} {data[4]:>9.2f}")
-            
+
         print("程序执行完成！")
-        
+
     except Exception as e:
         print(f"程序执行出错: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
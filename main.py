@@ -1,10 +1,28 @@
+import argparse
+
 from utils import *
 from network import WRSNNetwork
 
 def main():
     """主函数，运行无人机传感器网络系统"""
+    parser = argparse.ArgumentParser(description='无人机传感器网络系统')
+    parser.add_argument('-q', '--quiet', action='store_true', help='关闭运行过程日志')
+    parser.add_argument('-v', '--verbose', action='store_true', help='输出逐传感器的调试日志')
+    parser.add_argument('--events', help='把结构化事件记录导出到该文件（JSON Lines）')
+    parser.add_argument('--profile', choices=['cprofile', 'sample'], help='剖析run_system并输出报告')
+    parser.add_argument('--stats', action='store_true', help='输出各阶段的调用次数与耗时')
+    args = parser.parse_args()
+    if args.quiet:
+        set_level(QUIET)
+    elif args.verbose:
+        set_level(DEBUG)
+    if args.events:
+        recorder.enable()
+
     # 创建系统参数
     params = InputParameter()
+    if args.stats:
+        params.PHASE_STATS = True
 
     # 创建网络系统
     network = WRSNNetwork(params)
@@ -27,7 +45,10 @@ def main():
                 print(f"  传感器{sensor_id}悬停时间: {hover_time:.2f}秒")
 
     # 运行系统
-    runtime = network.run_system()
+    if args.profile:
+        runtime, report = profile_call(network.run_system, mode=args.profile)
+    else:
+        runtime = network.run_system()
 
     # 输出系统状态
     status = network.get_system_status()
@@ -36,9 +57,20 @@ def main():
     print(f"系统运行时长: {runtime:.2f}秒")
     print(f"活跃传感器数量: {status['active_sensors']}/{status['total_sensors']}")
     print(f"活跃无人机数量: {status['active_uavs']}/{status['total_uavs']}")
-    # print(f"收集的数据总量: {status['collected_data_count']}")
+    print(f"收集的数据总量: {status['collected_data_count']}（丢失{status['lost_data_count']}）")
     print(f"终止原因: {status['termination_reason']}")
 
+    if args.stats:
+        print("\n=== 各阶段耗时 ===")
+        print(network.stats.report())
+    if args.profile:
+        print("\n=== 剖析结果 ===")
+        print(report)
+
+    if args.events:
+        events = recorder.dump(args.events)
+        print(f"已导出{len(events)}条事件到 {args.events}")
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
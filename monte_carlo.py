@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+蒙特卡洛实验
+在进程池中并行运行大量独立随机种子的WRSNNetwork，按完成顺序流式返回结果，
+并统计系统寿命、周期数和无人机能耗的均值与置信区间。
+传感器数据只在主进程加载一次，通过进程池初始化函数共享给各worker。
+"""
+
+import argparse
+import copy
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator
+import numpy as np
+
+from utils import InputParameter, quiet
+from network import WRSNNetwork, load_sensor_data
+
+RunResult = namedtuple('RunResult', ['run', 'seed', 'lifetime', 'cycle_num', 'termination_reason',
+                                     'energy_used', 'min_remaining_energy'])
+
+METRICS = ('lifetime', 'cycle_num', 'energy_used', 'min_remaining_energy')
+
+Z_95 = 1.959963984540054  # 正态分布97.5%分位数
+
+# 每个worker进程中共享的实验数据
+_WORKER_STATE = {}
+
+
+def run_seeds(runs: int, seed: int = 0):
+    """为每次运行派生独立的随机种子（与worker数量和调度顺序无关）"""
+    children = np.random.SeedSequence(seed).spawn(runs)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _init_worker(params, sensors, planner):
+    _WORKER_STATE.update(params=params, sensors=sensors, planner=planner)
+
+
+def is_planner_factory(planner) -> bool:
+    """planner是规划器类或无参工厂函数，而不是规划器对象"""
+    return isinstance(planner, type) or (callable(planner) and not hasattr(planner, 'plan_uav_path'))
+
+
+def fresh_planner(planner):
+    """
+    一次运行使用的规划器：规划器的深拷贝，或者调用规划器类/无参工厂函数得到的新规划器，
+    规划器内部的缓存（如模因算法的路径）不会带到下一次运行；None为默认规划器
+    """
+    if planner is None:
+        return None
+    if is_planner_factory(planner):
+        return planner()
+    return copy.deepcopy(planner)
+
+
+def _run_one(run, seed, state=None):
+    state = state or _WORKER_STATE
+    # 单次运行的逐周期输出在实验中没有意义，关闭日志只保留计算
+    with quiet():
+        network = WRSNNetwork(state['params'], planner=fresh_planner(state['planner']), sensors=state['sensors'],
+                              seed=seed)
+        network.mission_workers = 1  # 各次运行已在不同进程中并行
+        network._assign_sensors_to_uavs()
+        lifetime = network.run_system()
+    remaining = [uav.curr_E for uav in network.uavs]
+    # 消耗的能量包括在基站和充电桩补充的部分
+    energy_used = sum(uav.max_E - uav.curr_E + uav.E_recharged for uav in network.uavs)
+    return RunResult(run, seed, lifetime, network.cycle_num, network.termination_reason,
+                     energy_used, min(remaining) if remaining else 0.0)
+
+
+def _run_batch(tasks):
+    return [_run_one(run, seed) for run, seed in tasks]
+
+
+def iter_monte_carlo(runs: int, params: InputParameter = None, seed: int = 0, workers: int = None,
+                     batch_size: int = 8, planner=None, sensors=None) -> Iterator[RunResult]:
+    """
+    并行运行runs次仿真，按完成顺序逐个产出结果
+
+    Args:
+        runs: 运行次数
+        params: 系统参数
+        seed: 主随机种子，相同的seed得到相同的一组结果
+        workers: 进程数，None为CPU核数，0或1在当前进程中串行运行
+        batch_size: 每次提交给worker的运行数
+        planner: 路径规划器（每次运行使用其深拷贝）、规划器类或无参工厂函数，None使用默认规划器
+        sensors: 预先加载的SensorArray，None时从数据文件加载一次
+    """
+    params = params if params is not None else InputParameter()
+    if sensors is None:
+        with quiet():
+            sensors = load_sensor_data(params.SENSOR_POWER)
+    tasks = list(enumerate(run_seeds(runs, seed)))
+
+    if workers is not None and workers <= 1:
+        state = dict(params=params, sensors=sensors, planner=planner)
+        for run, run_seed in tasks:
+            yield _run_one(run, run_seed, state)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(params, sensors, planner)) as executor:
+        futures = [executor.submit(_run_batch, tasks[k:k + batch_size])
+                   for k in range(0, len(tasks), batch_size)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class RunningStats:
+    """Welford在线统计，结果流式到达时无需保存全部样本"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def summary(self, z=Z_95) -> Dict[str, float]:
+        """均值、标准差、极值及均值的正态近似置信区间"""
+        half = z * self.std / math.sqrt(self.n) if self.n else math.nan
+        return {'n': self.n, 'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max,
+                'ci_low': self.mean - half, 'ci_high': self.mean + half}
+
+
+def summarize(results: Iterable[RunResult]) -> Dict:
+    """汇总各指标的统计量和终止原因分布"""
+    stats = {metric: RunningStats() for metric in METRICS}
+    reasons = {}
+    for result in results:
+        for metric in METRICS:
+            stats[metric].add(getattr(result, metric))
+        reasons[result.termination_reason] = reasons.get(result.termination_reason, 0) + 1
+    summary = {metric: stat.summary() for metric, stat in stats.items()}
+    summary['termination_reasons'] = reasons
+    return summary
+
+
+def run_monte_carlo(runs: int, params: InputParameter = None, seed: int = 0, workers: int = None,
+                    batch_size: int = 8, planner=None, sensors=None, callback=None) -> Dict:
+    """
+    运行蒙特卡洛实验并返回汇总统计
+
+    Args:
+        callback: 每得到一个结果时调用callback(result)，可用于显示进度
+    """
+    def stream():
+        for result in iter_monte_carlo(runs, params, seed, workers, batch_size, planner, sensors):
+            if callback is not None:
+                callback(result)
+            yield result
+    return summarize(stream())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WRSNNetwork蒙特卡洛实验')
+    parser.add_argument('--runs', type=int, default=100, help='运行次数')
+    parser.add_argument('--seed', type=int, default=0, help='主随机种子')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认CPU核数')
+    parser.add_argument('--batch-size', type=int, default=8, help='每次提交给worker的运行数')
+    args = parser.parse_args()
+
+    done = [0]
+
+    def progress(result):
+        done[0] += 1
+        if done[0] % max(1, args.runs // 10) == 0 or done[0] == args.runs:
+            print(f"已完成 {done[0]}/{args.runs}")
+
+    summary = run_monte_carlo(args.runs, seed=args.seed, workers=args.workers,
+                              batch_size=args.batch_size, callback=progress)
+
+    print("\n=== 蒙特卡洛实验结果（95%置信区间）===")
+    for metric in METRICS:
+        s = summary[metric]
+        print(f"{metric}: 均值 {s['mean']:.2f} [{s['ci_low']:.2f}, {s['ci_high']:.2f}]，"
+              f"标准差 {s['std']:.2f}，范围 [{s['min']:.2f}, {s['max']:.2f}]")
+    print(f"终止原因: {summary['termination_reasons']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,103 @@
 from __future__ import annotations
 
-from queue import PriorityQueue
 
 import numpy as np
 import enum
+import json
 import math
+import os
 import random
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Dict
 
 # from utils import WrsnParameters
 # from utils import NetworkInput, Point, logger
 from utils import *
 from uav import UAV
-from sensor import Sensor, NodeType
-from Algorithms.test import plan_uav_path
+from sensor import (Sensor, NodeType, SensorArray, SensorRegistry, SensorDataBuffer, SENSOR_BIN_SUFFIX,
+                    load_sensor_binary)
+from pad import PadIndex, load_pad_data
+from scheduler import ChargingScheduler
+from Algorithms.test import path_planner, get_waypoints
+from Algorithms.clustering import sweep_partition, balanced_kmeans
+from Algorithms.route_cache import RouteCache
+
+SENSOR_DATA_PATH = './data/sensor_data.txt'
+
+# 一次任务的分段执行计划
+#   trips: 各段的(起始位置, 结束位置, 能耗, 结束时所在充电桩)，路径path[start:end]为一段，段间在充电桩补充电能
+#   final_energy: 返回基站时的剩余电量
+#   recharge_energy: 在充电桩补充的总电量
+#   hover_time: 在传感器处悬停充电的总时间
+#   feasible: 是否能访问完整条路径
+#   flight_time: 各段飞行（含最后返回基站）的总时间
+MissionPlan = namedtuple('MissionPlan', ['path', 'trips', 'final_energy', 'recharge_energy', 'hover_time',
+                                         'feasible', 'flight_time'])
+
+# 快照中保存的传感器列和无人机状态字段
+SENSOR_COLUMNS = ('ids', 'positions', 'battery_cap', 'cur_energy', 'energy_consumption_rate', 'is_active')
+UAV_FIELDS = ('curr_E', 'max_E', 'vel', 'P_mov', 'P_hov', 'node_stop', 'pad_stop', 'busy_until', 'E_recharged')
+
+
+def _unprefix(arrays: dict, prefix: str) -> dict:
+    return {key[len(prefix):]: value for key, value in arrays.items() if key.startswith(prefix)}
+
+
+def load_sensor_data(battery_cap: float, path: str = SENSOR_DATA_PATH) -> SensorArray:
+    """
+    从文本文件或二进制文件（.bin）加载传感器数据
+
+    Args:
+        battery_cap: 传感器电池容量(J)
+        path: 数据文件路径，文本文件每行为 id x y z 能耗速率
+    """
+    if path.endswith(SENSOR_BIN_SUFFIX):
+        try:
+            columns = load_sensor_binary(path)
+        except FileNotFoundError:
+            logger.error("错误：找不到%s文件，请先运行sensor_data_generator.py生成数据", path)
+            return SensorArray()
+        # ID、坐标和能耗速率直接使用只读内存映射，不逐行解析也不复制
+        sensors = SensorArray.wrap(columns['ids'], columns['positions'], battery_cap,
+                                   columns['energy_consumption_rate'])
+        logger.info("成功加载%d个传感器", len(sensors))
+        return sensors
+
+    ids, positions, consumptions = [], [], []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                
+                parts = line.split()
+                if len(parts) != 5:
+                    logger.warning("警告：第%d行数据格式不正确，跳过", line_num)
+                    continue
+                
+                try:
+                    sensor_id = int(parts[0])
+                    x = float(parts[1])
+                    y = float(parts[2])
+                    z = float(parts[3])
+                    energy_consumption = float(parts[4])
+                    ids.append(sensor_id)
+                    positions.append((x, y, z))
+                    consumptions.append(energy_consumption)
+                    
+                except ValueError as e:
+                    logger.warning("警告：第%d行数据解析错误：%s，跳过", line_num, e)
+                    continue
+                    
+    except FileNotFoundError:
+        logger.error("错误：找不到%s文件，请先运行sensor_data_generator.py生成数据", path)
+        return SensorArray()
+    
+    sensors = SensorArray.from_columns(ids, positions, battery_cap, consumptions)
+    logger.info("成功加载%d个传感器", len(sensors))
+    return sensors
 
 
 
@@ -22,25 +106,40 @@ class WRSNNetwork():
     实现无人机从基站出发，收集传感器数据并充电的系统
     """
 
-    def __init__(self, params: InputParameter = None):
+    def __init__(self, params: InputParameter = None, planner=None, sensors: SensorArray = None, seed=None,
+                 data_path: str = None):
         """
         初始化无人机传感器网络系统
         
         Args:
             params: 系统参数，包含无人机数量、电量、基站坐标等信息
+            planner: 路径规划器，需提供plan_uav_path方法，默认使用test.py中的PathPlanner
+            sensors: 预先加载的传感器数据，提供时复制一份使用而不再读取文件
+            seed: 随机种子，None时使用全局random
+            data_path: 传感器数据文件路径，默认./data/sensor_data.txt
         """
         if params is None:
             params = InputParameter()
         
         self.params = params
+        self.planner = planner if planner is not None else path_planner
+        self.rng = random.Random(seed) if seed is not None else random
+        self.data_path = data_path if data_path is not None else SENSOR_DATA_PATH
         self.num_sensors = params.sensor_num
         self.num_uavs = params.uav_num
         
-        # 初始化基站
+        # 初始化基站和充电桩，基站为0号充电桩
         self.base_station = params.base_station
+        self.pads = self._load_pads()
+        self._base_pad = None
+        if hasattr(self.planner, 'bind_pads'):
+            self.planner.bind_pads(self._route_pads())
         
-        # 初始化传感器（从sensor_data.txt文件加载）
-        self.sensors = self._load_sensors()
+        # 初始化传感器（从sensor_data.txt文件加载），Sensor对象是列存储中各行的视图
+        self.sensor_array = sensors.copy() if sensors is not None else self._load_sensors()
+        self.sensors = self.sensor_array.views()
+        self.registry = SensorRegistry(self.sensor_array)
+        self.route_cache = RouteCache() if params.ROUTE_CACHE else None
         
         # 初始化无人机
         self.uavs = self._initialize_uavs()
@@ -50,60 +149,61 @@ class WRSNNetwork():
         self.data_collection_cycle = 60.0  # 数据收集周期（秒）
         self.cycle_start_time = 0.0
         self.cycle_num = 0
-        self.collected_data = {}  # 存储收集到的数据
         self.system_terminated = False
         self.termination_reason = ""
+        self.time_step = 1.0  # 系统时钟分辨率（秒）
+        self.last_drain_time = 0.0  # 传感器能量上次结算的时刻
+        self._depletion_event = None  # 当前有效的传感器耗尽预测事件
+        self._started = False  # 事件队列已初始化，再次调用run_system时从暂停处继续
+        self._finished = False
+
+        # 周期内各无人机的规划与能耗评估在线程池中并发执行，结果按无人机顺序使用
+        workers = params.MISSION_WORKERS
+        self.mission_workers = min(self.num_uavs, os.cpu_count() or 1) if workers is None else workers
+        self._mission_plans = {}  # 无人机下标 -> (路径, 所需能量)
+
+        # 规划、能耗估计、悬停时间、索引查询和数据收集各阶段的计时与计数
+        self.stats = PhaseStats(params.PHASE_STATS)
+
+        # 离散事件队列及各类事件的处理函数
+        self.event_queue = EventQueue()
+        self._event_handlers = {
+            EventType.CYCLE_START: self._on_cycle_start,
+            EventType.MISSION_START: self._on_mission_start,
+            EventType.MISSION_END: self._on_mission_end,
+            EventType.SENSOR_DEPLETION: self._on_sensor_depletion,
+        }
+        self.scheduler = None  # 按需模式下的充电请求调度器，run_system时创建
         
-        # 传感器数据生成参数
+        # 传感器数据生成参数：活跃传感器在interval的整数倍时刻各生成一个数据包，存入定长环形缓冲区
         self.data_generation_interval = 10.0  # 传感器每10秒生成一次数据
-        self.last_data_generation = {}  # 记录每个传感器上次生成数据的时间
-        
-        # 初始化传感器数据生成时间
-        for sensor in self.sensors:
-            self.last_data_generation[sensor.id] = 0.0
-            self.collected_data[sensor.id] = []
+        self.last_data_generation = 0.0  # 上次生成数据的时刻
+        self.data_buffer = SensorDataBuffer(len(self.sensor_array), params.DATA_BUFFER_SIZE)
         
         # 无人机传感器分配
         self.uav_sensor_assignments = {}  # 存储每架无人机负责的传感器ID列表
         self.sensor_uav_mapping = {}  # 存储每个传感器对应的无人机ID
 
-    def _load_sensors(self) -> List[Sensor]:
-        """从sensor_data.txt文件加载传感器数据"""
-        sensors = []
-        try:
-            with open('./data/sensor_data.txt', 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    parts = line.split()
-                    if len(parts) != 5:
-                        print(f"警告：第{line_num}行数据格式不正确，跳过")
-                        continue
-                    
-                    try:
-                        sensor_id = int(parts[0])
-                        x = float(parts[1])
-                        y = float(parts[2])
-                        z = float(parts[3])
-                        energy_consumption = float(parts[4])
-                        position = Point(x, y, z)
-                        sensor = Sensor(position, self.params.SENSOR_POWER, sensor_id)
-                        sensor.energy_consumption_rate = energy_consumption
-                        sensors.append(sensor)
-                        
-                    except ValueError as e:
-                        print(f"警告：第{line_num}行数据解析错误：{e}，跳过")
-                        continue
-                        
-        except FileNotFoundError:
-            print("错误：找不到./data/sensor_data.txt文件，请先运行sensor_data_generator.py生成数据")
-            return []
-        
-        print(f"成功加载{len(sensors)}个传感器")
-        return sensors
+    def _load_sensors(self) -> SensorArray:
+        """从传感器数据文件（默认sensor_data.txt）加载传感器数据"""
+        return load_sensor_data(self.params.SENSOR_POWER, self.data_path)
     
+    def _load_pads(self) -> PadIndex:
+        """基站和params.PAD_DATA_PATH中的充电桩"""
+        positions = np.asarray(self.base_station, dtype=np.float64).reshape(1, 3)
+        if self.params.PAD_DATA_PATH is not None:
+            positions = np.vstack([positions, load_pad_data(self.params.PAD_DATA_PATH)])
+            logger.info("成功加载%d个充电桩", len(positions) - 1)
+        return PadIndex(positions)
+
+    def _route_pads(self) -> PadIndex:
+        """任务路径可以停靠的充电桩：分段任务为全部充电桩，单段任务只有基站（访问完直接返回基站）"""
+        if self.params.MULTI_TRIP or len(self.pads) == 1:
+            return self.pads
+        if self._base_pad is None:
+            self._base_pad = PadIndex(self.pads.positions[:1])
+        return self._base_pad
+
     def _initialize_uavs(self) -> List[UAV]:
         """初始化无人机"""
         uavs = []
@@ -114,62 +214,129 @@ class WRSNNetwork():
                 pos=self.base_station
             )
             uav.id = i
+            if self.params.WPT_GAIN_DB is not None:
+                uav.wpt_gain = float(dB2dec(self.params.WPT_GAIN_DB))
             uav.computePower()  # 计算功率
+            if self.params.OPTIMIZE_UAV_SPEED:
+                uav.use_optimal_speed()
             uavs.append(uav)
         
-        print(f"成功初始化{len(uavs)}架无人机")
+        logger.info("成功初始化%d架无人机", len(uavs))
         return uavs
     
-    def _assign_sensors_to_uavs(self):
-        """随机分配传感器给无人机，将传感器分组"""
+    def _assign_sensors_to_uavs(self, method: str = None):
+        """
+        分配传感器给无人机，将传感器分组
+        
+        Args:
+            method: 分配方法，默认取params.SENSOR_ASSIGNMENT
+                random: 随机打乱后等分
+                sweep: 以基站为中心按极角等分为扇形区域
+                kmeans: 容量均衡的k-means紧凑区域
+        """
         if not self.sensors:
-            print("警告：没有传感器可分配")
+            logger.warning("警告：没有传感器可分配")
             return
+        method = method if method is not None else self.params.SENSOR_ASSIGNMENT
+        
+        if method == 'random':
+            groups = self._random_groups()
+        elif method in ('sweep', 'kmeans'):
+            positions = self.sensor_array.positions
+            if method == 'sweep':
+                labels = sweep_partition(positions, self.base_station, self.num_uavs)
+            else:
+                labels = balanced_kmeans(positions, self.num_uavs, center=self.base_station)
+            order = np.argsort(labels, kind='stable')
+            bounds = np.cumsum(np.bincount(labels, minlength=self.num_uavs))[:-1]
+            groups = [ids.tolist() for ids in np.split(self.sensor_array.ids[order], bounds)]
+        else:
+            raise ValueError(f"未知的传感器分配方法：{method}")
         
-        # 获取所有传感器ID
-        sensor_ids = [sensor.id for sensor in self.sensors]
+        # 为每架无人机分配传感器
+        for uav_id, assigned_sensors in enumerate(groups):
+            self.uav_sensor_assignments[uav_id] = assigned_sensors
+            self.registry.assign(uav_id, assigned_sensors)
+            
+            # 建立传感器到无人机的映射
+            for sensor_id in assigned_sensors:
+                self.sensor_uav_mapping[sensor_id] = uav_id
         
-        # 随机打乱传感器ID列表
-        random.shuffle(sensor_ids)
+        # 输出分配结果
+        logger.info("\n=== 传感器分配结果 ===")
+        if logger.isEnabledFor(DEBUG):
+            for uav_id in range(self.num_uavs):
+                logger.debug("无人机%d负责传感器: %s", uav_id, self.uav_sensor_assignments[uav_id])
+        
+        logger.info("\n传感器总数: %d", len(self.sensors))
+        logger.info("无人机总数: %d", self.num_uavs)
+        logger.info("平均每架无人机负责: %.1f个传感器", len(self.sensors) / self.num_uavs)
+
+    def _random_groups(self) -> List[List[int]]:
+        """随机打乱传感器ID后等分，前几架无人机多分配一个传感器"""
+        # 获取所有传感器ID并随机打乱
+        sensor_ids = self.sensor_array.ids.tolist()
+        self.rng.shuffle(sensor_ids)
         
         # 计算每架无人机应该负责的传感器数量
         sensors_per_uav = len(sensor_ids) // self.num_uavs
         remaining_sensors = len(sensor_ids) % self.num_uavs
         
-        # 为每架无人机分配传感器
+        groups = []
         start_idx = 0
         for uav_id in range(self.num_uavs):
             # 计算当前无人机负责的传感器数量
             current_sensor_count = sensors_per_uav
             if uav_id < remaining_sensors:  # 前几架无人机多分配一个传感器
                 current_sensor_count += 1
-            
-            # 分配传感器ID
             end_idx = start_idx + current_sensor_count
-            assigned_sensors = sensor_ids[start_idx:end_idx]
-            
-            self.uav_sensor_assignments[uav_id] = assigned_sensors
-            
-            # 建立传感器到无人机的映射
-            for sensor_id in assigned_sensors:
-                self.sensor_uav_mapping[sensor_id] = uav_id
-            
+            groups.append(sensor_ids[start_idx:end_idx])
             start_idx = end_idx
-        
-        # 输出分配结果
-        print("\n=== 传感器分配结果 ===")
-        for uav_id in range(self.num_uavs):
-            assigned_sensors = self.uav_sensor_assignments[uav_id]
-            print(f"无人机{uav_id}负责传感器: {assigned_sensors}")
-        
-        print(f"\n传感器总数: {len(sensor_ids)}")
-        print(f"无人机总数: {self.num_uavs}")
-        print(f"平均每架无人机负责: {len(sensor_ids) / self.num_uavs:.1f}个传感器")
+        return groups
 
 
-    def _plan_uav_path(self, uav: UAV) -> List[Point]:
-        """为无人机规划路径，调用test.py中的路径规划算法"""
-        return plan_uav_path(uav, self.sensors, self.uav_sensor_assignments)
+    def _plan_uav_path(self, uav: UAV) -> List[Sensor]:
+        """为无人机规划路径，调用规划器的plan_uav_path，返回按访问顺序排列的传感器"""
+        with self.stats.timer('planning', uav.id) as timer:
+            path = self._plan_assigned_path(uav)
+            if timer is not None:
+                timer.items = len(path)
+        return path
+
+    def _plan_assigned_path(self, uav: UAV) -> List[Sensor]:
+        if getattr(self.planner, 'plans_fleet', False):
+            # 机队级规划器（如模因算法）同时决定分配，规划后同步索引
+            path = self.planner.plan_uav_path(uav, self.sensors, self.uav_sensor_assignments,
+                                              node_cost=self._calculate_service_energies)
+            self._sync_assignments()
+            return path
+        if self.route_cache is None:
+            with self.stats.timer('lookup', uav.id) as timer:
+                assigned_sensors = self.registry.assigned_sensors(uav.id)
+                if timer is not None:
+                    timer.items = len(assigned_sensors)
+            return self.planner.plan_uav_path(uav, assigned_sensors, self.uav_sensor_assignments)
+
+        # 按活跃传感器集合缓存路径，集合变化时增量修复而不是重新规划
+        with self.stats.timer('lookup', uav.id) as timer:
+            indices = self.registry.assigned_indices(uav.id, self.sensor_array.is_active)
+            if timer is not None:
+                timer.items = len(indices)
+
+        def plan():
+            sensors = [self.sensors[idx] for idx in indices]
+            return [s.index for s in self.planner.plan_uav_path(uav, sensors, self.uav_sensor_assignments)]
+
+        order = self.route_cache.get_route(uav.id, uav.pos, indices, self.sensor_array.positions, plan)
+        return [self.sensors[idx] for idx in order]
+
+    def _sync_assignments(self):
+        """根据uav_sensor_assignments重建传感器到无人机的映射和索引"""
+        self.sensor_uav_mapping = {}
+        for uav_id, sensor_ids in self.uav_sensor_assignments.items():
+            self.registry.assign(uav_id, sensor_ids)
+            for sensor_id in sensor_ids:
+                self.sensor_uav_mapping[sensor_id] = uav_id
     
     def _calculate_flight_energy(self, uav: UAV, start_pos: Point, end_pos: Point) -> float:
         """计算无人机飞行能耗"""
@@ -194,6 +361,12 @@ class WRSNNetwork():
         charging_time = energy_needed / (uav.P_tra * 0.9)  # 假设90%效率
         return uav.P_tra * charging_time
     
+    def _calculate_service_energies(self, uav: UAV, sensors: List[Sensor]) -> np.ndarray:
+        """计算为每个传感器充电的能耗与悬停能耗之和(J)，供机队级规划器在split时估计任务可行性"""
+        indices = np.array([sensor.index for sensor in sensors], dtype=np.int64)
+        return (self._calculate_charging_energies(uav, indices)
+                + self._calculate_hover_energy(uav, self._calculate_hover_times(uav, indices, 1.0)))
+
     def _calculate_hover_time(self, uav: UAV, sensor: Sensor, distance: float = 1.0) -> float:
         """
         计算无人机悬停时间
@@ -213,10 +386,11 @@ class WRSNNetwork():
         
         # 使用UAV的computeDataTransTime方法计算传输时间
         try:
-            hover_time = uav.computeDataTransTime(distance=distance, E_need=energy_needed)
+            with self.stats.timer('hover', uav.id, 1):
+                hover_time = uav.computeDataTransTime(distance=distance, E_need=energy_needed)
             return hover_time
         except Exception as e:
-            print(f"计算悬停时间时出错: {e}")
+            logger.warning("计算悬停时间时出错: %s", e)
             # 备用计算方法
             charging_time = energy_needed / (uav.P_tra * 0.9)  # 假设90%效率
             return charging_time
@@ -232,145 +406,533 @@ class WRSNNetwork():
         Returns:
             float: 总悬停时间(秒)
         """
-        total_hover_time = 0.0
+        # 只统计活跃传感器，无人机悬停在传感器上方1米处
+        indices = np.array([sensor.index for sensor in sensors if sensor.is_active], dtype=np.int64)
+        return self._total_hover_time(uav, indices)
+
+    def _total_hover_time(self, uav: UAV, indices: np.ndarray) -> float:
+        """一组传感器（按下标）的总悬停时间，一次数组运算"""
+        hover_times = self._calculate_hover_times(uav, indices, distance=1.0)
+
+        if logger.isEnabledFor(DEBUG):
+            for idx, hover_time in zip(indices, hover_times):
+                logger.debug("传感器%d悬停时间: %.2f秒", self.sensor_array.ids[idx], hover_time)
         
-        for sensor in sensors:
-            if not sensor.is_active:
-                continue
-                
-            # 计算到传感器的距离（假设无人机在传感器上方1米）
-            distance = 1.0  # 无人机悬停在传感器上方1米处
-            
-            # 计算悬停时间
-            hover_time = self._calculate_hover_time(uav, sensor, distance)
-            total_hover_time += hover_time
-            
-            print(f"传感器{sensor.id}悬停时间: {hover_time:.2f}秒")
+        return float(hover_times.sum())
+
+    def _calculate_hover_times(self, uav: UAV, indices: np.ndarray, distance: float = 1.0) -> np.ndarray:
+        """
+        批量计算一组传感器的悬停时间，结果与逐个调用_calculate_hover_time相同
         
-        return total_hover_time
-    
-    def _simulate_uav_mission(self, uav: UAV) -> bool:
-        """模拟无人机执行任务"""
-        # 规划路径
+        Args:
+            uav: 无人机对象
+            indices: 传感器在sensor_array中的下标
+            distance: 无人机与传感器的距离(m)，可为标量或与indices等长的数组
+            
+        Returns:
+            np.ndarray: 各传感器的悬停时间(秒)
+        """
+        store = self.sensor_array
+        with self.stats.timer('hover', uav.id, len(indices)):
+            energy_needed = store.battery_cap[indices] - store.cur_energy[indices]
+            return computeChargingTime(energy_needed, distance, uav.P_tra, uav.E_η, uav.wpt_gain)
+
+    def _calculate_charging_energies(self, uav: UAV, indices: np.ndarray) -> np.ndarray:
+        """批量计算一组传感器的充电能耗，与_calculate_charging_energy相同"""
+        store = self.sensor_array
+        energy_needed = np.maximum(store.battery_cap[indices] - store.cur_energy[indices], 0.0)
+        return uav.P_tra * (energy_needed / (uav.P_tra * 0.9))  # 假设90%效率
+
+    def _split_trips(self, uav: UAV, path: List[Sensor]) -> MissionPlan:
+        """
+        把路径切分为若干段行程，段间在最近的充电桩（含基站）充满电
+
+        从位置s出发访问path[i..j]并飞到path[j]最近的充电桩的能耗 = a(s, i) + G[j]（飞行+充电+悬停），
+        由三角不等式G沿j单调不减，所以每段在当前电量下最长的安全前缀由一次searchsorted得到；
+        电量不足以访问下一个传感器时在该充电桩充满电再出发，最后从所在充电桩返回基站。
+        params.MULTI_TRIP为False时整条路径必须一次完成，访问完最后一个传感器后直接返回基站
+        """
+        with self.stats.timer('energy', uav.id, len(path)):
+            return self._plan_trips(uav, path)
+
+    def _plan_trips(self, uav: UAV, path: List[Sensor]) -> MissionPlan:
+        indices = np.array([sensor.index for sensor in path], dtype=np.int64)
+        hover_times = self._calculate_hover_times(uav, indices, 1.0)
+        node_cost = self._calculate_charging_energies(uav, indices) + self._calculate_hover_energy(uav, hover_times)
+        move_cost = uav.P_mov / uav.vel
+        points = get_waypoints(path)
+        pads = self._route_pads()
+        pad_of, pad_dist = pads.nearest(points)
+        prefix = np.zeros(len(path))
+        np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1), out=prefix[1:])
+        work = np.cumsum(node_cost)
+        G = move_cost * (prefix + pad_dist) + work
+        # 消除浮点误差造成的非单调，保证searchsorted定位有效
+        np.maximum.accumulate(G, out=G)
+
+        n = len(path)
+        energy = uav.curr_E
+        recharge_energy = 0.0
+        flight_distance = 0.0
+        trips = []
+        start = 0
+        position = np.asarray(self.base_station, dtype=np.float64)
+        while True:
+            if start < n:
+                a = move_cost * (np.linalg.norm(points[start] - position) - prefix[start]) - (work[start] - node_cost[start])
+                end = int(np.searchsorted(G, energy - a, side='right'))
+                fits = end > start and (self.params.MULTI_TRIP or end == n)
+            else:
+                # 全部访问完毕，从所在充电桩返回基站
+                home = move_cost * float(np.linalg.norm(position - np.asarray(self.base_station, dtype=np.float64)))
+                fits = home <= energy
+            if not fits:
+                if not self.params.MULTI_TRIP or energy >= uav.max_E:
+                    break  # 满电也无法到达下一个传感器或基站
+                recharge_energy += uav.max_E - energy
+                energy = uav.max_E
+                continue
+            if start >= n:
+                energy -= home
+                flight_distance += home / move_cost
+                break
+            pad = int(pad_of[end - 1])
+            cost = float(a + G[end - 1])
+            trips.append((start, end, cost, pad))
+            flight_distance += float(np.linalg.norm(points[start] - position) + prefix[end - 1] - prefix[start]
+                                     + pad_dist[end - 1])
+            energy -= cost
+            start = end
+            position = pads.positions[pad]
+        return MissionPlan(path, trips, energy, recharge_energy, float(hover_times.sum()), start >= n and fits,
+                           flight_distance / uav.vel)
+
+    def _plan_mission(self, uav: UAV) -> MissionPlan:
+        """规划路径并切分为往返基站的行程，只读取该无人机负责的传感器，可在线程中执行"""
         path = self._plan_uav_path(uav)
+        if not path:
+            return MissionPlan(path, [], uav.curr_E, 0.0, 0.0, True, 0.0)
+        return self._split_trips(uav, path)
+
+    def _prepare_missions(self):
+        """
+        在线程池中并发规划本周期各无人机的任务
+        各无人机负责的传感器互不相交，任务在同一时刻瞬时完成，
+        所以提前规划与逐个规划的结果相同；机队级规划器会改写分配，仍逐个规划
+        """
+        self._mission_plans = {}
+        if self.mission_workers <= 1 or getattr(self.planner, 'plans_fleet', False):
+            return
+        pending = [idx for idx, uav in enumerate(self.uavs)
+                   if uav.curr_E > 0 and uav.busy_until <= self.system_time and self.uav_sensor_assignments.get(uav.id)]
+        if len(pending) <= 1:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.mission_workers, len(pending))) as executor:
+            plans = executor.map(lambda idx: self._plan_mission(self.uavs[idx]), pending)
+            self._mission_plans = dict(zip(pending, plans))
+
+    def _simulate_uav_mission(self, uav: UAV, plan=None) -> bool:
+        """
+        模拟无人机执行任务
+
+        Args:
+            uav: 无人机对象
+            plan: 预先计算的MissionPlan，None时当场规划
+        """
+        # 规划路径并切分为往返基站的行程
+        plan = plan if plan is not None else self._plan_mission(uav)
+        path = plan.path
         if not path:
             return True  # 没有任务可执行
         
-        current_pos = uav.pos
-        total_energy_needed = 0
-        
-        # 计算总能耗
-        for target_pos in path:
-            # 飞行能耗
-            flight_energy = self._calculate_flight_energy(uav, current_pos, target_pos)
-            total_energy_needed += flight_energy
-            
-            # 悬停和充电能耗
-            sensor_id = None
-            for sensor in self.sensors:
-                if (abs(sensor.position.x - target_pos.x) < 0.1 and 
-                    abs(sensor.position.y - target_pos.y) < 0.1 and
-                    abs(sensor.position.z - target_pos.z + 1) < 0.1):
-                    sensor_id = sensor.id
-                    break
-            
-            if sensor_id:
-                sensor = next(s for s in self.sensors if s.id == sensor_id)
-                charging_energy = self._calculate_charging_energy(uav, sensor)
-                hover_time = self._calculate_hover_time(uav, sensor, distance=1.0)
-                hover_energy = self._calculate_hover_energy(uav, hover_time)
-                total_energy_needed += charging_energy + hover_energy
-            
-            current_pos = target_pos
-        
-        # 返回基站的能耗
-        return_energy = self._calculate_flight_energy(uav, current_pos, self.base_station)
-        total_energy_needed += return_energy
-        
-        # 检查是否有足够电量
-        if total_energy_needed > uav.curr_E:
-            print(f"无人机{uav.id}电量不足，无法完成任务")
+        # 检查满电时能否访问路径上的每个传感器
+        if not plan.feasible:
+            logger.warning("无人机%d电量不足，无法完成任务", uav.id)
             return False
         
-        # 执行任务
-        uav.curr_E -= total_energy_needed
+        # 执行任务，段间在充电桩充满电
+        if len(plan.trips) > 1 or plan.recharge_energy > 0:
+            logger.info("无人机%d分%d段完成任务，在充电桩补充电能%.2fJ", uav.id, len(plan.trips), plan.recharge_energy)
+            recorder.record(self.system_time, 'uav_recharge', self.cycle_num, uav.id, energy=plan.recharge_energy)
+        self.stats.add_energy(uav.id, 'mission', uav.curr_E + plan.recharge_energy - plan.final_energy)
+        self.stats.add_energy(uav.id, 'hover', self._calculate_hover_energy(uav, plan.hover_time))
+        self.stats.add_energy(uav.id, 'recharge', plan.recharge_energy)
+        uav.curr_E = plan.final_energy
+        uav.E_recharged += plan.recharge_energy
+        pad_time = plan.recharge_energy / self.params.PAD_CHARGE_POWER
+        uav.pad_stop += pad_time
+        uav.node_stop += plan.hover_time
         uav.pos = self.base_station  # 返回基站
+        if self.params.MULTI_TRIP:
+            # 分段任务占用无人机的飞行、悬停和在充电桩补充电能的时间，期间的周期不再派出该无人机；
+            # 单段任务沿用原模型，在周期开始时瞬时完成
+            uav.busy_until = self.system_time + plan.flight_time + plan.hover_time + pad_time
         
-        # 收集数据
-        for target_pos in path:
-            sensor_id = None
-            for sensor in self.sensors:
-                if (abs(sensor.position.x - target_pos.x) < 0.1 and 
-                    abs(sensor.position.y - target_pos.y) < 0.1 and
-                    abs(sensor.position.z - target_pos.z + 1) < 0.1):
-                    sensor_id = sensor.id
-                break
-
-            if sensor_id:
-                sensor = next(s for s in self.sensors if s.id == sensor_id)
-                # 收集数据
-                if sensor_id in self.collected_data:
-                    # 清空已收集的数据
-                    self.collected_data[sensor_id] = []
-                
-                # 给传感器充电
-                sensor.cur_energy = sensor.battery_cap
+        with self.stats.timer('collection', uav.id, len(path)):
+            # 收集数据并给路径上的传感器充电
+            indices = [sensor.index for sensor in path]
+            self.data_buffer.collect(indices)
+            self.sensor_array.charge(indices)
         
         return True
     
-    def run_system(self) -> float:
-        """运行系统，返回系统运行时长"""
-        print("开始运行无人机传感器网络系统...")
-        
-        while not self.system_terminated:
-            
-            # 检查是否到了数据收集周期
-            if self.system_time - self.cycle_start_time >= self.data_collection_cycle:
-                cycle_num = int(self.system_time // self.data_collection_cycle) + 1
-                print(f"开始第{cycle_num}个数据收集周期")
-                
-                # 为每架无人机分配任务
-                for uav in self.uavs:
-                    if uav.curr_E <= 0:
-                        print(f"无人机{uav.id}电量耗尽")
-                        self.system_terminated = True
-                        self.termination_reason = f"无人机{uav.id}电量耗尽"
-                        break
-                    
-                    # 获取分配给当前无人机的传感器
-                    assigned_sensors = self.uav_sensor_assignments.get(uav.id, [])
-                    if not assigned_sensors:
-                        print(f"无人机{uav.id}没有分配传感器，跳过")
-                        continue
-                    
-                    print(f"无人机{uav.id}开始执行任务，负责传感器: {assigned_sensors}")
-                    
-                    # 执行任务
-                    if not self._simulate_uav_mission(uav):
-                        self.system_terminated = True
-                        self.termination_reason = "无人机电量不足"
-                        break
-                    
-                    print(f"无人机{uav.id}任务完成，剩余电量: {uav.curr_E:.2f}J")
-                
-                if not self.system_terminated:
-                    self.cycle_start_time = self.system_time
-                    self.cycle_num = cycle_num
-                    print(f"第{cycle_num}个周期完成")
-            
-            # 时间推进
-            self.system_time += 1.0
-        
-        print(f"系统终止，原因：{self.termination_reason}")
-        print(f"系统总运行时长：{self.system_time:.2f}秒")
+    def run_system(self, until: float = None) -> float:
+        """运行系统，返回系统运行时长
+
+        离散事件驱动：从事件堆中取出下一个事件并直接跳转到其时刻，
+        不再逐秒推进空闲时间
+
+        Args:
+            until: 暂停时刻，处理完该时刻及之前的事件后返回（可随后snapshot或fork），
+                再次调用时从暂停处继续；None为运行到系统终止
+        """
+        if self._finished:
+            return self.system_time
+        if not self._started:
+            logger.info("开始运行无人机传感器网络系统...")
+            self._started = True
+            self.event_queue.clear()
+            self._depletion_event = None
+            if self.params.SCHEDULING == 'on_demand':
+                # 按需模式：不再按周期巡回，传感器低于阈值时请求充电
+                self._attach_scheduler()
+                self.scheduler.start(self.system_time)
+            else:
+                self._schedule_next_cycle()
+            self._schedule_depletion()
+
+        horizon = self.params.SIMULATION_HORIZON
+        while not self.system_terminated and self.event_queue:
+            event = self.event_queue.peek()
+            if horizon is not None and event.time > horizon and (until is None or until >= horizon):
+                # 多段任务使无人机可以无限续航，到达仿真时长上限即停止
+                self.system_time = horizon
+                self.system_terminated = True
+                self.termination_reason = "达到仿真时长上限"
+                break
+            if until is not None and event.time > until:
+                # 暂停时不结算传感器能量，保证分段运行与一次运行的结果完全相同
+                self.system_time = until
+                return self.system_time
+            self.event_queue.pop()
+            self._drain_sensors(event.time)
+            self.system_time = event.time
+            self._event_handlers[event.type](event)
+
+        # 原逐秒推进的实现在终止时刻之后还会推进一个时间步，保持结果一致
+        self.system_time += self.time_step
+        self._finished = True
+
+        logger.info("系统终止，原因：%s", self.termination_reason)
+        logger.info("系统总运行时长：%.2f秒", self.system_time)
         return self.system_time
-    
+
+    def _drain_enabled(self) -> bool:
+        """传感器是否随时间耗能：params.SENSOR_DRAIN为True，或按需模式（请求由耗能触发）"""
+        return self.params.SENSOR_DRAIN or self.params.SCHEDULING == 'on_demand'
+
+    def _attach_scheduler(self):
+        """创建按需充电调度器并注册其事件处理函数"""
+        self.scheduler = ChargingScheduler(self, self.params.REQUEST_THRESHOLD)
+        self._event_handlers[EventType.CHARGE_REQUEST] = self.scheduler.on_request
+        self._event_handlers[EventType.UAV_ARRIVAL] = self.scheduler.on_arrival
+
+    # ---- 快照 ----
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        把运行中的系统状态编码为扁平的数组字典（可用np.savez保存，不含Python对象）
+        包括时钟、传感器各列、数据缓冲区、无人机电量与位置、分配结果、缓存路径、事件队列、
+        按需调度器和随机数状态，参数以JSON字符串保存。
+        周期内的预规划结果在周期开始时重新计算，不保存；规划器内部的缓存不保存
+
+        Returns:
+            Dict[str, np.ndarray]: 键带有sensor.、uav.、events.等前缀
+        """
+        if self._depletion_event is not None and self._depletion_event not in self.event_queue:
+            self._depletion_event = None
+        meta = {
+            'params': self.params.to_dict(),
+            'termination_reason': self.termination_reason,
+            'data_path': self.data_path,
+        }
+        arrays = {
+            'meta': np.array(json.dumps(meta, ensure_ascii=False)),
+            'clock': np.array([self.system_time, self.last_drain_time, self.cycle_start_time,
+                               self.data_collection_cycle, self.time_step, self.data_generation_interval,
+                               self.last_data_generation], dtype=np.float64),
+            'flags': np.array([self.cycle_num, self.system_terminated, self._started, self._finished,
+                               -1 if self._depletion_event is None else self._depletion_event.seq],
+                              dtype=np.int64),
+            'pads': self.pads.positions.copy(),
+        }
+        store = self.sensor_array
+        for name in SENSOR_COLUMNS:
+            arrays['sensor.' + name] = getattr(store, name).copy()
+        buffer = self.data_buffer
+        arrays['data.stamps'] = buffer.stamps.copy()
+        arrays['data.head'] = buffer.head.copy()
+        arrays['data.count'] = buffer.count.copy()
+        arrays['data.totals'] = np.array([buffer.buffered, buffer.collected, buffer.lost], dtype=np.int64)
+
+        uavs = self.uavs
+        arrays['uav.state'] = np.array([[getattr(u, field) for field in UAV_FIELDS]
+                                        for u in uavs], dtype=np.float64).reshape(-1, len(UAV_FIELDS))
+        arrays['uav.pos'] = np.array([u.pos for u in uavs], dtype=np.float64).reshape(-1, 3)
+
+        # 分配结果按无人机ID排列，各组传感器ID保持原顺序首尾相接
+        uav_ids = sorted(self.uav_sensor_assignments)
+        groups = [self.uav_sensor_assignments[uav_id] for uav_id in uav_ids]
+        arrays['assign.uav_ids'] = np.array(uav_ids, dtype=np.int64)
+        arrays['assign.counts'] = np.array([len(g) for g in groups], dtype=np.int64)
+        arrays['assign.sensor_ids'] = np.array([sid for g in groups for sid in g], dtype=np.int64)
+
+        state = self.rng.getstate()
+        arrays['rng.state'] = np.array(state[1], dtype=np.uint64)
+        arrays['rng.gauss'] = np.array([np.nan if state[2] is None else state[2]], dtype=np.float64)
+
+        parts = [('events.', self.event_queue.to_arrays())]
+        if self.route_cache is not None:
+            parts.append(('routes.', self.route_cache.to_arrays()))
+        if self.scheduler is not None:
+            parts.append(('scheduler.', self.scheduler.to_arrays()))
+        for prefix, part in parts:
+            arrays.update((prefix + key, value) for key, value in part.items())
+        return arrays
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        """
+        用snapshot()的结果恢复系统状态（传感器数量和无人机数量须与快照一致）
+        随机数生成器换为独立的random.Random，不影响全局random
+        """
+        meta = json.loads(str(snapshot['meta']))
+        if len(snapshot['sensor.ids']) != len(self.sensor_array) or len(snapshot['uav.pos']) != len(self.uavs):
+            raise ValueError("快照的传感器或无人机数量与当前系统不一致")
+        self.termination_reason = meta['termination_reason']
+        (self.system_time, self.last_drain_time, self.cycle_start_time, self.data_collection_cycle,
+         self.time_step, self.data_generation_interval, self.last_data_generation) = snapshot['clock'].tolist()
+        cycle_num, terminated, started, finished, depletion_seq = snapshot['flags'].tolist()
+        self.cycle_num = cycle_num
+        self.system_terminated = bool(terminated)
+        self._started = bool(started)
+        self._finished = bool(finished)
+
+        self.pads = PadIndex(snapshot['pads'])
+        self._base_pad = None
+        if hasattr(self.planner, 'bind_pads'):
+            self.planner.bind_pads(self._route_pads())
+
+        # 原地写入各列，Sensor视图和注册表保持有效
+        for name in SENSOR_COLUMNS:
+            getattr(self.sensor_array, name)[...] = snapshot['sensor.' + name]
+
+        for uav, row, pos in zip(self.uavs, snapshot['uav.state'].tolist(), snapshot['uav.pos'].tolist()):
+            for field, value in zip(UAV_FIELDS, row):
+                setattr(uav, field, value)
+            uav.pos = tuple(pos)
+
+        sensor_ids = snapshot['assign.sensor_ids'].tolist()
+        bounds = np.cumsum(snapshot['assign.counts']).tolist()
+        self.uav_sensor_assignments = {uav_id: sensor_ids[end - count:end] for uav_id, count, end in
+                                       zip(snapshot['assign.uav_ids'].tolist(), snapshot['assign.counts'].tolist(),
+                                           bounds)}
+        self.registry = SensorRegistry(self.sensor_array)  # 快照中的传感器ID可能与当前不同
+        self._sync_assignments()
+        self._mission_plans = {}
+
+        if not isinstance(self.rng, random.Random):
+            self.rng = random.Random()
+        gauss = float(snapshot['rng.gauss'][0])
+        self.rng.setstate((3, tuple(snapshot['rng.state'].tolist()), None if math.isnan(gauss) else gauss))
+
+        if self.route_cache is not None:
+            self.route_cache.load_arrays(_unprefix(snapshot, 'routes.'))
+
+        self.event_queue = EventQueue.from_arrays(_unprefix(snapshot, 'events.'))
+        self._depletion_event = None
+        if depletion_seq >= 0:
+            self._depletion_event = self.event_queue.find(depletion_seq)
+
+        self.scheduler = None
+        self._event_handlers.pop(EventType.CHARGE_REQUEST, None)
+        self._event_handlers.pop(EventType.UAV_ARRIVAL, None)
+        if 'scheduler.version' in snapshot:
+            self._attach_scheduler()
+            self.scheduler.load_arrays(_unprefix(snapshot, 'scheduler.'))
+
+        buffer = self.data_buffer = SensorDataBuffer(0, snapshot['data.stamps'].shape[1])
+        buffer.stamps = snapshot['data.stamps'].copy()
+        buffer.head = snapshot['data.head'].copy()
+        buffer.count = snapshot['data.count'].copy()
+        buffer.buffered, buffer.collected, buffer.lost = snapshot['data.totals'].tolist()
+
+    def save_snapshot(self, path: str):
+        """把快照写入.npz文件"""
+        np.savez(path, **self.snapshot())
+
+    @staticmethod
+    def load_snapshot(path: str) -> Dict[str, np.ndarray]:
+        """读取save_snapshot写入的.npz文件（不反序列化任何Python对象）"""
+        with np.load(path, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    @classmethod
+    def from_snapshot(cls, snapshot, planner=None) -> WRSNNetwork:
+        """
+        在新进程中由快照重建系统
+
+        Args:
+            snapshot: snapshot()的结果或save_snapshot写入的文件路径
+            planner: 路径规划器，默认同WRSNNetwork
+        """
+        if isinstance(snapshot, (str, os.PathLike)):
+            snapshot = cls.load_snapshot(snapshot)
+        meta = json.loads(str(snapshot['meta']))
+        params = InputParameter.from_dict(meta['params'])
+        # 充电桩来自快照，不再读取数据文件
+        params.PAD_DATA_PATH = None
+        sensors = SensorArray()
+        for name in SENSOR_COLUMNS:
+            setattr(sensors, name, snapshot['sensor.' + name])
+        network = cls(params, planner=planner, sensors=sensors, seed=0, data_path=meta['data_path'])
+        network.params.PAD_DATA_PATH = meta['params'].get('PAD_DATA_PATH')
+        network.restore(snapshot)
+        return network
+
+    def fork(self, count: int = 1) -> List[WRSNNetwork]:
+        """
+        从当前状态分出count个相互独立的副本，用于比较不同的后续策略（可修改各副本的params）
+        副本与本系统共用同一个规划器对象
+        """
+        snapshot = self.snapshot()
+        return [type(self).from_snapshot(snapshot, planner=self.planner) for _ in range(count)]
+
+    def _drain_sensors(self, until: float):
+        """把所有传感器的能量消耗和数据生成结算到until时刻"""
+        self._generate_data(until)
+        elapsed = (until - self.last_drain_time) / self.params.SENSOR_RATE_UNIT
+        self.last_drain_time = until
+        if not self._drain_enabled():
+            return
+        for idx in self.sensor_array.drain(elapsed):
+            sensor_id = int(self.sensor_array.ids[idx])
+            logger.info("传感器%d电量耗尽", sensor_id)
+            recorder.record(until, 'sensor_depletion', self.cycle_num, sensor=sensor_id)
+
+    def _generate_data(self, until: float):
+        """
+        活跃传感器生成(last_data_generation, until]内各个生成时刻的数据包
+        区间内耗尽的传感器按区间开始时的状态计
+        """
+        interval = self.data_generation_interval
+        first = math.floor(self.last_data_generation / interval) + 1
+        last = math.floor(until / interval)
+        if last < first:
+            return
+        self.data_buffer.generate(interval * np.arange(first, last + 1), self.sensor_array.is_active)
+        self.last_data_generation = last * interval
+
+    def _schedule_depletion(self):
+        """预测下一个传感器耗尽的时刻并调度事件，之前的预测随之取消"""
+        if self._depletion_event is not None:
+            self.event_queue.cancel(self._depletion_event)
+            self._depletion_event = None
+        if not self._drain_enabled():
+            return
+        idx, remaining = self.sensor_array.time_to_depletion()
+        if idx < 0:
+            return
+        when = self.last_drain_time + remaining * self.params.SENSOR_RATE_UNIT
+        self._depletion_event = self.event_queue.push(when, EventType.SENSOR_DEPLETION, idx)
+
+    def _on_sensor_depletion(self, event):
+        if event is not self._depletion_event:
+            return  # 传感器能量已被补充，该预测已过期
+        self._depletion_event = None
+        if self.sensor_array.active_count() == 0:
+            self.system_terminated = True
+            self.termination_reason = "所有传感器电量耗尽"
+            return
+        self._schedule_depletion()
+
+    def _schedule_next_cycle(self):
+        """调度下一个数据收集周期的开始事件（对齐到时钟分辨率）"""
+        steps = math.ceil(self.data_collection_cycle / self.time_step)
+        next_time = self.cycle_start_time + steps * self.time_step
+        self.event_queue.push(next_time, EventType.CYCLE_START)
+
+    def _dispatch_mission(self, cycle_num: int, uav_index: int):
+        """按无人机顺序调度任务，全部完成后结束当前周期"""
+        if uav_index < len(self.uavs):
+            self.event_queue.push(self.system_time, EventType.MISSION_START, (cycle_num, uav_index))
+            return
+
+        self.cycle_start_time = self.system_time
+        self.cycle_num = cycle_num
+        logger.info("第%d个周期完成", cycle_num)
+        recorder.record(self.system_time, 'cycle_end', cycle_num)
+        self._schedule_next_cycle()
+
+    def _on_cycle_start(self, event):
+        cycle_num = int(self.system_time // self.data_collection_cycle) + 1
+        logger.info("开始第%d个数据收集周期", cycle_num)
+        recorder.record(self.system_time, 'cycle_start', cycle_num)
+        self.stats.start_cycle(cycle_num)
+        self._prepare_missions()
+        self._dispatch_mission(cycle_num, 0)
+
+    def _on_mission_start(self, event):
+        cycle_num, uav_index = event.payload
+        uav = self.uavs[uav_index]
+
+        if uav.curr_E <= 0:
+            logger.warning("无人机%d电量耗尽", uav.id)
+            self.system_terminated = True
+            self.termination_reason = f"无人机{uav.id}电量耗尽"
+            return
+
+        if uav.busy_until > self.system_time:
+            logger.info("无人机%d仍在执行上一次任务（至%.2f秒），跳过本周期", uav.id, uav.busy_until)
+            self._dispatch_mission(cycle_num, uav_index + 1)
+            return
+
+        # 获取分配给当前无人机的传感器
+        assigned_sensors = self.uav_sensor_assignments.get(uav.id, [])
+        if not assigned_sensors:
+            logger.info("无人机%d没有分配传感器，跳过", uav.id)
+            self._dispatch_mission(cycle_num, uav_index + 1)
+            return
+
+        logger.info("无人机%d开始执行任务，负责%d个传感器", uav.id, len(assigned_sensors))
+        logger.debug("无人机%d负责传感器: %s", uav.id, assigned_sensors)
+        recorder.record(self.system_time, 'mission_start', cycle_num, uav.id, energy=uav.curr_E)
+
+        # 执行任务
+        if not self._simulate_uav_mission(uav, self._mission_plans.pop(uav_index, None)):
+            recorder.record(self.system_time, 'mission_failed', cycle_num, uav.id, energy=uav.curr_E)
+            self.system_terminated = True
+            self.termination_reason = "无人机电量不足"
+            return
+
+        # 充电改变了传感器的耗尽时间，重新预测
+        self._schedule_depletion()
+
+        # 当前模型中任务瞬时完成，结束事件与开始事件同一时刻
+        self.event_queue.push(self.system_time, EventType.MISSION_END, (cycle_num, uav_index))
+
+    def _on_mission_end(self, event):
+        cycle_num, uav_index = event.payload
+        uav = self.uavs[uav_index]
+        logger.info("无人机%d任务完成，剩余电量: %.2fJ", uav.id, uav.curr_E)
+        recorder.record(self.system_time, 'mission_end', cycle_num, uav.id, energy=uav.curr_E)
+        self._dispatch_mission(cycle_num, uav_index + 1)
+
     def get_system_status(self) -> Dict:
         """获取系统状态"""
-        active_sensors = sum(1 for s in self.sensors if s.is_active)
+        active_sensors = self.sensor_array.active_count()
         active_uavs = sum(1 for u in self.uavs if u.curr_E > 0)
         
-        return {
+        status = {
             'cycle_num': self.cycle_num,
             'system_time': self.system_time,
             'active_sensors': active_sensors,
@@ -379,8 +941,16 @@ class WRSNNetwork():
             'total_uavs': len(self.uavs),
             'terminated': self.system_terminated,
             'termination_reason': self.termination_reason,
-            'collected_data_count': sum(len(data) for data in self.collected_data.values())
+            'collected_data_count': self.data_buffer.collected,
+            'buffered_data_count': self.data_buffer.buffered,
+            'lost_data_count': self.data_buffer.lost,
         }
+        if self.scheduler is not None:
+            status['requests_served'] = self.scheduler.served
+            status['requests_missed'] = self.scheduler.missed
+        if self.stats.enabled:
+            status['phase_stats'] = self.stats.summary()
+        return status
     
     def get_uav_hover_time(self, uav_id: int, sensor_id: int, distance: float = 1.0) -> float:
         """
@@ -395,12 +965,13 @@ class WRSNNetwork():
             float: 悬停时间(秒)
         """
         if uav_id >= len(self.uavs) or uav_id < 0:
-            print(f"错误：无人机ID {uav_id} 不存在")
+            logger.error("错误：无人机ID %s 不存在", uav_id)
             return 0.0
         
-        sensor = next((s for s in self.sensors if s.id == sensor_id), None)
+        with self.stats.timer('lookup', uav_id, 1):
+            sensor = self.registry.get(sensor_id)
         if not sensor:
-            print(f"错误：传感器ID {sensor_id} 不存在")
+            logger.error("错误：传感器ID %s 不存在", sensor_id)
             return 0.0
         
         uav = self.uavs[uav_id]
@@ -417,14 +988,17 @@ class WRSNNetwork():
             float: 总悬停时间(秒)
         """
         if uav_id >= len(self.uavs) or uav_id < 0:
-            print(f"错误：无人机ID {uav_id} 不存在")
+            logger.error("错误：无人机ID %s 不存在", uav_id)
             return 0.0
         
         uav = self.uavs[uav_id]
-        assigned_sensor_ids = self.uav_sensor_assignments.get(uav_id, [])
-        assigned_sensors = [s for s in self.sensors if s.id in assigned_sensor_ids and s.is_active]
+        # 直接按负责传感器的下标批量计算，不构造Sensor列表
+        with self.stats.timer('lookup', uav_id) as timer:
+            indices = self.registry.assigned_indices(uav_id, self.sensor_array.is_active)
+            if timer is not None:
+                timer.items = len(indices)
         
-        return self._calculate_total_hover_time(uav, assigned_sensors)
+        return self._total_hover_time(uav, indices)
 
 
 
@@ -0,0 +1,148 @@
+"""
+充电桩（pad）
+基站本身是0号充电桩，其余充电桩从数据文件加载（每行 id x y z）。
+PadIndex把充电桩按均匀网格分桶，批量最近邻查询逐圈扩展搜索，
+每个查询只检查附近的几个网格，与充电桩总数无关
+"""
+
+import math
+import numpy as np
+from utils import logger
+
+PADS_PER_CELL = 2  # 网格边长按平均每格的充电桩数确定
+
+
+class PadIndex():
+    """充电桩坐标的网格索引（只按x、y划分）"""
+
+    def __init__(self, positions, cell_size: float = None):
+        """
+        Args:
+            positions: 充电桩坐标(P, 3)，下标即充电桩编号
+            cell_size: 网格边长，默认使平均每格约PADS_PER_CELL个充电桩
+        """
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        n = len(self.positions)
+        xy = self.positions[:, :2]
+        self.origin = xy.min(axis=0) if n else np.zeros(2)
+        extent = np.ptp(xy, axis=0) if n else np.zeros(2)
+        if cell_size is None:
+            area = max(extent[0], 1.0) * max(extent[1], 1.0)
+            cell_size = math.sqrt(area * PADS_PER_CELL / max(n, 1))
+        self.cell_size = float(cell_size)
+        self.shape = (extent // self.cell_size).astype(np.int64) + 1
+
+        # 按网格编号排序的充电桩下标，starts[c]:starts[c+1]为第c格中的充电桩
+        cells = self._flat(self._cell_of(xy))
+        self.order = np.argsort(cells, kind='stable')
+        self.starts = np.searchsorted(cells[self.order], np.arange(self.shape.prod() + 1))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _cell_of(self, xy):
+        cell = np.floor((xy - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cell, 0, self.shape - 1)
+
+    def _flat(self, cell):
+        return cell[..., 0] * self.shape[1] + cell[..., 1]
+
+    def nearest(self, points):
+        """
+        批量查询最近的充电桩（三维距离）
+
+        Args:
+            points: 查询点(n, 3)
+
+        Returns:
+            (下标(n,), 距离(n,))
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        n = len(points)
+        best_idx = np.full(n, -1, dtype=np.int64)
+        best_dist = np.full(n, np.inf)
+        if n == 0 or len(self) == 0:
+            return best_idx, best_dist
+        home = self._cell_of(points[:, :2])
+        pending = np.arange(n)
+        for r in range(int(self.shape.max()) + 1):
+            # 第r圈：与所在网格的切比雪夫距离为r的网格
+            span = np.arange(-r, r + 1)
+            if r == 0:
+                offsets = np.zeros((1, 2), dtype=np.int64)
+            else:
+                offsets = np.concatenate([np.stack([span, np.full_like(span, -r)], 1),
+                                          np.stack([span, np.full_like(span, r)], 1),
+                                          np.stack([np.full(2 * r - 1, -r), span[1:-1]], 1),
+                                          np.stack([np.full(2 * r - 1, r), span[1:-1]], 1)])
+            cell = home[pending, None, :] + offsets[None, :, :]
+            valid = ((cell >= 0) & (cell < self.shape)).all(axis=-1)
+            flat = np.where(valid, self._flat(cell), 0)
+            counts = np.where(valid, self.starts[flat + 1] - self.starts[flat], 0).ravel()
+            if counts.any():
+                query = np.repeat(np.repeat(pending, len(offsets)), counts)
+                first = np.repeat(self.starts[flat.ravel()], counts)
+                within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                pad = self.order[first + within]
+                diff = points[query] - self.positions[pad]
+                dist = np.einsum('ij,ij->i', diff, diff)  # 平方距离
+                # 候选按查询点连续排列，分组取本圈最近者，与已有结果比较
+                head = np.flatnonzero(np.r_[True, query[1:] != query[:-1]])
+                group_min = np.minimum.reduceat(dist, head)
+                hit = np.flatnonzero(dist == np.repeat(group_min, np.diff(np.r_[head, len(dist)])))
+                hit = hit[np.r_[True, query[hit[1:]] != query[hit[:-1]]]]
+                query, pad, dist = query[hit], pad[hit], dist[hit]
+                better = dist < best_dist[query]
+                best_idx[query[better]] = pad[better]
+                best_dist[query[better]] = dist[better]
+            # 更外圈的充电桩在已搜索的方块之外，距离不小于查询点到方块边界（网格边缘处无充电桩）的距离
+            lo = home[pending] - r
+            hi = home[pending] + r + 1
+            # 查询点在网格外时，另一坐标轴上到网格的距离也计入
+            xy = points[pending, :2] - self.origin
+            outside = np.maximum(np.maximum(-xy, xy - self.shape * self.cell_size), 0.0)[:, ::-1]
+            gap = np.minimum(np.where(lo > 0, np.hypot(xy - lo * self.cell_size, outside), np.inf),
+                             np.where(hi < self.shape, np.hypot(hi * self.cell_size - xy, outside), np.inf))
+            pending = pending[best_dist[pending] > gap.min(axis=1) ** 2]
+            if len(pending) == 0:
+                break
+        return best_idx, np.sqrt(best_dist)
+
+    def nearest_pad(self, point):
+        """单点查询，返回(下标, 距离)"""
+        idx, dist = self.nearest(np.asarray(point, dtype=np.float64).reshape(1, 3))
+        return int(idx[0]), float(dist[0])
+
+
+def load_pad_data(path: str) -> np.ndarray:
+    """
+    从文本文件加载充电桩坐标，每行为 id x y z，按文件中的顺序返回(P, 3)
+
+    Args:
+        path: 数据文件路径
+    """
+    positions = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                parts = line.split()
+                if not parts:
+                    continue
+                if len(parts) != 4:
+                    logger.warning("警告：充电桩数据第%d行格式不正确，跳过", line_num)
+                    continue
+                try:
+                    positions.append([float(v) for v in parts[1:]])
+                except ValueError:
+                    logger.warning("警告：充电桩数据第%d行数值错误，跳过", line_num)
+    except FileNotFoundError:
+        logger.error("错误：找不到充电桩数据文件%s", path)
+    return np.array(positions, dtype=np.float64).reshape(-1, 3)
+
+
+def grid_pads(area_size, spacing: float, height: float = 0.0) -> np.ndarray:
+    """在区域内按spacing间距均匀布置充电桩，返回(P, 3)"""
+    xs = np.arange(spacing / 2, area_size[0], spacing)
+    ys = np.arange(spacing / 2, area_size[1], spacing)
+    gx, gy = np.meshgrid(xs, ys, indexing='ij')
+    return np.stack([gx.ravel(), gy.ravel(), np.full(gx.size, height)], axis=1)
@@ -0,0 +1,352 @@
+"""
+按需充电调度
+传感器剩余能量低于阈值、或缓冲的数据包接近写满时发出服务请求，
+截止时刻为按能耗速率预测的耗尽时刻与缓冲区溢出时刻中较早者。
+请求按截止时刻进入堆（最早截止优先），派给最近的可行空闲无人机；没有这样的无人机时
+以最便宜插入加入预计最早到达的无人机的待访问路径。无人机依次飞往路径上的传感器悬停充电并收集数据，
+电量不足以完成下一站并到达充电桩时先就近充电。
+各传感器发出请求的时刻在服务时即可算出，作为单独的事件入队，过期事件按版本号丢弃，
+所有队列操作均为对数复杂度
+"""
+
+import heapq
+import itertools
+import math
+from collections import namedtuple
+import numpy as np
+from utils import logger, recorder, EventType
+from Algorithms.test import HOVER_HEIGHT
+
+# 充电请求：按(截止时刻, 入队顺序)出堆
+ChargingRequest = namedtuple('ChargingRequest', ['deadline', 'seq', 'sensor', 'version'])
+
+# 无人机事件的类型：在传感器处悬停充电完毕 / 在充电桩充满电
+ARRIVE_SENSOR = 0
+ARRIVE_PAD = 1
+
+
+class UAVState():
+    """按需模式下一架无人机的执行状态"""
+
+    def __init__(self, index, uav):
+        self.index = index   # 无人机在network.uavs中的下标
+        self.uav = uav
+        self.route = np.empty(0, dtype=np.int64)  # 待访问的传感器下标
+        self.service = np.empty(0)                 # 与route对应的预计悬停时间
+        self.target = None   # 正在前往或正在服务的传感器下标
+        self.pad = None      # 正在前往充电或正在充电的充电桩下标
+
+    @property
+    def idle(self):
+        return self.target is None and self.pad is None
+
+
+class ChargingScheduler():
+    """按需充电请求调度器，由WRSNNetwork的事件循环驱动"""
+
+    def __init__(self, network, threshold: float):
+        """
+        Args:
+            network: WRSNNetwork
+            threshold: 发出充电请求的剩余能量比例
+        """
+        self.network = network
+        self.threshold = threshold
+        store = network.sensor_array
+        self.version = np.zeros(len(store), dtype=np.int64)  # 传感器每次充电后加1，使旧事件和请求过期
+        self.requested = np.zeros(len(store), dtype=bool)    # 已发出且尚未服务的请求
+        self.requests = []
+        self._counter = itertools.count()
+
+        # 传感器位置不变，悬停点及其最近的充电桩预先批量计算
+        self.waypoints = store.positions + (0.0, 0.0, HOVER_HEIGHT)
+        self.pad_distance = network.pads.nearest(self.waypoints)[1]
+
+        self.states = [UAVState(idx, uav) for idx, uav in enumerate(network.uavs)]
+        # 各无人机当前动作结束时所在位置及时刻，用于按到达时刻下界筛选候选无人机
+        self.anchors = np.array([np.asarray(uav.pos, dtype=np.float64) for uav in network.uavs]).reshape(-1, 3)
+        self.free_time = np.zeros(len(network.uavs))
+        self.speeds = np.array([uav.vel for uav in network.uavs], dtype=np.float64)
+        self.served = 0
+        self.missed = 0
+
+    def to_arrays(self) -> dict:
+        """调度器状态编码为数组（请求堆、各无人机路径首尾相接存放）"""
+        requests = self.requests
+        next_seq = next(self._counter)
+        self._counter = itertools.count(next_seq)
+        return {
+            'version': self.version.copy(),
+            'requested': self.requested.copy(),
+            'request_deadline': np.array([r.deadline for r in requests], dtype=np.float64),
+            'request_seq': np.array([r.seq for r in requests], dtype=np.int64),
+            'request_sensor': np.array([r.sensor for r in requests], dtype=np.int64),
+            'request_version': np.array([r.version for r in requests], dtype=np.int64),
+            'next_seq': np.int64(next_seq),
+            'route_lengths': np.array([len(st.route) for st in self.states], dtype=np.int64),
+            'routes': np.concatenate([st.route for st in self.states]),
+            'services': np.concatenate([st.service for st in self.states]),
+            'targets': np.array([-1 if st.target is None else st.target for st in self.states], dtype=np.int64),
+            'pads': np.array([-1 if st.pad is None else st.pad for st in self.states], dtype=np.int64),
+            'anchors': self.anchors.copy(),
+            'free_time': self.free_time.copy(),
+            'counts': np.array([self.served, self.missed], dtype=np.int64),
+        }
+
+    def load_arrays(self, arrays):
+        """用to_arrays的结果恢复调度器状态"""
+        self.version = arrays['version'].copy()
+        self.requested = arrays['requested'].copy()
+        self.requests = [ChargingRequest(*r) for r in zip(arrays['request_deadline'].tolist(),
+                                                          arrays['request_seq'].tolist(),
+                                                          arrays['request_sensor'].tolist(),
+                                                          arrays['request_version'].tolist())]
+        heapq.heapify(self.requests)
+        self._counter = itertools.count(int(arrays['next_seq']))
+        bounds = np.cumsum(arrays['route_lengths'])[:-1]
+        for state, route, service, target, pad in zip(self.states, np.split(arrays['routes'], bounds),
+                                                      np.split(arrays['services'], bounds),
+                                                      arrays['targets'].tolist(), arrays['pads'].tolist()):
+            state.route = route.copy()
+            state.service = service.copy()
+            state.target = None if target < 0 else target
+            state.pad = None if pad < 0 else pad
+        self.anchors = arrays['anchors'].copy()
+        self.free_time = arrays['free_time'].copy()
+        self.served, self.missed = arrays['counts'].tolist()
+
+    # ---- 请求 ----
+
+    def _rate(self, indices):
+        """能耗速率换算为J/s"""
+        return self.network.sensor_array.energy_consumption_rate[indices] / self.network.params.SENSOR_RATE_UNIT
+
+    def start(self, now: float):
+        """为所有活跃传感器调度发出请求的事件"""
+        store = self.network.sensor_array
+        indices = np.flatnonzero(store.is_active)
+        for idx, when in zip(indices, self._request_times(now, indices)):
+            if np.isfinite(when):
+                self._push_crossing(when, idx)
+
+    def _request_times(self, now, indices):
+        """发出请求的时刻：剩余能量越过阈值或缓冲的数据包达到阈值，取较早者"""
+        return np.minimum(self._crossing_times(now, indices), self._data_times(now, indices)[0])
+
+    def _crossing_times(self, now, indices):
+        store = self.network.sensor_array
+        margin = np.maximum(store.cur_energy[indices] - self.threshold * store.battery_cap[indices], 0.0)
+        rate = self._rate(indices)
+        remaining = np.full(len(indices), np.inf)
+        np.divide(margin, rate, out=remaining, where=rate > 0)
+        return now + remaining
+
+    def _data_times(self, now, indices):
+        """
+        缓冲的数据包数达到params.DATA_REQUEST_THRESHOLD的时刻，以及缓冲区溢出（开始丢失数据）的时刻
+        数据包在生成间隔的整数倍时刻产生，缓冲只在无人机服务时清空，所以两个时刻在服务时即可算出
+        """
+        network = self.network
+        buffer = network.data_buffer
+        interval = network.data_generation_interval
+        tick = round(network.last_data_generation / interval)  # 最近一次已生成数据的时刻序号
+        count = buffer.count[indices]
+        overflow = interval * (tick + buffer.capacity - count + 1)
+        threshold = network.params.DATA_REQUEST_THRESHOLD
+        if threshold is None:
+            return np.full(len(indices), np.inf), overflow
+        target = max(1, math.ceil(threshold * buffer.capacity))
+        return np.maximum(interval * (tick + np.maximum(target - count, 0)), now), overflow
+
+    def _push_crossing(self, when, idx):
+        self.network.event_queue.push(when, EventType.CHARGE_REQUEST, (int(idx), int(self.version[idx])))
+
+    def on_request(self, event):
+        """传感器越过阈值：按耗尽时刻和缓冲区溢出时刻中较早者作为截止时刻加入请求堆并尝试派遣"""
+        idx, version = event.payload
+        store = self.network.sensor_array
+        if version != self.version[idx] or not store.is_active[idx] or self.requested[idx]:
+            return
+        now = self.network.system_time
+        rate = self._rate(idx)
+        deadline = now + store.cur_energy[idx] / rate if rate > 0 else math.inf
+        deadline = min(deadline, float(self._data_times(now, np.array([idx]))[1][0]))
+        self.requested[idx] = True
+        heapq.heappush(self.requests, ChargingRequest(deadline, next(self._counter), idx, version))
+        recorder.record(now, 'charge_request', sensor=int(store.ids[idx]), energy=float(store.cur_energy[idx]))
+        self.dispatch()
+
+    def dispatch(self):
+        """按截止时刻顺序把请求派给无人机，所有无人机都在充电时剩余请求留在堆中"""
+        store = self.network.sensor_array
+        while self.requests:
+            request = self.requests[0]
+            if request.version != self.version[request.sensor] or not store.is_active[request.sensor]:
+                heapq.heappop(self.requests)
+                self.requested[request.sensor] = False
+                continue
+            choice = self._choose_uav(request)
+            if choice is None:
+                return
+            heapq.heappop(self.requests)
+            state, position, eta = choice
+            state.route = np.insert(state.route, position, request.sensor)
+            state.service = np.insert(state.service, position, self._service_time(state.uav, request.sensor))
+            if eta > request.deadline:
+                logger.debug("传感器%d的充电请求预计晚于截止时刻到达", store.ids[request.sensor])
+            if state.idle:
+                self._start_next(state)
+
+    def _service_time(self, uav, idx):
+        hover = self.network._calculate_hover_times(uav, np.array([idx]), 1.0)
+        return float(hover[0])
+
+    def _service_energy(self, uav, idx, distance, service):
+        """飞行distance到传感器idx、悬停service秒充电并飞到其最近充电桩所需的电能"""
+        network = self.network
+        node_cost = float(network._calculate_charging_energies(uav, np.array([idx]))[0]
+                          + network._calculate_hover_energy(uav, service))
+        return uav.P_mov / uav.vel * (distance + self.pad_distance[idx]) + node_cost
+
+    def _choose_uav(self, request):
+        """
+        选择服务请求的无人机：有空闲且当前电量足以完成服务并到达充电桩的无人机时取其中最近的一架；
+        否则以最便宜插入把请求加入各无人机的路径，取预计到达时刻最早的无人机（电量不足的空闲无人机先去充电）
+
+        到达时刻不早于 当前动作结束时刻 + 从该位置直飞的时间，按这一下界从小到大检查，
+        下界超过已找到的最早到达时刻即停止，通常只需检查最近的几架无人机
+
+        Returns:
+            (无人机状态, 插入位置, 预计到达时刻)，所有无人机都在充电时返回None
+        """
+        now = self.network.system_time
+        waypoint = self.waypoints[request.sensor]
+        distance = np.linalg.norm(self.anchors - waypoint, axis=1)
+        idle = np.flatnonzero([state.idle and len(state.route) == 0 for state in self.states])
+        for u in idle[np.argsort(distance[idle], kind='stable')]:
+            uav = self.states[u].uav
+            service = self._service_time(uav, request.sensor)
+            if self._service_energy(uav, request.sensor, distance[u], service) <= uav.curr_E:
+                return self.states[u], 0, now + distance[u] / self.speeds[u]
+
+        charging = np.array([state.pad is not None for state in self.states])
+        bound = np.maximum(self.free_time, now) + distance / self.speeds
+        bound[charging] = np.inf
+        best = None
+        for u in np.argsort(bound, kind='stable'):
+            if not np.isfinite(bound[u]) or (best is not None and bound[u] >= best[2]):
+                break
+            state = self.states[u]
+            stops = np.vstack([self.anchors[u], self.waypoints[state.route]])
+            to_x = np.sqrt(((stops - waypoint) ** 2).sum(axis=1))
+            legs = np.sqrt((np.diff(stops, axis=0) ** 2).sum(axis=1))
+            # 插在第k站之后：绕行 d(k, x) + d(x, k+1) - d(k, k+1)，最后一站之后只增加 d(last, x)
+            detour = to_x.copy()
+            detour[:-1] += to_x[1:] - legs
+            k = int(np.argmin(detour))
+            eta = max(self.free_time[u], now) + (legs[:k].sum() + to_x[k]) / self.speeds[u] + state.service[:k].sum()
+            if best is None or eta < best[2]:
+                best = (state, k, eta)
+        return best
+
+    # ---- 无人机执行 ----
+
+    def _start_next(self, state):
+        """空闲无人机出发前往路径上的下一个传感器，电量不足以完成下一站并到达充电桩时先去最近的充电桩"""
+        network = self.network
+        store = network.sensor_array
+        uav = state.uav
+        now = network.system_time
+        while len(state.route):
+            idx = int(state.route[0])
+            if not store.is_active[idx]:
+                # 无人机出发前传感器已耗尽
+                state.route, state.service = state.route[1:], state.service[1:]
+                self.missed += 1
+                continue
+            move_cost = uav.P_mov / uav.vel
+            distance = float(np.linalg.norm(self.waypoints[idx] - self.anchors[state.index]))
+            need = self._service_energy(uav, idx, distance, float(state.service[0]))
+            if need > uav.curr_E:
+                if uav.curr_E >= uav.max_E or need > uav.max_E:
+                    # 满电也无法服务该传感器，放弃请求
+                    logger.warning("无人机%d满电也无法服务传感器%d，放弃该请求", uav.id, store.ids[idx])
+                    state.route, state.service = state.route[1:], state.service[1:]
+                    self.requested[idx] = False
+                    self.missed += 1
+                    continue
+                self._go_to_pad(state)
+                return
+            service = float(state.service[0])
+            state.route, state.service = state.route[1:], state.service[1:]
+            state.target = idx
+            uav.curr_E -= move_cost * distance
+            network.stats.add_energy(uav.id, 'mission', move_cost * distance)
+            # 到达并悬停充电完毕时触发事件
+            self.anchors[state.index] = self.waypoints[idx]
+            self.free_time[state.index] = now + distance / uav.vel + service
+            network.event_queue.push(self.free_time[state.index], EventType.UAV_ARRIVAL,
+                                     (state.index, ARRIVE_SENSOR))
+            return
+
+    def _go_to_pad(self, state):
+        """空闲无人机飞往离当前位置最近的充电桩充满电"""
+        network = self.network
+        uav = state.uav
+        pad, distance = network.pads.nearest_pad(self.anchors[state.index])
+        flight = uav.P_mov / uav.vel * distance
+        uav.curr_E -= flight
+        # 飞行与充电合并为一个事件：到达后充满电的时刻
+        charge_time = (uav.max_E - uav.curr_E) / network.params.PAD_CHARGE_POWER
+        network.stats.add_energy(uav.id, 'mission', flight)
+        network.stats.add_energy(uav.id, 'recharge', uav.max_E - uav.curr_E)
+        uav.E_recharged += uav.max_E - uav.curr_E
+        uav.pad_stop += charge_time
+        state.pad = pad
+        self.anchors[state.index] = network.pads.positions[pad]
+        self.free_time[state.index] = network.system_time + distance / uav.vel + charge_time
+        network.event_queue.push(self.free_time[state.index], EventType.UAV_ARRIVAL, (state.index, ARRIVE_PAD))
+
+    def on_arrival(self, event):
+        """无人机在传感器处悬停充电完毕，或在充电桩充满电"""
+        uav_index, kind = event.payload
+        state = self.states[uav_index]
+        uav = state.uav
+        network = self.network
+        now = network.system_time
+        uav.pos = tuple(self.anchors[uav_index])
+        if kind == ARRIVE_PAD:
+            uav.curr_E = uav.max_E
+            state.pad = None
+            recorder.record(now, 'uav_recharge', uav=uav.id, energy=uav.curr_E)
+            self._start_next(state)
+            self.dispatch()
+            return
+
+        idx = state.target
+        store = network.sensor_array
+        if store.is_active[idx]:
+            # 按实际缺口结算（出发时按当时的缺口估计了悬停时长）
+            hover_time = self._service_time(uav, idx)
+            hover_energy = network._calculate_hover_energy(uav, hover_time)
+            energy = float(network._calculate_charging_energies(uav, np.array([idx]))[0] + hover_energy)
+            uav.curr_E -= energy
+            uav.node_stop += hover_time
+            network.stats.add_energy(uav.id, 'mission', energy)
+            network.stats.add_energy(uav.id, 'hover', hover_energy)
+            with network.stats.timer('collection', uav.id, 1):
+                store.charge([idx])
+                network.data_buffer.collect([idx])
+            self.served += 1
+            recorder.record(now, 'sensor_charged', uav=uav.id, sensor=int(store.ids[idx]), energy=uav.curr_E)
+            # 充电后旧的请求和越过阈值事件失效，重新预测
+            self.version[idx] += 1
+            self.requested[idx] = False
+            when = self._request_times(now, np.array([idx]))[0]
+            if np.isfinite(when):
+                self._push_crossing(when, idx)
+            network._schedule_depletion()
+        else:
+            self.missed += 1  # 无人机到达前传感器已耗尽
+        state.target = None
+        self._start_next(state)
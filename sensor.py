@@ -1,19 +1,35 @@
 from __future__ import annotations
-from queue import PriorityQueue
 import numpy as np
 import enum
 import math
+from typing import List
 from utils import *
 
+DEPLETION_EPS = 1e-9  # 剩余能量低于电池容量的该比例即视为耗尽（吸收浮点误差）
+
 class NodeType(enum.Enum):
     BS = 0   # 基站
     SN = 1   # 传感器节点
     RN = 2   # 中继节点
 
-class Node():
+class NodeBase():
+    """节点的公共接口（id、position），不带实例存储"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return str((self.id, self.position))
+
+    def __str__(self):
+        return str((self.id, self.position))
+
+
+class Node(NodeBase):
     """Node.
     """
 
+    __slots__ = ('position', 'id', 'adj', 'is_active', 'type')
+
     def __init__(self, position, _id, _type=NodeType.SN, is_active=True):
         self.position = position
         self.id = _id
@@ -21,34 +37,92 @@ class Node():
         self.is_active = is_active
         self.type = _type
 
-    def __repr__(self):
-        return str((self.id, self.position))
 
-    def __str__(self):
-        return str((self.id, self.position))
 
-
-
-class Sensor(Node):
+class Sensor(NodeBase):
     """Sensor.
+    传感器是SensorArray中一行的视图，属性读写直接作用于列数组，
+    只保存列存储和行号（不继承Node的各属性槽）
     """
 
-    def __init__(self, position, battery_cap, _id, **kwargs):
+    __slots__ = ('store', 'index')
+    type = NodeType.SN
+
+    def __init__(self, position, battery_cap, _id, is_active=True):
+        # 单独创建的传感器拥有只有一行的列存储
+        self.store = SensorArray.from_columns([_id], [position], [battery_cap], is_active=[is_active])
+        self.index = 0
+
+    @classmethod
+    def view(cls, store, index):
+        """创建指向store第index行的传感器视图"""
+        sensor = cls.__new__(cls)
+        sensor.store = store
+        sensor.index = index
+        return sensor
+
+    def __eq__(self, other):
+        return isinstance(other, Sensor) and self.store is other.store and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.store), self.index))
+
+    @property
+    def id(self):
+        return int(self.store.ids[self.index])
+
+    @id.setter
+    def id(self, value):
+        self.store.ids[self.index] = value
+
+    @property
+    def position(self):
+        return Point(*self.store.positions[self.index].tolist())
+
+    @position.setter
+    def position(self, value):
+        self.store.positions[self.index] = value
+
+    @property
+    def battery_cap(self):
         # 传感器最大容量
-        self.battery_cap = battery_cap
+        return float(self.store.battery_cap[self.index])
+
+    @battery_cap.setter
+    def battery_cap(self, value):
+        self.store.battery_cap[self.index] = value
+
+    @property
+    def cur_energy(self):
         # 剩余能量
-        self.cur_energy = battery_cap
+        return float(self.store.cur_energy[self.index])
+
+    @cur_energy.setter
+    def cur_energy(self, value):
+        self.store.cur_energy[self.index] = value
 
-        super(Sensor, self).__init__(position, _id,
-                                     NodeType.SN, **kwargs)
+    @property
+    def energy_consumption_rate(self):
+        return float(self.store.energy_consumption_rate[self.index])
+
+    @energy_consumption_rate.setter
+    def energy_consumption_rate(self, value):
+        self.store.energy_consumption_rate[self.index] = value
+
+    @property
+    def is_active(self):
+        return bool(self.store.is_active[self.index])
+
+    @is_active.setter
+    def is_active(self, value):
+        self.store.is_active[self.index] = value
 
     def get_state(self):
-        return np.array([self.position.x,
-                         self.position.y,
-                         self.position.z,
-                         self.battery_cap,
-                         self.cur_energy,
-                         self.consumedEnergy,
+        store, idx = self.store, self.index
+        return np.array([*store.positions[idx],
+                         store.battery_cap[idx],
+                         store.cur_energy[idx],
+                         store.battery_cap[idx] - store.cur_energy[idx],
                          ],
                         dtype=np.float32)
 
@@ -56,7 +130,6 @@ class Sensor(Node):
         """reset.
         """
         self.cur_energy = self.battery_cap
-        self.ecr = None
         self.activate()
 
     def deactivate(self):
@@ -67,4 +140,377 @@ class Sensor(Node):
     def activate(self):
         """activate.
         """
-        self.is_active = True
\ No newline at end of file
+        self.is_active = True
+
+
+class SensorArray():
+    """传感器列存储
+    位置、电池容量、剩余能量、能耗速率和激活状态保存在连续的NumPy数组中，
+    全网统计、状态向量和批量充电都是单次向量运算
+    """
+
+    def __init__(self, n=0):
+        self.ids = np.zeros(n, dtype=np.int64)
+        self.positions = np.zeros((n, 3), dtype=np.float64)
+        self.battery_cap = np.zeros(n, dtype=np.float64)
+        self.cur_energy = np.zeros(n, dtype=np.float64)
+        self.energy_consumption_rate = np.zeros(n, dtype=np.float64)
+        self.is_active = np.ones(n, dtype=bool)
+
+    @classmethod
+    def wrap(cls, ids, positions, battery_cap, energy_consumption_rate):
+        """
+        直接使用给定的ID、坐标和能耗速率数组（如只读内存映射）作为列，不复制；
+        只为电池容量、剩余能量和激活状态分配新列。dtype不同的列才转换
+        """
+        store = cls()
+        store.ids = np.asarray(ids, dtype=np.int64)
+        store.positions = np.asarray(positions, dtype=np.float64).reshape(len(store.ids), 3)
+        store.energy_consumption_rate = np.asarray(energy_consumption_rate, dtype=np.float64)
+        n = len(store.ids)
+        store.battery_cap = np.full(n, battery_cap, dtype=np.float64)
+        store.cur_energy = store.battery_cap.copy()
+        store.is_active = np.ones(n, dtype=bool)
+        return store
+
+    @classmethod
+    def from_columns(cls, ids, positions, battery_cap, energy_consumption_rate=0.0, is_active=True):
+        """由各列数据创建，剩余能量初始化为电池容量"""
+        n = len(ids)
+        store = cls(n)
+        store.ids[:] = ids
+        store.positions[:] = np.asarray(positions, dtype=np.float64).reshape(n, 3)
+        store.battery_cap[:] = battery_cap
+        store.cur_energy[:] = store.battery_cap
+        store.energy_consumption_rate[:] = energy_consumption_rate
+        store.is_active[:] = is_active
+        return store
+
+    def __len__(self):
+        return len(self.ids)
+
+    def copy(self):
+        """深拷贝各列，得到可独立修改的传感器数据；只读的列（如内存映射的ID和坐标）不会被修改，直接共用"""
+        store = SensorArray()
+        for name in ('ids', 'positions', 'battery_cap', 'cur_energy', 'energy_consumption_rate', 'is_active'):
+            column = getattr(self, name)
+            setattr(store, name, column.copy() if column.flags.writeable else column)
+        return store
+
+    def __getitem__(self, index) -> Sensor:
+        return Sensor.view(self, int(index))
+
+    def views(self) -> SensorViews:
+        return SensorViews(self)
+
+    @property
+    def nbytes(self):
+        return sum(col.nbytes for col in (self.ids, self.positions, self.battery_cap, self.cur_energy,
+                                          self.energy_consumption_rate, self.is_active))
+
+    def active_count(self):
+        return int(np.count_nonzero(self.is_active))
+
+    def get_state(self):
+        """所有传感器的状态矩阵(n, 6)：x, y, z, 电池容量, 剩余能量, 已消耗能量"""
+        state = np.empty((len(self), 6), dtype=np.float32)
+        state[:, :3] = self.positions
+        state[:, 3] = self.battery_cap
+        state[:, 4] = self.cur_energy
+        state[:, 5] = self.battery_cap - self.cur_energy
+        return state
+
+    def charge(self, indices=None):
+        """把指定传感器（默认全部）充满"""
+        if indices is None:
+            self.cur_energy[:] = self.battery_cap
+        else:
+            self.cur_energy[indices] = self.battery_cap[indices]
+
+    def reset(self):
+        self.charge()
+        self.is_active[:] = True
+
+    def drain(self, elapsed):
+        """
+        按能耗速率消耗活跃传感器的能量（一次数组运算）
+        能量降到0的传感器被停用
+
+        Args:
+            elapsed: 经过的时间，单位与energy_consumption_rate的时间单位一致
+
+        Returns:
+            np.ndarray: 本次耗尽的传感器下标
+        """
+        if elapsed <= 0:
+            return np.empty(0, dtype=np.int64)
+        active = self.is_active
+        self.cur_energy -= np.where(active, self.energy_consumption_rate * elapsed, 0.0)
+        depleted = np.flatnonzero(active & (self.cur_energy <= DEPLETION_EPS * self.battery_cap))
+        self.cur_energy[depleted] = 0.0
+        self.is_active[depleted] = False
+        return depleted
+
+    def time_to_depletion(self):
+        """
+        预测最早耗尽的传感器（向量化argmin）
+
+        Returns:
+            (下标, 剩余时间)，没有会耗尽的活跃传感器时返回(-1, inf)
+        """
+        rate = np.where(self.is_active, self.energy_consumption_rate, 0.0)
+        remaining = np.full(len(rate), np.inf)
+        np.divide(self.cur_energy, rate, out=remaining, where=rate > 0)
+        if len(remaining) == 0:
+            return -1, math.inf
+        idx = int(np.argmin(remaining))
+        if not np.isfinite(remaining[idx]):
+            return -1, math.inf
+        return idx, float(remaining[idx])
+
+
+class SensorViews():
+    """SensorArray各行的Sensor视图序列，按下标访问或迭代时才创建视图，不为每个传感器预先建对象"""
+
+    __slots__ = ('store',)
+
+    def __init__(self, store: SensorArray):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, index):
+        n = len(self.store)
+        if isinstance(index, slice):
+            return [Sensor.view(self.store, idx) for idx in range(*index.indices(n))]
+        index = int(index)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("传感器下标超出范围")
+        return Sensor.view(self.store, index)
+
+    def __iter__(self):
+        store = self.store
+        return (Sensor.view(store, idx) for idx in range(len(store)))
+
+
+class SensorDataBuffer():
+    """传感器数据环形缓冲区
+    每个传感器一行定长缓冲，保存尚未被无人机收集的数据包的生成时刻；
+    写满后新数据覆盖最早的数据并计为丢失。收集只把计数清零，与缓冲中的数据量无关
+    """
+
+    def __init__(self, n=0, capacity=16):
+        self.capacity = capacity
+        self.stamps = np.zeros((n, capacity), dtype=np.float32)  # 数据包生成时刻
+        self.head = np.zeros(n, dtype=np.int64)   # 最早的数据包所在位置
+        self.count = np.zeros(n, dtype=np.int64)  # 缓冲中的数据包数
+        self.buffered = 0   # 全部缓冲中的数据包数
+        self.collected = 0  # 累计被无人机收集的数据包数
+        self.lost = 0       # 累计因缓冲区满而丢失的数据包数
+
+    def __len__(self):
+        return len(self.count)
+
+    @property
+    def nbytes(self):
+        return self.stamps.nbytes + self.head.nbytes + self.count.nbytes
+
+    def generate(self, times, active):
+        """
+        活跃传感器各生成一组数据包（所有传感器按相同的时刻生成，逐时刻做一次数组写入）
+
+        Args:
+            times: 各数据包的生成时刻（升序）
+            active: 布尔数组，只有活跃的传感器生成数据
+        """
+        rows = np.flatnonzero(active)
+        k = len(times)
+        if k == 0 or len(rows) == 0:
+            return
+        if k > self.capacity:
+            # 只有最后capacity个数据包能留在缓冲中
+            self.lost += (k - self.capacity) * len(rows)
+            times = times[k - self.capacity:]
+            k = self.capacity
+        head, count = self.head[rows], self.count[rows]
+        for j, when in enumerate(times):
+            self.stamps[rows, (head + count + j) % self.capacity] = when
+        overflow = np.maximum(count + k - self.capacity, 0)
+        self.head[rows] = (head + overflow) % self.capacity
+        self.count[rows] = count + k - overflow
+        lost = int(overflow.sum())
+        self.lost += lost
+        self.buffered += k * len(rows) - lost
+
+    def collect(self, indices) -> int:
+        """无人机取走指定传感器缓冲中的全部数据，返回数据包数"""
+        taken = int(self.count[indices].sum())
+        self.count[indices] = 0
+        self.buffered -= taken
+        self.collected += taken
+        return taken
+
+    def pending(self, idx) -> np.ndarray:
+        """传感器缓冲中的数据包生成时刻，从早到晚"""
+        return self.stamps[idx, (self.head[idx] + np.arange(self.count[idx])) % self.capacity]
+
+
+# 二进制传感器数据格式：64字节文件头 + 定宽列
+#   文件头: 魔数(8字节) 版本(uint32) 保留(uint32) 传感器数量(uint64) 填充
+#   列: ids int64[n] | positions float64[n, 3] | 能耗速率 float64[n]
+#   列的类型与SensorArray相同，加载时直接把内存映射作为列使用，不复制
+SENSOR_BIN_MAGIC = b'WRSNSENS'
+SENSOR_BIN_VERSION = 1
+SENSOR_BIN_SUFFIX = '.bin'
+_BIN_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('reserved', '<u4'), ('count', '<u8'),
+                        ('pad', 'V40')])
+
+
+def _binary_layout(n):
+    """各列的(偏移, dtype, 形状)"""
+    layout, offset = {}, _BIN_HEADER.itemsize
+    for name, dtype, shape in (('ids', '<i8', (n,)), ('positions', '<f8', (n, 3)),
+                               ('energy_consumption_rate', '<f8', (n,))):
+        layout[name] = (offset, np.dtype(dtype), shape)
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return layout, offset
+
+
+def create_sensor_binary(path, n):
+    """
+    创建可容纳n个传感器的二进制文件，返回可写的列映射，便于分块写入
+
+    Returns:
+        dict: 列名 -> 可写np.memmap（ids, positions, energy_consumption_rate）
+    """
+    layout, size = _binary_layout(n)
+    header = np.zeros(1, dtype=_BIN_HEADER)
+    header['magic'] = SENSOR_BIN_MAGIC
+    header['version'] = SENSOR_BIN_VERSION
+    header['count'] = n
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        f.truncate(size)
+    if n == 0:
+        return {name: np.empty(shape, dtype=dtype) for name, (offset, dtype, shape) in layout.items()}
+    return {name: np.memmap(path, dtype=dtype, mode='r+', offset=offset, shape=shape)
+            for name, (offset, dtype, shape) in layout.items()}
+
+
+def save_sensor_binary(path, ids, positions, energy_consumption_rate):
+    """把传感器数据按列写成二进制文件"""
+    n = len(ids)
+    columns = create_sensor_binary(path, n)
+    columns['ids'][:] = ids
+    columns['positions'][:] = np.asarray(positions).reshape(n, 3)
+    columns['energy_consumption_rate'][:] = energy_consumption_rate
+    for column in columns.values():
+        if isinstance(column, np.memmap):
+            column.flush()
+
+
+def load_sensor_binary(path):
+    """
+    以内存映射方式打开二进制传感器数据，不做任何解析
+
+    Returns:
+        dict: 列名 -> 只读np.memmap（ids, positions, energy_consumption_rate）
+    """
+    header = np.fromfile(path, dtype=_BIN_HEADER, count=1)
+    if len(header) == 0 or header['magic'][0] != SENSOR_BIN_MAGIC:
+        raise ValueError(f"{path}不是传感器二进制数据文件")
+    if header['version'][0] != SENSOR_BIN_VERSION:
+        raise ValueError(f"不支持的传感器数据版本：{header['version'][0]}")
+    n = int(header['count'][0])
+    layout, _ = _binary_layout(n)
+    if n == 0:  # 空文件无法映射
+        return {name: np.empty(shape, dtype=dtype) for name, (offset, dtype, shape) in layout.items()}
+    return {name: np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+            for name, (offset, dtype, shape) in layout.items()}
+
+
+def sensor_positions(sensors) -> np.ndarray:
+    """批量获取传感器坐标(n, 3)，同一列存储中的传感器直接按下标取"""
+    if not sensors:
+        return np.empty((0, 3), dtype=np.float64)
+    if isinstance(sensors, SensorViews):
+        return sensors.store.positions.astype(np.float64)
+    store = sensors[0].store
+    if all(s.store is store for s in sensors):
+        return store.positions[[s.index for s in sensors]]
+    return np.array([s.position for s in sensors], dtype=np.float64)
+
+
+class SensorRegistry():
+    """传感器索引表
+    传感器ID→下标 在按ID排序的数组上二分查找（np.searchsorted，可一次查询一组ID），
+    无人机ID→负责传感器 保存为下标数组，不为每个传感器建立字典项或对象
+    """
+
+    def __init__(self, store: SensorArray):
+        self.sensors = store.views()
+        ids = store.ids
+        if len(ids) < 2 or bool(np.all(ids[1:] > ids[:-1])):
+            self._order = None  # ID已升序排列（数据文件的通常情况），不需要排序
+            self._sorted_ids = ids
+        else:
+            self._order = np.argsort(ids, kind='stable')
+            self._sorted_ids = ids[self._order]
+        self.uav_indices = {}  # 无人机ID -> 负责的传感器下标（升序数组）
+
+    def __len__(self):
+        return len(self.sensors)
+
+    def __contains__(self, sensor_id):
+        return self.index_of(sensor_id) >= 0
+
+    def index_of(self, sensor_ids):
+        """
+        传感器ID对应的下标，不存在的ID为-1
+
+        Args:
+            sensor_ids: 单个ID或ID数组
+
+        Returns:
+            单个ID时为int，否则为np.ndarray
+        """
+        query = np.asarray(sensor_ids)
+        if query.dtype.kind not in 'iu':
+            query = query.astype(np.int64)
+        sorted_ids = self._sorted_ids
+        if len(sorted_ids) == 0:
+            found = np.full(query.shape, -1, dtype=np.int64)
+        else:
+            pos = np.minimum(np.searchsorted(sorted_ids, query), len(sorted_ids) - 1)
+            hit = sorted_ids[pos] == query
+            if self._order is not None:
+                pos = self._order[pos]
+            found = np.where(hit, pos, -1)
+        return int(found) if found.ndim == 0 else found
+
+    def get(self, sensor_id, default=None):
+        idx = self.index_of(sensor_id)
+        return self.sensors[idx] if idx >= 0 else default
+
+    def assign(self, uav_id, sensor_ids):
+        indices = self.index_of(np.asarray(sensor_ids, dtype=np.int64).reshape(-1))
+        self.uav_indices[uav_id] = np.unique(indices[indices >= 0])
+
+    def assigned_indices(self, uav_id, active=None):
+        """无人机负责的传感器下标，提供active（布尔数组）时只保留活跃的"""
+        indices = self.uav_indices.get(uav_id, np.empty(0, dtype=np.int64))
+        if active is not None:
+            indices = indices[active[indices]]
+        return indices
+
+    def assigned_ids(self, uav_id):
+        return set(self.sensors.store.ids[self.assigned_indices(uav_id)].tolist())
+
+    def assigned_sensors(self, uav_id, active_only=True):
+        """返回无人机负责的传感器（保持传感器列表中的原始顺序）"""
+        store = self.sensors.store
+        indices = self.assigned_indices(uav_id, store.is_active if active_only else None)
+        return [self.sensors[idx] for idx in indices]
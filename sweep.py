@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+参数扫描
+把YAML扫描设计（见config.py）展开为InputParameter的各组取值，在进程池中并行运行，
+每次运行的结果按 (参数, 随机种子, 传感器数据, 充电桩数据, 规划器, 代码版本) 的哈希缓存在磁盘上，
+再次运行同一扫描时只计算发生变化的点。
+
+用法:
+    python sweep.py configs/config.yml --workers 8 --out results.csv
+"""
+
+import argparse
+import csv
+import functools
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+import numpy as np
+
+from utils import InputParameter, quiet
+from network import load_sensor_data, SENSOR_DATA_PATH
+from monte_carlo import RunResult, run_seeds, is_planner_factory, _run_one
+from config import DEFAULT_CONFIG_PATH, load_config, expand_design
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(ROOT, '.sweep_cache')
+CODE_PATTERNS = ('*.py', 'utils/*.py', 'Algorithms/*.py')  # 计入代码版本的源文件
+
+# 每个worker进程中共享的传感器数据和规划器模板（每次运行由fresh_planner得到独立的规划器）
+_WORKER_STATE = {}
+
+
+def code_version() -> str:
+    """仿真相关源文件内容的哈希，代码改动后旧的缓存结果自动失效"""
+    digest = hashlib.sha256()
+    for pattern in CODE_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(ROOT, pattern))):
+            digest.update(os.path.relpath(path, ROOT).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def dataset_hash(sensors) -> str:
+    """传感器数据内容的哈希（与文件路径和格式无关）"""
+    digest = hashlib.sha256()
+    for column in (sensors.ids, sensors.positions, sensors.energy_consumption_rate):
+        digest.update(np.ascontiguousarray(column, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _file_hash(path) -> str:
+    if path is None or not os.path.exists(path):
+        return ''
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _planner_key(planner):
+    """规划器的类型和标量配置（工厂函数按其创建的规划器计）"""
+    if planner is None:
+        return None
+    if is_planner_factory(planner):
+        planner = planner()
+    config = {name: value for name, value in sorted(vars(planner).items())
+              if isinstance(value, (bool, int, float, str, type(None)))}
+    return [f"{type(planner).__module__}.{type(planner).__qualname__}", config]
+
+
+def result_key(params: InputParameter, seed: int, dataset: str, code: str, planner=None) -> str:
+    """一次运行的内容地址"""
+    content = {
+        'params': params.to_dict(),
+        'seed': seed,
+        'dataset': dataset,
+        'pads': _file_hash(params.PAD_DATA_PATH),
+        'planner': _planner_key(planner),
+        'code': code,
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache():
+    """按内容地址保存在目录中的运行结果（每个结果一个JSON文件）"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, value: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp, path)  # 原子替换，中断时不会留下不完整的结果
+
+
+def _init_worker(sensors, planner):
+    _WORKER_STATE.update(sensors=sensors, planner=planner)
+
+
+def _run_task(task, state=None):
+    index, params, run, seed = task
+    state = dict(state or _WORKER_STATE, params=params)
+    return index, _run_one(run, seed, state)
+
+
+def run_sweep(points: List[Dict], runs: int = 1, seed: int = 0, workers: int = None, sensors=None,
+              data_path: str = SENSOR_DATA_PATH, planner=None, cache: ResultCache = None,
+              callback=None) -> List[Dict]:
+    """
+    运行扫描
+
+    Args:
+        points: 各扫描点的参数覆盖值（expand_design的结果）
+        runs: 每个点的重复次数，各点使用同一组随机种子
+        seed: 主随机种子
+        workers: 进程数，None为CPU核数，0或1在当前进程中串行运行
+        sensors: 预先加载的SensorArray，None时从data_path加载一次
+        planner: 路径规划器（每次运行使用其深拷贝）、规划器类或无参工厂函数，None使用默认规划器
+        cache: 结果缓存，None时不读写缓存
+        callback: 每完成一次运行（含命中缓存）时调用callback(row)
+
+    Returns:
+        List[Dict]: 按扫描点和重复次数排列的结果行，包含参数覆盖值、RunResult各字段和cached
+    """
+    if sensors is None:
+        with quiet():
+            sensors = load_sensor_data(InputParameter.SENSOR_POWER, data_path)
+    dataset, code = dataset_hash(sensors), code_version()
+    seeds = run_seeds(runs, seed)
+
+    rows, keys, tasks = [], [], []
+    for values in points:
+        params = InputParameter.from_dict(values)
+        for run, run_seed in enumerate(seeds):
+            key = result_key(params, run_seed, dataset, code, planner)
+            cached = cache.get(key) if cache is not None else None
+            rows.append(None if cached is None else dict(values, **cached, cached=True))
+            keys.append(key)
+            if cached is None:
+                tasks.append((len(rows) - 1, params, run, run_seed))
+            elif callback is not None:
+                callback(rows[-1])
+
+    def finish(index, result: RunResult):
+        if cache is not None:
+            cache.put(keys[index], result._asdict())
+        rows[index] = dict(points[index // runs], **result._asdict(), cached=False)
+        if callback is not None:
+            callback(rows[index])
+
+    if workers is not None and workers <= 1:
+        state = dict(sensors=sensors, planner=planner)
+        for task in tasks:
+            finish(*_run_task(task, state))
+        return rows
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(sensors, planner)) as executor:
+            futures = [executor.submit(_run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                finish(*future.result())
+    return rows
+
+
+def write_csv(rows: List[Dict], path: str):
+    """结果行写为CSV，列为各行键的并集"""
+    columns = []
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WRSNNetwork参数扫描')
+    parser.add_argument('config', nargs='?', default=DEFAULT_CONFIG_PATH, help='YAML扫描设计')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认CPU核数')
+    parser.add_argument('--out', help='把结果写入该CSV文件')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='结果缓存目录')
+    parser.add_argument('--no-cache', action='store_true', help='不读写结果缓存')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    points = expand_design(config)
+    runs = int(config.get('runs', 1))
+    total = len(points) * runs
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    done = [0, 0]
+
+    def progress(row):
+        done[0] += 1
+        done[1] += row['cached']
+        if done[0] % max(1, total // 10) == 0 or done[0] == total:
+            print(f"已完成 {done[0]}/{total}（其中{done[1]}个来自缓存）")
+
+    rows = run_sweep(points, runs=runs, seed=int(config.get('run_seed', 0)), workers=args.workers,
+                     data_path=config.get('data_path', SENSOR_DATA_PATH), cache=cache, callback=progress)
+
+    names = list(config.get('parameters') or {})
+    print("\n=== 参数扫描结果 ===")
+    for row in rows:
+        values = '，'.join(f"{name}={row[name]}" for name in names)
+        print(f"{values}：寿命 {row['lifetime']:.2f}秒，周期数 {row['cycle_num']}，终止原因 {row['termination_reason']}")
+    if args.out:
+        write_csv(rows, args.out)
+        print(f"已写入 {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def _run_in_root(monkeypatch):
+    # 数据文件路径（./data/sensor_data.txt）相对于项目根目录
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,29 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location('bench_scaling', os.path.join(ROOT, 'benchmarks', 'bench_scaling.py'))
+bench_scaling = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_scaling)
+
+
+def scenario(sensors, seconds, alloc):
+    return {'sensors': sensors, 'stages': {'plan': {'time': seconds, 'peak_rss': 0, 'alloc_peak': alloc}}}
+
+
+def test_compare_flags_slow_stages_and_unknown_sizes():
+    baseline = {'results': [scenario(50, 1.0, 1000)]}
+    assert bench_scaling.compare([scenario(50, 1.2, 1100)], baseline) == []
+    assert len(bench_scaling.compare([scenario(50, 2.0, 1000)], baseline)) == 1
+    assert len(bench_scaling.compare([scenario(50, 1.0, 2000)], baseline)) == 1
+    assert len(bench_scaling.compare([scenario(1000, 1.0, 1000)], baseline)) == 1
+
+
+def test_missing_baseline_fails_the_check(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, 'argv', ['bench_scaling.py', '--sizes', '50', '--baseline', str(tmp_path / 'none.json')])
+    with pytest.raises(SystemExit) as exc:
+        bench_scaling.main()
+    assert exc.value.code != 0
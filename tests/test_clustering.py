@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+from Algorithms.clustering import balanced_kmeans, balanced_sizes, capacitated_assign, sweep_partition
+from network import WRSNNetwork
+from utils import quiet
+
+
+def blobs(sizes, seed=0):
+    """在四个角附近生成分离良好的传感器簇，返回坐标和真实簇号"""
+    rng = np.random.default_rng(seed)
+    corners = np.array([[20.0, 20.0], [180.0, 20.0], [20.0, 80.0], [180.0, 80.0]])
+    points = np.vstack([corners[c] + rng.normal(0, 3, size=(m, 2)) for c, m in enumerate(sizes)])
+    return points, np.repeat(np.arange(len(sizes)), sizes)
+
+
+def same_partition(a, b):
+    return len(set(zip(a.tolist(), b.tolist()))) == len(set(a.tolist())) == len(set(b.tolist()))
+
+
+def test_sizes_and_sweep_sectors():
+    assert balanced_sizes(10, 3).tolist() == [4, 3, 3]
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 100, size=(101, 2))
+    labels = sweep_partition(points, (50, 50), 4)
+    assert np.bincount(labels).tolist() == balanced_sizes(101, 4).tolist()
+    # 每个扇形在极角上是连续的一段（按极角排序后，分区号只变化k次）
+    angles = np.arctan2(points[:, 1] - 50, points[:, 0] - 50)
+    cyclic = labels[np.argsort(angles)]
+    assert np.count_nonzero(cyclic != np.roll(cyclic, 1)) == 4
+
+
+def test_capacitated_assign_respects_sizes():
+    rng = np.random.default_rng(2)
+    cost = rng.uniform(size=(50, 3))
+    cost[:, 0] -= 1.0  # 所有点都偏好第0簇
+    sizes = np.array([20, 20, 10])
+    labels = capacitated_assign(cost, sizes)
+    assert np.bincount(labels, minlength=3).tolist() == sizes.tolist()
+
+    # 两个簇时，留在偏好簇中的是移出代价最大的点
+    cost = cost[:, :2]
+    labels = capacitated_assign(cost, np.array([20, 30]))
+    delta = cost[:, 1] - cost[:, 0]
+    assert sorted(np.flatnonzero(labels == 0).tolist()) == sorted(np.argsort(delta)[-20:].tolist())
+
+
+def test_balanced_kmeans_recovers_equal_clusters():
+    points, truth = blobs([25, 25, 25, 25])
+    assert same_partition(balanced_kmeans(points, 4), truth)
+    labels = balanced_kmeans(points, 4, sample_size=30)  # 在样本上求质心
+    assert same_partition(labels, truth)
+
+    points, _ = blobs([40, 10, 30, 21])
+    labels = balanced_kmeans(points, 4)
+    assert sorted(np.bincount(labels).tolist()) == sorted(balanced_sizes(101, 4).tolist())
+
+
+def test_network_assignment_methods():
+    def assign(method, seed):
+        random.seed(seed)
+        with quiet():
+            network = WRSNNetwork()
+            network._assign_sensors_to_uavs(method)
+        return network.uav_sensor_assignments
+
+    all_ids = sorted(sid for group in assign('random', 0).values() for sid in group)
+    for method in ('sweep', 'kmeans'):
+        groups = assign(method, 0)
+        assert sorted(sid for group in groups.values() for sid in group) == all_ids
+        assert [len(g) for g in groups.values()] == [len(g) for g in assign('random', 0).values()]
+        assert groups == assign(method, 1)  # 与随机种子无关
+    assert assign(None, 0) == assign('random', 0) != assign('random', 1)  # 默认仍为随机分配
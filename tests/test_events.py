@@ -0,0 +1,41 @@
+from utils.events import EventQueue, EventType
+
+
+def test_events_pop_by_time_then_push_order():
+    queue = EventQueue()
+    queue.push(5.0, EventType.MISSION_END, 'c')
+    queue.push(1.0, EventType.MISSION_END, 'a')
+    queue.push(5.0, EventType.CYCLE_START, 'd')
+    queue.push(1.0, EventType.CYCLE_START, 'b')
+    assert queue.peek().payload == 'a'
+    assert [queue.pop().payload for _ in range(len(queue))] == ['a', 'b', 'c', 'd']
+    assert not queue
+
+
+def test_cancelled_events_are_skipped_and_compacted():
+    queue = EventQueue()
+    events = [queue.push(float(t), EventType.SENSOR_DEPLETION, t) for t in range(6)]
+    queue.cancel(events[0])
+    queue.cancel(events[3])
+    assert len(queue) == 4
+    assert events[3] not in queue and events[4] in queue
+    assert queue.find(events[3].seq) is None and queue.find(events[4].seq) is events[4]
+    assert queue.peek() is events[1]
+    queue.cancel(events[5])
+    queue.cancel(events[2])  # 超过一半时重建堆
+    assert len(queue._heap) == len(queue) == 2
+    assert [queue.pop().payload for _ in range(len(queue))] == [1, 4]
+    assert not queue
+
+
+def test_arrays_round_trip_without_cancelled_events():
+    queue = EventQueue()
+    queue.push(2.0, EventType.MISSION_START, (3, 1))
+    stale = queue.push(1.0, EventType.SENSOR_DEPLETION, 7)
+    queue.push(4.0, EventType.CYCLE_START)
+    queue.cancel(stale)
+    arrays = queue.to_arrays()
+    assert arrays['seq'].tolist() == [0, 2]
+    restored = EventQueue.from_arrays(arrays)
+    assert [restored.pop() for _ in range(2)] == [queue.pop() for _ in range(2)]
+    assert restored.push(9.0, EventType.CYCLE_START).seq == 3
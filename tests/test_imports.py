@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_network_is_quiet_and_does_not_load_torch():
+    code = "import sys, network; print(sorted(m for m in ('torch',) if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout == "[]\n"
+
+
+def test_device_is_resolved_on_first_use(monkeypatch):
+    import utils
+    from utils import utils as _utils
+
+    fake = types.SimpleNamespace(cuda=types.SimpleNamespace(is_available=lambda: False),
+                                 device=lambda name: types.SimpleNamespace(type=name))
+    monkeypatch.setitem(sys.modules, 'torch', fake)
+    _utils.get_device.cache_clear()
+    try:
+        assert utils.device_str == 'cpu'
+        assert _utils.device is _utils.get_device()
+    finally:
+        _utils.get_device.cache_clear()
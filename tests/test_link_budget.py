@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from Algorithms.test import get_waypoint
+from network import WRSNNetwork
+from uav import UAV
+from utils import (computeChargingTime, computeDataTransmissionEnergy, dB2dec, dBm2dec, dec2dB,
+                   getAchievableRate, getPathLoss, quiet)
+
+DISTANCES = [0.5, 1.0, 2.0, 7.5, 30.0]
+
+
+def test_array_kernels_match_the_scalar_versions():
+    d = np.array(DISTANCES)
+    for kernel, args in ((getPathLoss, d), (dec2dB, d), (dB2dec, -d), (dBm2dec, -d),
+                         (getAchievableRate, getPathLoss(d)), (computeDataTransmissionEnergy, d)):
+        batch = kernel(args)
+        assert isinstance(batch, np.ndarray)
+        assert np.allclose(batch, [kernel(float(x)) for x in args], rtol=1e-12, atol=0)
+    assert np.allclose(getPathLoss(DISTANCES), getPathLoss(d))
+
+
+def test_charging_time_matches_uav_formula():
+    uav = UAV(10, 1e6, (0, 0, 0))
+    deficits = np.array([0.0, -5.0, 1.0, 250.0])
+    times = computeChargingTime(deficits, 1.0, uav.P_tra, uav.E_η)
+    expected = [uav.computeDataTransTime(1.0, e) if e > 0 else 0.0 for e in deficits]
+    assert np.allclose(times, expected, rtol=1e-12, atol=0)
+    assert computeChargingTime(250.0, 1.0, uav.P_tra, uav.E_η) == expected[-1]
+
+
+def test_batch_mission_energy_matches_the_per_sensor_loop():
+    random.seed(0)
+    with quiet():
+        network = WRSNNetwork()
+        network._assign_sensors_to_uavs()
+    uav = network.uavs[0]
+    uav.computePower()
+    path = network.registry.assigned_sensors(uav.id)
+    for k, sensor in enumerate(path):
+        sensor.cur_energy = sensor.battery_cap - k % 3  # 部分传感器需要充电
+    indices = np.array([s.index for s in path])
+
+    hover = network._calculate_hover_times(uav, indices)
+    assert np.allclose(hover, [network._calculate_hover_time(uav, s) for s in path], rtol=1e-12)
+    charging = network._calculate_charging_energies(uav, indices)
+    assert np.allclose(charging, [network._calculate_charging_energy(uav, s) for s in path], rtol=1e-12)
+
+    position, loop = uav.pos, 0.0
+    for sensor in path:
+        waypoint = get_waypoint(sensor)
+        loop += network._calculate_flight_energy(uav, position, waypoint)
+        loop += network._calculate_charging_energy(uav, sensor)
+        loop += network._calculate_hover_energy(uav, network._calculate_hover_time(uav, sensor))
+        position = waypoint
+    loop += network._calculate_flight_energy(uav, position, network.base_station)
+    uav.curr_E = uav.max_E = 1e12  # 一次即可完成，只比较能耗
+    plan = network._split_trips(uav, path)
+    assert len(plan.trips) == 1
+    assert np.isclose(uav.curr_E - plan.final_energy, loop, rtol=1e-12)
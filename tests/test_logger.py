@@ -0,0 +1,35 @@
+import json
+
+from utils import INFO, EventRecorder, logger, quiet
+
+
+def test_recorder_keeps_only_the_most_recent_events(tmp_path):
+    recorder = EventRecorder(capacity=3)
+    recorder.record(0.0, 'cycle_start', 0)
+    assert len(recorder) == 0  # 默认关闭
+
+    recorder.enable()
+    for t in range(5):
+        recorder.record(float(t), 'mission_end' if t % 2 else 'cycle_start', t, uav=1)
+    assert [e.time for e in recorder.events] == [2.0, 3.0, 4.0]
+
+    path = tmp_path / 'events.jsonl'
+    events = recorder.dump(str(path), kind='cycle_start')
+    assert [e['time'] for e in events] == [2.0, 4.0]
+    assert [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] == events
+
+    recorder.enable(capacity=2)
+    assert [e.time for e in recorder.events] == [3.0, 4.0]
+    recorder.disable()
+    recorder.record(9.0, 'cycle_start')
+    assert len(recorder) == 2
+
+
+def test_quiet_silences_text_and_restores_the_level(capsys):
+    logger.setLevel(INFO)
+    with quiet():
+        logger.info("不应输出")
+        logger.error("也不应输出")
+    logger.info("恢复输出")
+    assert capsys.readouterr().out == "恢复输出\n"
+    assert logger.level == INFO
@@ -0,0 +1,67 @@
+import itertools
+
+import numpy as np
+
+from Algorithms.memeticAlgorithm import MemeticSolver, _route_costs, split_population
+
+
+def route_energy(points, depot, node_cost, move_cost, route):
+    """从depot出发依次访问route再返回的能耗"""
+    if len(route) == 0:
+        return 0.0
+    stops = np.vstack([depot, points[route], depot])
+    return move_cost * np.linalg.norm(np.diff(stops, axis=0), axis=1).sum() + node_cost[route].sum()
+
+
+def best_split(points, depot, node_cost, move_cost, tour, uav_num):
+    """枚举所有切分位置，返回最小的最大单机能耗"""
+    n = len(tour)
+    best = np.inf
+    for cuts in itertools.combinations_with_replacement(range(n + 1), uav_num - 1):
+        bounds = (0,) + cuts + (n,)
+        worst = max(route_energy(points, depot, node_cost, move_cost, tour[a:b])
+                    for a, b in zip(bounds[:-1], bounds[1:]))
+        best = min(best, worst)
+    return best
+
+
+def test_split_matches_exhaustive_search():
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 100, size=(8, 3))
+    depot = np.array([0.0, 0.0, 50.0])
+    node_cost = rng.uniform(0, 200, size=8)
+    pop = np.array([rng.permutation(8) for _ in range(5)])
+    A, G = _route_costs(points, depot, node_cost, 2.0, pop)
+    ends, makespan, total = split_population(A, G, 3)
+    for r, tour in enumerate(pop):
+        assert np.isclose(makespan[r], best_split(points, depot, node_cost, 2.0, tour, 3), rtol=1e-9)
+        starts = np.concatenate([[0], ends[r, :-1]])
+        energies = [route_energy(points, depot, node_cost, 2.0, tour[a:b]) for a, b in zip(starts, ends[r])]
+        assert ends[r, -1] == 8
+        assert np.isclose(max(energies), makespan[r])
+        assert np.isclose(sum(energies), total[r])
+
+
+def test_solve_covers_every_point_once_and_accounts_node_cost():
+    rng = np.random.default_rng(2)
+    points = rng.uniform(0, 200, size=(40, 3))
+    depot = np.array([0.0, 0.0, 100.0])
+    node_cost = np.zeros(40)
+    node_cost[:5] = 5000.0  # 少数传感器充电耗能极大，应由各自的无人机分担
+    solver = MemeticSolver(generations=20, time_budget=None, seed=0)
+    routes = solver.solve(points, depot, 4, move_cost=1.0, node_cost=node_cost)
+    assert len(routes) == 4
+    assert sorted(np.concatenate(routes).tolist()) == list(range(40))
+
+    costed = max(route_energy(points, depot, node_cost, 1.0, r) for r in routes)
+    blind = solver.solve(points, depot, 4, move_cost=1.0)
+    assert costed < max(route_energy(points, depot, node_cost, 1.0, r) for r in blind)
+
+
+def test_process_pool_gives_the_serial_result():
+    rng = np.random.default_rng(3)
+    points = rng.uniform(0, 200, size=(30, 3))
+    depot = np.array([0.0, 0.0, 100.0])
+    serial = MemeticSolver(generations=5, time_budget=None, seed=4).solve(points, depot, 3)
+    pooled = MemeticSolver(generations=5, time_budget=None, seed=4, workers=2).solve(points, depot, 3)
+    assert all(np.array_equal(a, b) for a, b in zip(serial, pooled))
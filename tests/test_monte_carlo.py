@@ -0,0 +1,37 @@
+import numpy as np
+
+from Algorithms.test import PathPlanner
+from monte_carlo import RunningStats, fresh_planner, iter_monte_carlo, run_seeds
+
+
+def test_run_seeds_do_not_depend_on_run_count():
+    assert run_seeds(5, 0)[:3] == run_seeds(3, 0)
+    assert len(set(run_seeds(50, 0))) == 50
+    assert run_seeds(3, 0) != run_seeds(3, 1)
+
+
+def test_each_run_gets_its_own_planner():
+    planner = PathPlanner()
+    copied = fresh_planner(planner)
+    assert isinstance(copied, PathPlanner) and copied is not planner
+    assert isinstance(fresh_planner(PathPlanner), PathPlanner)
+    assert isinstance(fresh_planner(lambda: PathPlanner(improve=False)), PathPlanner)
+    assert fresh_planner(None) is None
+
+
+def test_parallel_runs_match_serial_runs():
+    serial = sorted(iter_monte_carlo(2, seed=7, workers=0))
+    parallel = sorted(iter_monte_carlo(2, seed=7, workers=2, batch_size=1))
+    assert serial == parallel
+    assert [r.run for r in serial] == [0, 1]
+    assert all(r.energy_used > 0 and r.lifetime > 0 for r in serial)
+
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(0).normal(5.0, 2.0, size=200)
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+    assert np.isclose(stats.mean, values.mean())
+    assert np.isclose(stats.std, values.std(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
@@ -0,0 +1,105 @@
+import math
+import random
+
+import numpy as np
+
+from utils import EventType, InputParameter, quiet
+from network import WRSNNetwork
+
+
+class BaselineGreedy():
+    """原test.py中的贪心规划：每次选离当前位置（地面坐标）最近的传感器，再飞到其上方1米处"""
+
+    def plan_uav_path(self, uav, sensors, uav_sensor_assignments):
+        assigned = set(uav_sensor_assignments.get(uav.id, []))
+        remaining = [s for s in sensors if s.id in assigned and s.is_active]
+        current, path = tuple(uav.pos), []
+        while remaining:
+            sensor = min(remaining, key=lambda s: math.dist(current, s.position))
+            remaining.remove(sensor)
+            path.append(sensor)
+            x, y, z = sensor.position
+            current = (x, y, z + 1)
+        return path
+
+
+def run_default(params=None, planner=None):
+    """按原main.py的方式运行系统：全局随机种子为0，随机分配传感器"""
+    random.seed(0)
+    with quiet():
+        network = WRSNNetwork(params, planner=planner)
+        network._assign_sensors_to_uavs()
+        lifetime = network.run_system()
+    return network, lifetime
+
+
+def test_default_run_outcome():
+    network, lifetime = run_default()
+    assert lifetime == 10141.0
+    assert network.cycle_num == 169
+    assert network.termination_reason == "无人机电量不足"
+
+
+def test_baseline_greedy_outcome():
+    """与改动前的结果一致（默认规划器加入2-opt/Or-opt后路径更短，运行更久）"""
+    network, lifetime = run_default(planner=BaselineGreedy())
+    assert lifetime == 9061.0
+    assert network.cycle_num == 151
+    assert network.termination_reason == "无人机电量不足"
+
+
+def test_snapshot_round_trip(tmp_path):
+    random.seed(0)
+    with quiet():
+        network = WRSNNetwork()
+        network._assign_sensors_to_uavs()
+        network.run_system(until=3000)
+        network.save_snapshot(str(tmp_path / 'state.npz'))
+        restored = WRSNNetwork.from_snapshot(str(tmp_path / 'state.npz'))
+        forked, = network.fork()
+        lifetime = network.run_system()
+        assert restored.run_system() == forked.run_system() == lifetime == 10141.0
+    assert restored.cycle_num == forked.cycle_num == network.cycle_num
+    assert restored.termination_reason == network.termination_reason
+    assert [u.curr_E for u in restored.uavs] == [u.curr_E for u in network.uavs]
+
+
+def test_superseded_depletion_events_do_not_accumulate():
+    params = InputParameter()
+    params.SENSOR_DRAIN = True
+    random.seed(0)
+    with quiet():
+        network = WRSNNetwork(params)
+        network._assign_sensors_to_uavs()
+        network.run_system(until=3000)
+        snapshot = network.snapshot()
+        # 每次充电都重新预测耗尽时刻，旧的预测被取消，快照中至多一个耗尽事件
+        assert (snapshot['events.type'] == EventType.SENSOR_DEPLETION).sum() <= 1
+        assert len(network.event_queue) <= 2
+        restored = WRSNNetwork.from_snapshot(snapshot)
+        assert restored.run_system() == network.run_system()
+    assert np.array_equal(restored.sensor_array.cur_energy, network.sensor_array.cur_energy)
+
+
+def test_sensor_drain_is_opt_in():
+    network, _ = run_default()
+    store = network.sensor_array
+    assert np.array_equal(store.cur_energy, store.battery_cap)
+    assert store.is_active.all()
+
+    params = InputParameter()
+    params.SENSOR_DRAIN = True
+    network, _ = run_default(params)
+    assert (network.sensor_array.cur_energy < network.sensor_array.battery_cap).any()
+
+
+def test_concurrent_mission_planning_matches_serial():
+    outcomes = []
+    for workers in (1, 4):
+        params = InputParameter()
+        params.MISSION_WORKERS = workers
+        network, lifetime = run_default(params)
+        assert network.mission_workers == workers
+        outcomes.append((lifetime, network.cycle_num, [uav.curr_E for uav in network.uavs]))
+    assert outcomes[0] == outcomes[1]
+    assert outcomes[0][:2] == (10141.0, 169)
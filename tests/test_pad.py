@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+
+from Algorithms.circleGreedy import CircleGreedyPlanner
+from network import WRSNNetwork
+from pad import PadIndex, grid_pads, load_pad_data
+from utils import InputParameter, quiet
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(0)
+    pads = rng.uniform(0, 100, size=(200, 3))
+    points = rng.uniform(-20, 120, size=(500, 3))
+    index, distance = PadIndex(pads).nearest(points)
+
+    brute = np.linalg.norm(points[:, None, :] - pads[None, :, :], axis=2)
+    assert np.allclose(distance, brute.min(axis=1))
+    assert np.allclose(brute[np.arange(len(points)), index], distance)
+
+
+def write_pads(path, positions):
+    path.write_text(''.join(f"{k} {x} {y} {z}\n" for k, (x, y, z) in enumerate(positions, 1)), encoding='utf-8')
+    return str(path)
+
+
+def run(params, planner=None):
+    random.seed(0)
+    with quiet():
+        network = WRSNNetwork(params, planner=planner)
+        network._assign_sensors_to_uavs()
+        lifetime = network.run_system()
+    return network, lifetime
+
+
+def test_pads_do_not_change_single_trip_missions(tmp_path):
+    pads = grid_pads((200, 100), 50.0)
+    assert np.array_equal(load_pad_data(write_pads(tmp_path / 'pads.txt', pads)), pads)
+
+    params = InputParameter()
+    params.PAD_DATA_PATH = str(tmp_path / 'pads.txt')
+    network, lifetime = run(params)
+    assert len(network.pads) == len(pads) + 1
+    assert (lifetime, network.cycle_num) == (10141.0, 169)
+
+
+def test_circle_greedy_visits_every_assigned_sensor_once(tmp_path):
+    params = InputParameter()
+    params.PAD_DATA_PATH = write_pads(tmp_path / 'pads.txt', grid_pads((200, 100), 50.0))
+    params.MULTI_TRIP = True
+    params.SIMULATION_HORIZON = 300
+    planner = CircleGreedyPlanner()
+    random.seed(0)
+    with quiet():
+        network = WRSNNetwork(params, planner=planner)
+        network._assign_sensors_to_uavs()
+    assert planner.pads is network.pads
+    for uav in network.uavs:
+        path = network._plan_uav_path(uav)
+        assert sorted(s.id for s in path) == sorted(network.uav_sensor_assignments[uav.id])
+        plan = network._split_trips(uav, path)
+        assert plan.feasible
+        assert all(0 <= trip[3] < len(network.pads) for trip in plan.trips)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from Algorithms.test import (_Metric, _grid_neighbours, improve_tour, nearest_neighbour_tour, tour_length,
+                             FULL_MATRIX_LIMIT)
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.vstack([rng.uniform(0, [200, 100, 5], size=(n, 3)), [[0.0, 0.0, 100.0]]])
+
+
+def brute_force_tour(points, start):
+    """逐步取最近的未访问点，距离相同时取下标较小者"""
+    visited = np.zeros(len(points), dtype=bool)
+    visited[start] = True
+    current, order = start, []
+    for _ in range(len(points) - 1):
+        sq = ((points - points[current]) ** 2).sum(axis=1)
+        sq[visited] = np.inf
+        current = int(np.argmin(sq))
+        visited[current] = True
+        order.append(current)
+    return np.array(order)
+
+
+def test_improve_tour_keeps_a_permutation_and_never_gets_longer():
+    for n in (5, 60, 300):
+        points = random_points(n, seed=n)
+        metric = _Metric(points)
+        tour = np.concatenate([[n], nearest_neighbour_tour(metric, start=n), [n]])
+        improved = improve_tour(metric, tour)
+        assert improved[0] == improved[-1] == n
+        assert sorted(improved[1:-1].tolist()) == list(range(n))
+        assert tour_length(metric, improved) <= tour_length(metric, tour) + 1e-9
+
+
+def test_large_instances_use_the_grid_and_stay_exact():
+    n = FULL_MATRIX_LIMIT + 500
+    points = random_points(n)
+    metric = _Metric(points)
+    assert metric.matrix is None
+    assert np.array_equal(nearest_neighbour_tour(metric, start=n), brute_force_tour(points, n))
+
+    sample = np.arange(0, n, 97)
+    distance = np.linalg.norm(points[sample][:, None] - points[None], axis=2)
+    distance[np.arange(len(sample)), sample] = np.inf
+    expected = np.sort(distance, axis=1)[:, :8]
+    found = np.take_along_axis(distance, _grid_neighbours(points, 8)[sample], axis=1)
+    assert np.allclose(found, expected)
+
+
+def test_evaluation_budget_bounds_the_search():
+    n = 400
+    points = random_points(n, seed=3)
+    metric = _Metric(points)
+    tour = np.concatenate([[n], nearest_neighbour_tour(metric, start=n), [n]])
+    full = improve_tour(metric, tour)
+    bounded = improve_tour(metric, tour, max_evaluations=n + 1)
+    assert sorted(bounded[1:-1].tolist()) == list(range(n))
+    assert tour_length(metric, full) <= tour_length(metric, bounded) <= tour_length(metric, tour)
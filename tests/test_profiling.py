@@ -0,0 +1,52 @@
+import random
+
+from network import WRSNNetwork
+from utils import InputParameter, PhaseStats, profile_call, quiet
+
+
+def test_phase_stats_are_off_by_default_and_bounded():
+    stats = PhaseStats(enabled=False)
+    with stats.timer('lookup', 0, 5) as timer:
+        assert timer is None
+    stats.add_energy(0, 'mission', 1.0)
+    assert stats.summary()['phases'] == {} and stats.summary()['energy'] == {}
+
+    stats = PhaseStats(history=3)
+    for cycle in range(1, 10):
+        stats.start_cycle(cycle)
+        with stats.timer('planning', 1, 4):
+            pass
+    summary = stats.summary()
+    assert [c['cycle'] for c in summary['cycles']] == [6, 7, 8, 9]  # 最近3个已结束的周期和当前周期
+    assert summary['phases']['planning']['calls'] == 9
+    assert summary['per_uav'][1]['planning']['items'] == 36
+
+
+def test_network_records_phases_with_item_counts():
+    def run(enabled):
+        random.seed(0)
+        params = InputParameter()
+        params.PHASE_STATS = enabled
+        with quiet():
+            network = WRSNNetwork(params)
+            network._assign_sensors_to_uavs()
+            network.run_system()
+        return network
+
+    assert 'phase_stats' not in run(False).get_system_status()
+
+    network = run(True)
+    assert network.system_time == 10141.0
+    stats = network.get_system_status()['phase_stats']
+    lookup, collection = stats['phases']['lookup'], stats['phases']['collection']
+    # 每次查询返回该无人机负责的全部传感器；最后一次任务因电量不足失败，查询了但没有收集
+    largest = max(len(group) for group in network.uav_sensor_assignments.values())
+    assert 0 < collection['items'] < lookup['items'] <= collection['items'] + largest
+    assert len(stats['cycles']) == network.cycle_num
+    assert set(stats['per_uav']) == {uav.id for uav in network.uavs}
+
+
+def test_profile_call_returns_result_and_report():
+    result, report = profile_call(sum, range(1000))
+    assert result == sum(range(1000))
+    assert 'function calls' in report
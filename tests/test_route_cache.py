@@ -0,0 +1,91 @@
+import random
+
+import numpy as np
+
+from Algorithms.route_cache import RouteCache, cheapest_insertion
+from Algorithms.test import HOVER_HEIGHT
+from network import WRSNNetwork
+from utils import InputParameter, quiet
+
+START = (0.0, 0.0, 0.0)
+
+
+def planner(order):
+    calls = []
+
+    def plan():
+        calls.append(1)
+        return order
+    return plan, calls
+
+
+def tour_length(positions, order):
+    points = np.vstack([START, positions[order] + [0.0, 0.0, HOVER_HEIGHT], START])
+    return np.linalg.norm(points[1:] - points[:-1], axis=1).sum()
+
+
+def test_cheapest_insertion_picks_the_shortest_detour():
+    positions = np.array([[10.0, 0, 0], [20.0, 0, 0], [15.0, 0, 0], [15.0, 30.0, 0]])
+    order = cheapest_insertion(positions, np.array(START), np.array([0, 1]), np.array([2]))
+    assert order.tolist() == [0, 2, 1]
+    order = cheapest_insertion(positions, np.array(START), order, np.array([3]))
+    best = min(tour_length(positions, np.insert(np.array([0, 2, 1]), k, 3)) for k in range(4))  # 逐一比较所有插入位置
+    assert np.isclose(tour_length(positions, order), best)
+
+
+def test_route_is_reused_repaired_and_rebuilt():
+    positions = np.random.default_rng(0).uniform(0, 100, size=(20, 3))
+    cache = RouteCache(rebuild_fraction=0.2)
+    plan, calls = planner(list(range(10)))
+    indices = np.arange(10)
+    assert cache.get_route(1, START, indices, positions, plan).tolist() == list(range(10))
+    assert cache.get_route(1, START, indices, positions, plan).tolist() == list(range(10))
+    assert len(calls) == 1
+
+    # 删除一个节点：保持其余节点的相对顺序
+    indices = np.delete(indices, 4)
+    route = cache.get_route(1, START, indices, positions, plan)
+    assert route.tolist() == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+    # 加入一个节点：插入到最便宜的位置，不重新规划
+    indices = np.append(indices, 15)
+    route = cache.get_route(1, START, indices, positions, plan)
+    assert sorted(route.tolist()) == sorted(indices.tolist())
+    assert route[route != 15].tolist() == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+    assert len(calls) == 1 and cache.repairs == 2
+
+    # 累计改动超过路径长度的20%时重新规划
+    plan, calls = planner([0, 1, 2])
+    assert cache.get_route(1, START, np.array([0, 1, 2]), positions, plan).tolist() == [0, 1, 2]
+    assert len(calls) == 1 and cache.full_plans == 2
+    # 起点变化时也重新规划
+    cache.get_route(1, (1.0, 0.0, 0.0), np.array([0, 1, 2]), positions, plan)
+    assert len(calls) == 2
+    cache.invalidate(1)
+    cache.get_route(1, (1.0, 0.0, 0.0), np.array([0, 1, 2]), positions, plan)
+    assert len(calls) == 3
+
+
+def test_network_routes_match_fresh_plans_until_sensors_change():
+    def network(route_cache):
+        random.seed(0)
+        params = InputParameter()
+        params.ROUTE_CACHE = route_cache
+        with quiet():
+            net = WRSNNetwork(params=params)
+            net._assign_sensors_to_uavs()
+        return net
+
+    cached, fresh = network(True), network(False)
+    for uav_c, uav_f in zip(cached.uavs, fresh.uavs):
+        first = cached._plan_uav_path(uav_c)
+        assert [s.id for s in first] == [s.id for s in fresh._plan_uav_path(uav_f)]
+        assert cached._plan_uav_path(uav_c) == first
+    assert cached.route_cache.full_plans == len(cached.uavs)
+
+    # 停用一个传感器后，修复的路径恰好跳过它
+    uav = cached.uavs[0]
+    route = cached._plan_uav_path(uav)
+    route[1].is_active = False
+    repaired = cached._plan_uav_path(uav)
+    assert [s.id for s in repaired] == [s.id for s in route if s.id != route[1].id]
+    assert cached.route_cache.repairs == 1
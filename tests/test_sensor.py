@@ -0,0 +1,85 @@
+import numpy as np
+
+from network import load_sensor_data
+from sensor import Sensor, SensorArray, SensorDataBuffer, SensorRegistry, save_sensor_binary
+
+
+def make_store(ids):
+    return SensorArray.from_columns(ids, [(float(k), 0.0, 0.0) for k in range(len(ids))], 100.0)
+
+
+def test_registry_lookup_and_assignment():
+    store = make_store([7, 3, 11, 5])
+    sensors = store.views()
+    registry = SensorRegistry(store)
+    assert len(registry) == 4
+    assert 11 in registry and 4 not in registry
+    assert registry.get(3) == sensors[1]
+    assert registry.get(4) is None
+    assert registry.index_of(np.array([5, 4, 7])).tolist() == [3, -1, 0]
+
+    sensors[2].is_active = False
+    registry.assign(0, [11, 5, 7, 99])
+    assert registry.assigned_ids(0) == {5, 7, 11}  # 不存在的ID不计入
+    assert registry.assigned_sensors(0) == [sensors[0], sensors[3]]
+    assert registry.assigned_sensors(0, active_only=False) == [sensors[0], sensors[2], sensors[3]]
+    assert registry.assigned_sensors(1) == []
+
+
+def test_views_are_created_on_access():
+    store = make_store([1, 2, 3])
+    sensors = store.views()
+    assert len(sensors) == 3
+    assert isinstance(sensors[-1], Sensor) and sensors[-1].id == 3
+    assert [s.id for s in sensors] == [1, 2, 3]
+    assert [s.id for s in sensors[1:]] == [2, 3]
+    sensors[0].cur_energy = 40.0
+    assert store.cur_energy[0] == 40.0
+    assert not hasattr(sensors[0], '__dict__')
+
+
+def test_drain_depletes_and_deactivates():
+    store = SensorArray.from_columns([1, 2, 3], np.zeros((3, 3)), 100.0, [10.0, 40.0, 0.0])
+    store.is_active[2] = False
+    assert store.time_to_depletion() == (1, 2.5)
+    assert len(store.drain(2)) == 0
+    assert np.allclose(store.cur_energy, [80.0, 20.0, 100.0])
+
+    depleted = store.drain(1)
+    assert depleted.tolist() == [1]
+    assert store.cur_energy[1] == 0.0
+    assert store.is_active.tolist() == [True, False, False]
+    assert store.cur_energy[2] == 100.0  # 未激活的传感器不耗能
+
+
+def test_binary_format_round_trip(tmp_path):
+    ids = np.array([1, 2**40, 3], dtype=np.int64)  # 超出int32范围的ID不被截断
+    positions = np.array([[0.1, 2.25, 3.0], [150.5, 99.99, 1e-3], [1.0, 2.0, 3.0]])
+    rates = np.array([0.3, 1.7, 0.0])
+    path = str(tmp_path / 'sensors.bin')
+    save_sensor_binary(path, ids, positions, rates)
+
+    store = load_sensor_data(500.0, path)
+    assert store.ids.tolist() == ids.tolist()
+    assert np.array_equal(store.positions, positions)
+    assert np.array_equal(store.energy_consumption_rate, rates)
+    assert np.array_equal(store.cur_energy, [500.0] * 3)
+    assert not store.ids.flags.writeable  # 直接使用内存映射
+    copy = store.copy()
+    assert copy.positions is store.positions and copy.cur_energy is not store.cur_energy
+
+
+def test_data_buffer_overflow_counts_lost_packets():
+    buffer = SensorDataBuffer(2, capacity=4)
+    active = np.array([True, False])
+    buffer.generate(np.arange(3.0), active)
+    buffer.generate(np.arange(3.0, 6.0), active)
+    assert buffer.count.tolist() == [4, 0]
+    assert buffer.lost == 2
+    assert buffer.pending(0).tolist() == [2.0, 3.0, 4.0, 5.0]
+
+    buffer.generate(np.arange(6.0, 16.0), active)
+    assert buffer.lost == 12
+    assert buffer.pending(0).tolist() == [12.0, 13.0, 14.0, 15.0]
+    assert buffer.collect([0, 1]) == 4
+    assert (buffer.buffered, buffer.collected) == (0, 4)
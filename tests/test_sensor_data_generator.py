@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from data.sensor_data_generator import GENERATION_BLOCK, HEIGHT_MAX, LAYOUTS, SensorDataGenerator
+from network import load_sensor_data
+
+N = GENERATION_BLOCK + 1234  # 跨越生成块边界
+
+
+def test_same_seed_gives_the_same_data_for_any_chunk_size():
+    reference = SensorDataGenerator(N, seed=5).generate_sensor_data()
+    for chunk_size in (1000, 4096, N):
+        chunks = list(SensorDataGenerator(N, seed=5).generate_chunks(chunk_size))
+        assert max(len(c) for c in chunks) <= chunk_size
+        assert np.array_equal(np.concatenate(chunks), reference)
+    assert not np.array_equal(SensorDataGenerator(N, seed=6).generate_sensor_data(), reference)
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_layouts_stay_inside_the_area(layout):
+    data = SensorDataGenerator(5000, seed=1, layout=layout).generate_sensor_data()
+    assert data['id'].tolist() == list(range(1, 5001))
+    assert (data['x'] >= 0).all() and (data['x'] <= 200).all()
+    assert (data['y'] >= 0).all() and (data['y'] <= 100).all()
+    assert (data['z'] >= 0).all() and (data['z'] <= HEIGHT_MAX).all()
+    assert (data['energy'] >= 100).all() and (data['energy'] <= 1000).all()
+
+
+def test_streamed_binary_file_matches_generated_data(tmp_path):
+    path = str(tmp_path / 'sensors.bin')
+    generator = SensorDataGenerator(3000, seed=2)
+    generator.save_to_bin(filename=path, chunk_size=700)
+    data = SensorDataGenerator(3000, seed=2).generate_sensor_data()
+    store = load_sensor_data(100.0, path)
+    assert np.array_equal(store.ids, data['id'])
+    assert np.array_equal(store.positions, np.column_stack([data['x'], data['y'], data['z']]))
+    assert np.array_equal(store.energy_consumption_rate, data['energy'])
@@ -0,0 +1,15 @@
+from sweep import ResultCache, run_sweep
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    points = [{'SIMULATION_HORIZON': 600}, {'SIMULATION_HORIZON': 600, 'uav_num': 2}]
+    first = run_sweep(points, workers=0, cache=cache)
+    assert [row['cached'] for row in first] == [False, False]
+
+    points.append({'SIMULATION_HORIZON': 900})
+    second = run_sweep(points, workers=0, cache=cache)
+    assert [row['cached'] for row in second] == [True, True, False]
+    for old, new in zip(first, second):
+        assert new['lifetime'] == old['lifetime']
+        assert new['cycle_num'] == old['cycle_num']
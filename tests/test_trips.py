@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+
+from network import WRSNNetwork
+from utils import InputParameter, quiet
+
+
+def network(multi_trip, **overrides):
+    random.seed(0)
+    params = InputParameter()
+    params.MULTI_TRIP = multi_trip
+    for key, value in overrides.items():
+        setattr(params, key, value)
+    with quiet():
+        net = WRSNNetwork(params)
+        net._assign_sensors_to_uavs()
+    return net
+
+
+def test_low_battery_mission_is_split_into_trips():
+    net = network(True)
+    uav = net.uavs[0]
+    path = net._plan_uav_path(uav)
+    full = net._split_trips(uav, path)
+    assert len(full.trips) == 1 and full.feasible
+
+    cost = uav.curr_E - full.final_energy
+    uav.curr_E = uav.max_E = cost * 0.4  # 满电只够约40%的路径
+    plan = net._split_trips(uav, path)
+    assert plan.feasible and len(plan.trips) >= 3
+    # 各段首尾相接、覆盖整条路径，且每段都在满电的范围内
+    assert [t[0] for t in plan.trips[1:]] == [t[1] for t in plan.trips[:-1]]
+    assert plan.trips[0][0] == 0 and plan.trips[-1][1] == len(path)
+    assert all(t[2] <= uav.max_E for t in plan.trips)
+    # 能量守恒：消耗 = 初始电量 + 补充电量 - 剩余电量
+    assert np.isclose(sum(t[2] for t in plan.trips), uav.curr_E + plan.recharge_energy - plan.final_energy)
+    # 每段往返基站，总飞行时间长于一次完成
+    assert plan.flight_time > full.flight_time
+    assert np.isclose(plan.hover_time, full.hover_time)
+
+    net.params.MULTI_TRIP = False
+    assert not net._split_trips(uav, path).feasible
+
+
+def test_multi_trip_missions_keep_the_uav_busy():
+    net = network(True, UAV_POWER=5e4, SIMULATION_HORIZON=600)
+    with quiet():
+        net.run_system()
+    assert net.termination_reason == "达到仿真时长上限"
+    uavs = net.uavs
+    assert sum(uav.E_recharged for uav in uavs) > 0
+    assert all(np.isclose(uav.pad_stop, uav.E_recharged / net.params.PAD_CHARGE_POWER) for uav in uavs)
+    assert any(uav.busy_until > 0 for uav in uavs)
+
+    # 单段模式下同样的电量在第一个周期就不足
+    net = network(False, UAV_POWER=5e4, SIMULATION_HORIZON=600)
+    with quiet():
+        net.run_system()
+    assert net.termination_reason == "无人机电量不足"
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+
+import uav as uav_module
+from uav import UAV, DEFAULT_AIRFRAME, optimal_speeds, power_curve, power_model, propulsion_power
+
+
+def reference_power(vel):
+    """原UAV.computePower中的公式"""
+    m = uav_module
+    P_0 = (m.δ / 8) * m.ρ * m.s * m.A * math.pow(m.Ω, 3) * math.pow(m.R, 3)
+    P_i = (1 + m.k) * (math.pow(m.W, 3 / 2) / math.sqrt(2 * m.ρ * m.A))
+    part1 = P_0 * (1 + (3 * math.pow(vel, 2)) / (math.pow(m.U_tip, 2)))
+    part2 = P_i * math.sqrt(math.sqrt(1 + math.pow(vel, 4) / (4 * math.pow(m.v_0, 4))) - math.pow(vel, 2) / (2 * math.pow(m.v_0, 2)))
+    part3 = 0.5 * m.d_0 * m.ρ * m.s * m.A * math.pow(vel, 3)
+    return P_0 + P_i, part1 + part2 + part3
+
+
+def test_power_model_matches_the_original_formula():
+    for vel in (0.0, 5.0, 20.0, 33.3):
+        assert propulsion_power(vel) == reference_power(vel)
+        assert power_model(vel) == reference_power(vel)
+    grid = np.array([1.0, 10.0, 20.0])
+    assert np.allclose(power_curve(grid), [reference_power(v)[1] for v in grid], rtol=1e-14)
+
+
+def test_optimal_speeds_minimise_power_and_energy_per_metre():
+    profile = optimal_speeds(DEFAULT_AIRFRAME)
+    grid = np.linspace(0.5, 40.0, 200001)
+    power = power_curve(grid)
+    assert abs(profile.v_me - grid[np.argmin(power)]) < 1e-3
+    assert abs(profile.v_mr - grid[np.argmin(power / grid)]) < 1e-3
+    assert profile.P_me <= power.min() + 1e-9
+    assert profile.P_mr / profile.v_mr <= (power / grid).min() + 1e-12
+    assert profile.v_me < profile.v_mr
+
+
+def test_use_optimal_speed_updates_the_power():
+    uav = UAV(20, 1e6, (0, 0, 0))
+    uav.computePower()
+    before = uav.P_mov / uav.vel
+    vel = uav.use_optimal_speed()
+    assert vel == optimal_speeds(DEFAULT_AIRFRAME).v_mr
+    assert uav.P_mov == power_model(vel)[1]
+    assert uav.P_mov / uav.vel < before
+
+
+def test_transfer_formulas_accept_distance_arrays():
+    uav = UAV(10, 1e6, (0, 0, 0))
+    distance = np.array([1.0, 2.5, 4.0])
+    times = uav.computeDataTransTime(distance, 200)
+    energies = uav.computeDataTransEnergy(distance, 200)
+    assert times.shape == energies.shape == distance.shape
+    assert np.allclose(times, [uav.computeDataTransTime(d, 200) for d in distance])
+    assert np.allclose(energies, [uav.computeDataTransEnergy(d, 200) for d in distance])
@@ -1,5 +1,8 @@
 # 功率就是单位时间的能量流（消耗或者传输）
 import math
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
 from utils import *
 
 # 无人机旋翼详细参数
@@ -19,8 +22,81 @@ Ptra = 3 # 无人机充电发射功率
 η = 0.9 # 传输能量损耗
 t_chg = 0 # 充电时间
 
+SPEED_MAX = 40.0  # 速度求解的搜索上限(m/s)
+SPEED_GRID = 4001  # 速度求解的网格点数
+
+# 机体参数，功率模型按(机体, 速度)缓存
+Airframe = namedtuple('Airframe', ['W', 'rho', 'R', 'A', 'Omega', 'U_tip', 's', 'd_0', 'k', 'v_0', 'delta'])
+DEFAULT_AIRFRAME = Airframe(W, ρ, R, A, Ω, U_tip, s, d_0, k, v_0, δ)
+
+# 最大续航速度(功率最小)和最大航程速度(单位距离能耗最小)及对应的飞行功率
+SpeedProfile = namedtuple('SpeedProfile', ['v_me', 'P_me', 'v_mr', 'P_mr'])
+
+
+def propulsion_power(vel, airframe: Airframe = DEFAULT_AIRFRAME):
+    """
+    旋翼无人机推进功率模型，vel可为标量或NumPy数组
+    :return: (悬停功率P_hov, 飞行功率P_mov)
+    """
+    a = airframe
+    sqrt = math.sqrt if np.ndim(vel) == 0 else np.sqrt
+    P_0 = (a.delta / 8) * a.rho * a.s * a.A * math.pow(a.Omega, 3) * math.pow(a.R, 3)
+    P_i = (1 + a.k) * (math.pow(a.W, 3 / 2) / math.sqrt(2 * a.rho * a.A))
+    part1 = P_0 * (1 + (3 * vel ** 2) / (a.U_tip ** 2))
+    part2 = P_i * sqrt(sqrt(1 + vel ** 4 / (4 * a.v_0 ** 4)) - vel ** 2 / (2 * a.v_0 ** 2))
+    part3 = 0.5 * a.d_0 * a.rho * a.s * a.A * vel ** 3
+    return P_0 + P_i, part1 + part2 + part3
+
+
+@lru_cache(maxsize=1024)
+def power_model(vel: float, airframe: Airframe = DEFAULT_AIRFRAME):
+    """按(速度, 机体)缓存的推进功率(P_hov, P_mov)"""
+    return propulsion_power(float(vel), airframe)
+
+
+def power_curve(velocities, airframe: Airframe = DEFAULT_AIRFRAME) -> np.ndarray:
+    """在一组速度上向量化计算飞行功率P_mov"""
+    return propulsion_power(np.asarray(velocities, dtype=np.float64), airframe)[1]
+
+
+def _golden_min(f, lo, hi, tol=1e-6):
+    """黄金分割法求单峰函数在[lo, hi]上的极小点"""
+    g = (math.sqrt(5) - 1) / 2
+    a, b = lo, hi
+    c, d = b - g * (b - a), a + g * (b - a)
+    fc, fd = f(c), f(d)
+    while b - a > tol:
+        if fc < fd:
+            b, d, fd = d, c, fc
+            c = b - g * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + g * (b - a)
+            fd = f(d)
+    return (a + b) / 2
+
+
+@lru_cache(maxsize=64)
+def optimal_speeds(airframe: Airframe = DEFAULT_AIRFRAME, v_max: float = SPEED_MAX) -> SpeedProfile:
+    """
+    求最大续航速度v_me（min P_mov）和最大航程速度v_mr（min P_mov / v，即每米能耗最小）
+    先在速度网格上向量化求值定位，再用黄金分割细化
+    """
+    grid = np.linspace(v_max / SPEED_GRID, v_max, SPEED_GRID)
+    power = power_curve(grid, airframe)
+    step = float(grid[1] - grid[0])
+
+    def refine(f, idx):
+        return _golden_min(f, max(float(grid[idx]) - step, step / 2), min(float(grid[idx]) + step, v_max))
+
+    v_me = refine(lambda v: propulsion_power(v, airframe)[1], int(np.argmin(power)))
+    v_mr = refine(lambda v: propulsion_power(v, airframe)[1] / v, int(np.argmin(power / grid)))
+    return SpeedProfile(v_me, propulsion_power(v_me, airframe)[1], v_mr, propulsion_power(v_mr, airframe)[1])
+
+
 class UAV(object):
-    def __init__(self, vel, max_E, pos, t_chg = 0):
+    def __init__(self, vel, max_E, pos, t_chg = 0, airframe: Airframe = DEFAULT_AIRFRAME):
         """
         :param vel: 无人机飞行速度
         :param max_E: 无人机存储最大能量
@@ -34,6 +110,7 @@ class UAV(object):
         :param trip_time: 路程时间长度
         :param E_pro: 无人机推进耗能（移动+悬停）
         :param E_wpt: 无人机传输耗能（充电）
+        :param airframe: 机体参数
         """
         self.vel = vel
         self.max_E = max_E
@@ -42,29 +119,32 @@ class UAV(object):
         self.pos = pos
         self.node_stop = 0  # 在节点停留充电时间
         self.pad_stop = 0   # 在充电桩停留补充电能时间
+        self.E_recharged = 0.0  # 在基站和充电桩累计补充的电能
+        self.busy_until = 0.0  # 分段任务结束（返回基站）的时刻，之前不能执行新任务
         self.P_mov = 0
         self.P_hov = 0
         self.P_rate = 0
         self.P_tra = Ptra
+        self.wpt_gain = None  # 充电链路增益（十进制），None时按距离由路径损耗模型计算
         self.t_chg = t_chg
         self.trip_time = 0
         self.E_pro = [0, 0]
         self.E_wpt = 0
+        self.airframe = airframe
 
     def computePower(self):
         """
         根据无人机的速度vel计算飞行和悬停功率
         :return: 飞行功率P_mov和悬停功率P_hov
         """
-        P_0 = (δ / 8) * ρ * s * A * math.pow(Ω, 3) * math.pow(R, 3)
-        P_i = (1 + k) * (math.pow(W, 3 / 2) / math.sqrt(2 * ρ * A))
-        self.P_hov = P_0 + P_i
-        part1 = P_0 * (1 + (3 * math.pow(self.vel, 2)) / (math.pow(U_tip, 2)))
-        part2 = P_i * math.sqrt(math.sqrt(1 + math.pow(self.vel, 4) / (4 * math.pow(v_0, 4))) - math.pow(self.vel, 2) / (2 * math.pow(v_0, 2)))
-        part3 = 0.5 * d_0 * ρ * s * A * math.pow(self.vel, 3)
-        self.P_mov = part1 + part2 + part3
-
-    
+        self.P_hov, self.P_mov = power_model(self.vel, self.airframe)
+
+    def use_optimal_speed(self):
+        """把巡航速度设为最大航程速度，并更新功率"""
+        self.vel = optimal_speeds(self.airframe).v_mr
+        self.computePower()
+        return self.vel
+
     def computeDataTransEnergy(self, distance = 1, E_need = 200):
         """
         计算数据传输能耗（基于Matlab中能量计算公式）
@@ -72,14 +152,15 @@ class UAV(object):
         :param data_size: 传输的数据量(bit)
         :return: 传输能耗(J)
         """
-        # 计算路径损耗
-        pathloss = getPathLoss(distance)
-        # 计算可达速率 (bps/Hz)
-        rk = getAchievableRate(pathloss)
+        # 可达速率 (bps/Hz) 按距离缓存；distance为数组时逐元素计算
+        if np.ndim(distance) == 0:
+            rk = link_rate(float(distance))
+        else:
+            rk = getAchievableRate(getPathLoss(distance))
         
         t_chg = E_need / (self.P_tra * η * rk)
         
-        print(f"计算得到的充电时间: {t_chg}")
+        logger.debug("计算得到的充电时间: %s", t_chg)
 
         # 传输能耗 (J) = 发射功率(W) * 传输时间(s)
         E_data = self.P_tra * t_chg
@@ -92,17 +173,19 @@ class UAV(object):
         :param data_size: 传输的数据量(bit)
         :return: 传输能耗(J)
         """
-        # 计算路径损耗
-        pathloss = getPathLoss(distance)
-        # 计算可达速率 (bps/Hz)
-        rk = getAchievableRate(pathloss)
-        print(pathloss, rk)
-        print(dB2dec(pathloss))
-        t_chg = E_need / (self.P_tra * η * dB2dec(pathloss))
-
-        print(f"计算得到的充电时间: {t_chg}")
-        # 传输能耗 (J) = 发射功率(W) * 传输时间(s)
-        E_data = self.P_tra * t_chg
+        # 链路增益按距离缓存，每次调用只剩一次除法；distance为数组时逐元素计算
+        if self.wpt_gain is not None:
+            gain = self.wpt_gain
+        elif np.ndim(distance) == 0:
+            gain = link_gain(float(distance))
+        else:
+            gain = dB2dec(getPathLoss(distance))
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("%s %s", getPathLoss(distance), getAchievableRate(getPathLoss(distance)))
+            logger.debug("%s", gain)
+        t_chg = E_need / (self.P_tra * η * gain)
+
+        logger.debug("计算得到的充电时间: %s", t_chg)
         return t_chg
 
     def maxRadius(self, node_E):
@@ -132,6 +215,3 @@ class UAV(object):
             
         distance = (self.max_E - self.t_chg * self.P_hov - self.P_tra * self.t_chg) / self.P_mov * self.vel
         return distance
-
-# print(UAV(vel = 20, max_E = 60000, pos = (0, 0)).computePower())
-print(UAV(vel = 20, max_E = 60000, pos = (0, 0)).computeDataTransTime(distance = 1, E_need = 200))
\ No newline at end of file
@@ -1,7 +1,17 @@
 # from utils.input import NetworkInput
-# from utils.logger import logger, writer, make_logger
 # from utils.energy_func import *
 # from utils.dataset import *
 
 from utils.utils import *
-from utils.parameters import *
\ No newline at end of file
+from utils.parameters import *
+from utils.events import *
+from utils.logger import *
+from utils.profiling import *
+
+
+def __getattr__(name):
+    # device / device_str 延迟到首次访问时才导入torch
+    if name in ('device', 'device_str'):
+        from utils import utils as _utils
+        return getattr(_utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,130 @@
+from collections import namedtuple
+import enum
+import heapq
+import itertools
+import numpy as np
+
+
+class EventType(enum.IntEnum):
+    CYCLE_START = 0       # 数据收集周期开始
+    MISSION_START = 1     # 无人机开始执行任务
+    MISSION_END = 2       # 无人机任务结束
+    SENSOR_DEPLETION = 3  # 传感器电量耗尽
+    DATA_GENERATION = 4   # 传感器生成数据
+    CHARGE_REQUEST = 5    # 传感器剩余能量低于阈值，发出充电请求（按需模式）
+    UAV_ARRIVAL = 6       # 无人机完成悬停充电或在充电桩充满电（按需模式）
+
+
+# 同一时刻的事件按入队顺序(seq)处理，保证结果确定
+Event = namedtuple('Event', ['time', 'seq', 'type', 'payload'], defaults=[None])
+
+# 各类事件负载中的整数个数：0为None，1为单个整数，2为二元组
+PAYLOAD_SIZE = {
+    EventType.CYCLE_START: 0,
+    EventType.MISSION_START: 2,       # (周期号, 无人机下标)
+    EventType.MISSION_END: 2,         # (周期号, 无人机下标)
+    EventType.SENSOR_DEPLETION: 1,    # 传感器下标
+    EventType.DATA_GENERATION: 0,
+    EventType.CHARGE_REQUEST: 2,      # (传感器下标, 版本号)
+    EventType.UAV_ARRIVAL: 2,         # (无人机下标, 到达类型)
+}
+
+
+class EventQueue:
+    """
+    基于堆的离散事件队列，按(时间, 入队顺序)弹出事件
+    取消的事件只记录其入队顺序号，弹出时跳过；取消的事件超过堆的一半时重建堆
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._cancelled = set()
+        self._counter = itertools.count()
+
+    def push(self, time, event_type, payload=None) -> Event:
+        event = Event(float(time), next(self._counter), event_type, payload)
+        heapq.heappush(self._heap, event)
+        return event
+
+    def pop(self) -> Event:
+        self._skip_cancelled()
+        return heapq.heappop(self._heap)
+
+    def peek(self) -> Event:
+        self._skip_cancelled()
+        return self._heap[0]
+
+    def cancel(self, event: Event):
+        """取消仍在队列中的事件（已弹出的事件不能取消）"""
+        self._cancelled.add(event.seq)
+        if len(self._cancelled) > len(self._heap) // 2:
+            self.compact()
+
+    def compact(self):
+        """从堆中删除已取消的事件"""
+        if self._cancelled:
+            self._heap = [e for e in self._heap if e.seq not in self._cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled.clear()
+
+    def _skip_cancelled(self):
+        heap = self._heap
+        while heap and heap[0].seq in self._cancelled:
+            self._cancelled.discard(heapq.heappop(heap).seq)
+
+    def find(self, seq: int) -> Event:
+        """按入队顺序号查找仍在队列中的事件，不存在时返回None"""
+        if seq in self._cancelled:
+            return None
+        return next((e for e in self._heap if e.seq == seq), None)
+
+    def __contains__(self, event: Event) -> bool:
+        return self.find(event.seq) is event
+
+    def clear(self):
+        self._heap.clear()
+        self._cancelled.clear()
+
+    def to_arrays(self) -> dict:
+        """把队列中的事件编码为定长数组（负载按PAYLOAD_SIZE展开为两列整数），不含已取消的事件"""
+        self.compact()
+        heap = self._heap
+        types = np.array([e.type for e in heap], dtype=np.int64)
+        sizes = np.array([PAYLOAD_SIZE[t] for t in EventType], dtype=np.int64)[types] if heap else types
+        payload = np.full((len(heap), 2), -1, dtype=np.int64)
+        single = np.flatnonzero(sizes == 1)
+        double = np.flatnonzero(sizes == 2)
+        if len(single):
+            payload[single, 0] = [heap[row].payload for row in single.tolist()]
+        if len(double):
+            payload[double] = [heap[row].payload for row in double.tolist()]
+        next_seq = next(self._counter)
+        self._counter = itertools.count(next_seq)
+        return {
+            'time': np.array([e.time for e in heap], dtype=np.float64),
+            'seq': np.array([e.seq for e in heap], dtype=np.int64),
+            'type': types,
+            'payload': payload,
+            'next_seq': np.int64(next_seq),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'EventQueue':
+        """由to_arrays的结果重建队列"""
+        queue = cls()
+        types = {int(t): t for t in EventType}
+        payload = arrays['payload']
+        columns = (None, payload[:, 0].tolist(), list(map(tuple, payload.tolist())))
+        queue._heap = [Event(time, seq, types[t], None if PAYLOAD_SIZE[t] == 0 else columns[PAYLOAD_SIZE[t]][row])
+                       for row, (time, seq, t) in enumerate(zip(arrays['time'].tolist(), arrays['seq'].tolist(),
+                                                                arrays['type'].tolist()))]
+        heapq.heapify(queue._heap)
+        queue._counter = itertools.count(int(arrays['next_seq']))
+        return queue
+
+    def __len__(self):
+        return len(self._heap) - len(self._cancelled)
+
+    def __bool__(self):
+        self._skip_cancelled()
+        return bool(self._heap)
@@ -0,0 +1,108 @@
+"""
+日志与结构化事件记录
+
+logger: 分级文本日志，默认INFO级别输出到标准输出；低于当前级别的调用只做一次整数比较，
+        热路径中应使用 logger.debug("...%s", x) 的惰性格式化，或先判断 logger.isEnabledFor(DEBUG)
+recorder: 结构化事件（时刻、周期、无人机、传感器、能量）的环形缓冲区，默认关闭，需要时开启并按需导出
+"""
+
+import contextlib
+import json
+import logging
+import sys
+from collections import deque, namedtuple
+from logging import DEBUG, INFO, WARNING, ERROR
+
+__all__ = ['logger', 'recorder', 'make_logger', 'set_level', 'quiet', 'LogEvent', 'EventRecorder',
+           'DEBUG', 'INFO', 'WARNING', 'ERROR', 'QUIET']
+
+QUIET = logging.CRITICAL + 10  # 高于所有级别，关闭全部文本输出
+EVENT_BUFFER_SIZE = 100000
+
+LogEvent = namedtuple('LogEvent', ['time', 'kind', 'cycle', 'uav', 'sensor', 'energy'])
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """始终写到当前的sys.stdout，兼容contextlib.redirect_stdout"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    def emit(self, record):
+        self.stream = sys.stdout
+        super().emit(record)
+
+
+def make_logger(name='wrsn', level=INFO) -> logging.Logger:
+    """创建只输出消息文本的日志器（与原print输出格式一致）"""
+    log = logging.getLogger(name)
+    if not log.handlers:
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+    log.setLevel(level)
+    log.propagate = False
+    return log
+
+
+class EventRecorder():
+    """结构化事件环形缓冲区，容量固定，写满后丢弃最早的事件"""
+
+    def __init__(self, capacity=EVENT_BUFFER_SIZE, enabled=False):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)
+
+    def record(self, time, kind, cycle=None, uav=None, sensor=None, energy=None):
+        if self.enabled:
+            self.events.append(LogEvent(time, kind, cycle, uav, sensor, energy))
+
+    def enable(self, capacity=None):
+        if capacity is not None and capacity != self.events.maxlen:
+            self.events = deque(self.events, maxlen=capacity)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events.clear()
+
+    def __len__(self):
+        return len(self.events)
+
+    def dump(self, path=None, kind=None):
+        """
+        导出缓冲区中的事件
+
+        Args:
+            path: 提供时按JSON Lines写入文件
+            kind: 只导出该类型的事件
+
+        Returns:
+            list: 事件字典列表
+        """
+        events = [e._asdict() for e in self.events if kind is None or e.kind == kind]
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+        return events
+
+
+logger = make_logger()
+recorder = EventRecorder()
+
+
+def set_level(level):
+    logger.setLevel(level)
+
+
+@contextlib.contextmanager
+def quiet():
+    """临时关闭全部文本输出，只保留计算（结构化事件记录不受影响）"""
+    level = logger.level
+    logger.setLevel(QUIET)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
@@ -1,4 +1,6 @@
 import math
+from functools import lru_cache
+import numpy as np
 
 # 通信与充电相关参数（对齐Matlab代码参数）
 B = 1 * 10**6  # 带宽 (Hz)，来自parameter_setting.m
@@ -13,10 +15,28 @@ delta_t = 0.5  # 时间间隔(s)，来自parameter_setting.m
 class InputParameter:
     UAV_POWER = 1000000  # 无人机电量,单位(J)
     UAV_SPEED = 20
+    OPTIMIZE_UAV_SPEED = False  # 为True时无人机以最大航程速度（每米能耗最小）巡航，忽略UAV_SPEED
     # 地图参数设置
     AREA_LONG = 200     # 地图-长
     AREA_WIDE = 100     # 地图-宽
     SENSOR_POWER = 6000
+    SENSOR_DRAIN = False  # 为True时传感器按energy_consumption_rate持续耗能并可能耗尽失效；False时沿用原模型，传感器电量不随时间减少（按需模式总是耗能）
+    SENSOR_RATE_UNIT = 60  # 传感器能耗速率energy_consumption_rate的时间单位(秒)，即J/min
+    WPT_GAIN_DB = None  # 悬停充电的链路增益(dB)；None时按路径损耗模型getPathLoss计算（悬停1米处-60dB，每焦耳约需3.7e5秒）
+
+    SENSOR_ASSIGNMENT = 'random'  # 传感器分配方法：random（按随机种子打乱后等分）、sweep（扇形）或kmeans（均衡聚类），后两者与随机种子无关
+    SCHEDULING = 'cycle'  # 调度方式：cycle（每个周期巡回全部传感器）或on_demand（低于阈值的传感器按截止时刻请求充电）
+    REQUEST_THRESHOLD = 0.5  # 按需模式下发出充电请求的剩余能量比例
+    DATA_REQUEST_THRESHOLD = 0.75  # 按需模式下缓冲的数据包达到缓冲区容量的该比例时也发出请求，None为只按能量请求
+    MISSION_WORKERS = None  # 周期内并发规划无人机任务的线程数，None为min(无人机数, CPU核数)，1为逐个规划
+    ROUTE_CACHE = True  # 为True时缓存各无人机的路径，活跃传感器集合变化时增量修复
+
+    MULTI_TRIP = False  # 为True时电量不足的任务分段执行，段间在最近的充电桩（含基站）充电，任务期间无人机不可用；False时整条路径须一次完成
+    PAD_CHARGE_POWER = 1000  # 基站和充电桩为无人机补充电能的功率(W)
+    PAD_DATA_PATH = None  # 充电桩数据文件（每行 id x y z），None时只有基站
+    SIMULATION_HORIZON = None  # 仿真时长上限(秒)，None为不限（MULTI_TRIP为True且传感器不耗能时无人机可无限续航，应设置上限）
+    DATA_BUFFER_SIZE = 16  # 每个传感器缓冲的数据包数，写满后最早的数据被覆盖并计为丢失
+    PHASE_STATS = False  # 为True时按阶段、无人机和周期统计热路径的调用次数与耗时（见get_system_status），默认关闭
 
     UAV_FLIGHT_HEIGHT = 100  # 无人机飞行高度,单位(m)
 
@@ -31,18 +51,47 @@ class InputParameter:
         self.uav_num = 3  # 无人机数量
         self.sensor_num = 50  # 传感器数量
 
-
+    def to_dict(self) -> dict:
+        """类参数（大写）和实例参数，可用JSON保存"""
+        values = {name: getattr(self, name) for name in dir(type(self)) if name.isupper()}
+        values.update(vars(self))
+        return values
+
+    @classmethod
+    def from_dict(cls, values: dict) -> 'InputParameter':
+        """
+        由参数字典创建，未给出的参数取默认值，列表转换为元组
+        先设置大写参数再计算实例参数，修改AREA_LONG/AREA_WIDE时区域大小和基站位置随之改变（除非同时给出）
+        """
+        params = cls()
+        unknown = [name for name in values if not hasattr(params, name)]
+        if unknown:
+            raise ValueError(f"未知参数：{', '.join(unknown)}")
+        values = {name: tuple(v) if isinstance(v, list) else v for name, v in values.items()}
+        for name, value in values.items():
+            if name.isupper():
+                setattr(params, name, value)
+        params.__init__()
+        for name, value in values.items():
+            if not name.isupper():
+                setattr(params, name, value)
+        return params
+
+
+
+# 以下链路预算函数既接受Python标量（结果与原实现完全一致），也接受NumPy数组（逐元素计算）
 
 def getPathLoss(distance = 1):
     """计算路径损耗 (dB)，对应Matlab的getPathLoss函数"""
     # return beta0 - alpha * dec2dB(distance)\
-    return beta0 / distance
+    return beta0 / _as_array(distance)
 
 def getAchievableRate(pathloss):
     """计算可达速率 (bps/Hz)，对应Matlab的getAchievableRate函数"""
     numerator = dB2dec(pathloss)
     denominator = dBm2dec(sigma_2)
-    return math.log2(1 + Pk * numerator / denominator)
+    x = 1 + Pk * numerator / denominator
+    return math.log2(x) if np.ndim(x) == 0 else np.log2(x)
 
 def computeDataTransmissionEnergy(distance = 1, data_size = 1024 * 1024):
     """
@@ -60,21 +109,54 @@ def computeDataTransmissionEnergy(distance = 1, data_size = 1024 * 1024):
     # 总传输速率 (bps) = 速率(bps/Hz) * 带宽(Hz)
     total_rate = rate * B
     # 传输时间 (s) = 数据量(bit) / 传输速率(bps)
-    trans_time = data_size / total_rate
+    trans_time = _as_array(data_size) / total_rate
     # 传输能耗 (J) = 发射功率(W) * 传输时间(s)
     E_data = Pk * trans_time
     return E_data
 
+def computeChargingTime(E_need, distance = 1, P_tra = P_tra, efficiency = 0.9, gain = None):
+    """
+    计算无线充电时间 (s)，与UAV.computeDataTransTime的公式相同
+    E_need<=0（无需充电）时为0，可对一组传感器一次计算
+    :param E_need: 需要补充的能量(J)
+    :param distance: 与传感器节点的距离(m)
+    :param P_tra: 充电发射功率(W)
+    :param efficiency: 传输效率
+    :param gain: 链路增益（十进制），None时按distance由路径损耗模型计算
+    """
+    if gain is None:
+        gain = link_gain(float(distance)) if np.ndim(distance) == 0 else dB2dec(getPathLoss(distance))
+    if np.ndim(E_need) == 0 and np.ndim(gain) == 0:
+        return E_need / (P_tra * efficiency * gain) if E_need > 0 else 0.0
+    E_need = np.asarray(E_need, dtype=np.float64)
+    return np.where(E_need > 0, E_need, 0.0) / (P_tra * efficiency * gain)
+
+LINK_CACHE_SIZE = 1024  # 按距离缓存的链路增益/速率个数（悬停距离通常只有一两种）
+
+
+@lru_cache(maxsize=LINK_CACHE_SIZE)
+def link_gain(distance: float) -> float:
+    """距离distance处的链路增益（十进制），按距离缓存，充电时间只需一次除法"""
+    return float(dB2dec(getPathLoss(distance)))
+
+
+@lru_cache(maxsize=LINK_CACHE_SIZE)
+def link_rate(distance: float) -> float:
+    """距离distance处的可达速率 (bps/Hz)，按距离缓存"""
+    return float(getAchievableRate(getPathLoss(distance)))
+
 def dec2dB(dec):
     """分贝转十进制，对应Matlab的dec2dB函数"""
-    return 10 * math.log10(dec)
+    return 10 * math.log10(dec) if np.ndim(dec) == 0 else 10 * np.log10(dec)
 
 def dB2dec(dB):
     """十进制转分贝，对应Matlab的dB2dec函数"""
-    return 10 **(dB / 10)
+    return 10 **(_as_array(dB) / 10)
 
 def dBm2dec(dBm):
     """dBm转十进制"""
-    return 10 ** (dBm / 10) * (10 **(-3))
-
+    return 10 ** (_as_array(dBm) / 10) * (10 **(-3))
 
+def _as_array(x):
+    """列表/元组转为NumPy数组，标量和数组原样返回"""
+    return np.asarray(x, dtype=np.float64) if isinstance(x, (list, tuple)) else x
@@ -0,0 +1,217 @@
+"""
+热路径计时、计数与剖析
+
+PhaseStats: 按 阶段 × 无人机 累计调用次数、处理的传感器数和耗时，并保留最近若干周期的各阶段合计；
+            另按无人机累计能量流向。只在阶段入口和出口各读一次perf_counter，不在逐传感器的循环中计时，
+            各阶段的耗时包含其中嵌套的子阶段（如energy包含hover）
+profile_call: 用cProfile或采样方式剖析一次调用（如run_system），返回结果和文本报告
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+__all__ = ['PhaseStats', 'PHASES', 'profile_call']
+
+# planning: 路径规划  energy: 任务能耗估计与分段  hover: 悬停时间计算
+# lookup: 传感器索引查询  collection: 数据收集与充电结算
+PHASES = ('planning', 'energy', 'hover', 'lookup', 'collection')
+CYCLE_HISTORY = 1000  # 保留的周期数，长时间运行时内存有界
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class _Timer():
+    __slots__ = ('stats', 'phase', 'uav', 'items', 'start')
+
+    def __init__(self, stats, phase, uav, items):
+        self.stats = stats
+        self.phase = phase
+        self.uav = uav
+        self.items = items
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add(self.phase, self.uav, time.perf_counter() - self.start, self.items)
+
+
+class PhaseStats():
+    """分阶段的计时与计数，可在规划线程中同时写入"""
+
+    def __init__(self, enabled=True, history=CYCLE_HISTORY):
+        self.enabled = enabled
+        self.history = history
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.totals = {}                 # (阶段, 无人机ID) -> [调用次数, 传感器数, 秒]
+        self.energy = {}                 # 无人机ID -> {能量类型: 焦耳}
+        self.cycle = 0
+        self.current = {}                # 当前周期: 阶段 -> [调用次数, 传感器数, 秒]
+        self.cycles = deque(maxlen=self.history)  # 已结束的周期: (周期号, 阶段合计)
+
+    def timer(self, phase: str, uav: int = None, items: int = 0):
+        """
+        阶段计时上下文
+
+        Args:
+            phase: 阶段名，见PHASES
+            uav: 无人机ID，None为不属于某架无人机
+            items: 本次处理的传感器数
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, phase, uav, items)
+
+    def add(self, phase: str, uav, seconds: float, items: int = 0):
+        with self._lock:
+            entry = self.totals.get((phase, uav))
+            if entry is None:
+                entry = self.totals[(phase, uav)] = [0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += items
+            entry[2] += seconds
+            entry = self.current.get(phase)
+            if entry is None:
+                entry = self.current[phase] = [0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += items
+            entry[2] += seconds
+
+    def add_energy(self, uav: int, kind: str, joules: float):
+        """累计无人机的能量流向，如mission（任务总能耗）、hover（悬停）、recharge（在充电桩补充）"""
+        if not self.enabled:
+            return
+        with self._lock:
+            by_kind = self.energy.setdefault(uav, {})
+            by_kind[kind] = by_kind.get(kind, 0.0) + joules
+
+    def start_cycle(self, cycle: int):
+        """结束当前周期的统计并开始新周期（按需模式没有周期，全部计入第0周期）"""
+        with self._lock:
+            if self.current:
+                self.cycles.append((self.cycle, self.current))
+            self.cycle = cycle
+            self.current = {}
+
+    @staticmethod
+    def _entry(entry):
+        return {'calls': entry[0], 'items': entry[1], 'seconds': entry[2]}
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: phases（各阶段合计）、per_uav（无人机ID -> 各阶段）、energy（无人机ID -> 能量流向）、
+                  cycles（最近的各周期，含当前周期: {'cycle': 周期号, 阶段: 秒}）
+        """
+        with self._lock:
+            phases, per_uav = {}, {}
+            for (phase, uav), entry in self.totals.items():
+                merged = phases.setdefault(phase, [0, 0, 0.0])
+                for k in range(3):
+                    merged[k] += entry[k]
+                if uav is not None:
+                    per_uav.setdefault(uav, {})[phase] = self._entry(entry)
+            cycles = list(self.cycles)
+            if self.current:
+                cycles.append((self.cycle, self.current))
+            return {
+                'phases': {phase: self._entry(entry) for phase, entry in phases.items()},
+                'per_uav': per_uav,
+                'energy': {uav: dict(by_kind) for uav, by_kind in self.energy.items()},
+                'cycles': [dict({'cycle': cycle}, **{phase: entry[2] for phase, entry in totals.items()})
+                           for cycle, totals in cycles],
+            }
+
+    def report(self) -> str:
+        """各阶段合计的文本表格，按耗时从大到小"""
+        phases = self.summary()['phases']
+        lines = [f"{'阶段':<12}{'调用次数':>10}{'传感器数':>12}{'耗时(秒)':>12}"]
+        for phase, entry in sorted(phases.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{phase:<12}{entry['calls']:>10}{entry['items']:>12}{entry['seconds']:>12.4f}")
+        return '\n'.join(lines)
+
+
+class _Sampler():
+    """在后台线程中按固定间隔采样目标线程的调用栈，统计各函数出现在栈中（含子调用）和栈顶的次数"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.inclusive = Counter()
+        self.exclusive = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.exclusive[self._key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = self._key(frame)
+                if key not in seen:
+                    seen.add(key)
+                    self.inclusive[key] += 1
+                frame = frame.f_back
+
+    @staticmethod
+    def _key(frame):
+        code = frame.f_code
+        return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def report(self, limit):
+        total = max(self.samples, 1)
+        lines = [f"{self.samples}个样本，间隔{self.interval * 1000:.1f}ms",
+                 f"{'含子调用':>8}{'自身':>8}  函数"]
+        for key, count in self.inclusive.most_common(limit):
+            lines.append(f"{100 * count / total:>7.1f}%{100 * self.exclusive[key] / total:>7.1f}%  {key}")
+        return '\n'.join(lines)
+
+
+def profile_call(func, *args, mode='cprofile', interval=0.005, limit=30, sort='cumulative', **kwargs):
+    """
+    剖析一次调用，如 profile_call(network.run_system)
+
+    Args:
+        func: 被剖析的函数
+        mode: cprofile（确定性剖析，开销较大）或sample（采样，开销与运行时长无关）
+        interval: 采样间隔(秒)
+        limit: 报告中的函数数
+        sort: cProfile报告的排序键
+
+    Returns:
+        (func的返回值, 文本报告)
+    """
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, *args, **kwargs)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        return result, stream.getvalue()
+    if mode == 'sample':
+        with _Sampler(threading.get_ident(), interval) as sampler:
+            result = func(*args, **kwargs)
+        return result, sampler.report(limit)
+    raise ValueError(f"未知的剖析方式：{mode}")
@@ -1,14 +1,25 @@
 from collections import namedtuple
+from functools import lru_cache
 import math
 import os
-import torch
 import pickle
 
-device_str = 'cuda' if torch.cuda.is_available() else 'cpu'
-device = torch.device(device_str)
-
 Point = namedtuple('Point', ['x', 'y', 'z'], defaults=[0, 0, 0])
 
+@lru_cache(maxsize=None)
+def get_device():
+    """按需导入torch并返回计算设备，避免导入本模块时加载torch"""
+    import torch
+    return torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+def __getattr__(name):
+    # 兼容旧代码中的utils.utils.device / device_str
+    if name == 'device':
+        return get_device()
+    if name == 'device_str':
+        return get_device().type
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def dist(p1: Point, p2: Point):
     return math.dist(list(p1), list(p2))
 